@@ -1,7 +1,13 @@
 from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.core.exceptions import PermissionDenied
+from django.urls import path, reverse
+from django.utils.html import format_html
 from .models import (
     Page, Event, Gallery, Contact, SiteSettings, Slider, 
-    GalleryAlbum, GalleryPhoto, CommitteeMember, DurgaSangha, DurgaPujaCountdown, PujaDay, DonationInfo
+    GalleryAlbum, GalleryPhoto, CommitteeMember, DurgaSangha, DurgaPujaCountdown, PujaDay, DonationInfo,
+    SlowQuery, ProfileReport
 )
 
 @admin.register(Page)
@@ -33,15 +39,11 @@ class GalleryPhotoInline(admin.TabularInline):
 
 @admin.register(GalleryAlbum)
 class GalleryAlbumAdmin(admin.ModelAdmin):
-    list_display = ('title', 'get_photos_count', 'is_featured', 'created_at')
+    list_display = ('title', 'photo_count', 'is_featured', 'created_at')
     list_filter = ('is_featured', 'created_at')
     search_fields = ('title', 'description')
     list_editable = ('is_featured',)
     inlines = [GalleryPhotoInline]
-    
-    def get_photos_count(self, obj):
-        return obj.get_photos_count()
-    get_photos_count.short_description = 'ছবির সংখ্যা'
 
 @admin.register(GalleryPhoto)
 class GalleryPhotoAdmin(admin.ModelAdmin):
@@ -248,3 +250,92 @@ class DonationInfoAdmin(admin.ModelAdmin):
     
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Read-only ranking of slow SQL fingerprints by total time"""
+    list_display = ('short_fingerprint', 'view', 'count', 'total_time_ms', 'average_time_ms', 'max_time_ms', 'last_seen')
+    list_filter = ('view',)
+    search_fields = ('fingerprint', 'view')
+    ordering = ('-total_time',)
+    fields = ('view', 'fingerprint', 'count', 'total_time', 'max_time', 'first_seen', 'last_seen')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def short_fingerprint(self, obj):
+        return obj.fingerprint[:120]
+    short_fingerprint.short_description = 'SQL'
+    
+    def total_time_ms(self, obj):
+        return round(obj.total_time * 1000)
+    total_time_ms.short_description = 'মোট সময় (ms)'
+    total_time_ms.admin_order_field = 'total_time'
+    
+    def average_time_ms(self, obj):
+        return round(obj.average_time * 1000, 1)
+    average_time_ms.short_description = 'গড় সময় (ms)'
+    
+    def max_time_ms(self, obj):
+        return round(obj.max_time * 1000, 1)
+    max_time_ms.short_description = 'সর্বোচ্চ সময় (ms)'
+    max_time_ms.admin_order_field = 'max_time'
+
+
+@admin.register(ProfileReport)
+class ProfileReportAdmin(admin.ModelAdmin):
+    """Read-only list of ?__profile=1 reports with downloads"""
+    list_display = ('path', 'view', 'user', 'status_code', 'duration_ms', 'query_count', 'created_at', 'downloads')
+    list_filter = ('view', 'created_at')
+    search_fields = ('path', 'view')
+    fields = ('path', 'view', 'user', 'status_code', 'duration', 'query_count', 'query_time', 'created_at',
+              'downloads', 'report')
+    readonly_fields = fields
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def get_urls(self):
+        return [
+            path('<int:pk>/report.txt', self.admin_site.admin_view(self.download_report),
+                 name='durga_profilereport_report'),
+            path('<int:pk>/profile.prof', self.admin_site.admin_view(self.download_stats),
+                 name='durga_profilereport_stats'),
+        ] + super().get_urls()
+    
+    def _download(self, content, content_type, filename):
+        response = HttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
+    def download_report(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profile = get_object_or_404(ProfileReport, pk=pk)
+        return self._download(profile.report, 'text/plain; charset=utf-8', f'profile-{pk}.txt')
+    
+    def download_stats(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profile = get_object_or_404(ProfileReport, pk=pk)
+        return self._download(bytes(profile.stats), 'application/octet-stream', f'profile-{pk}.prof')
+    
+    def duration_ms(self, obj):
+        return round(obj.duration * 1000, 1)
+    duration_ms.short_description = 'সময় (ms)'
+    duration_ms.admin_order_field = 'duration'
+    
+    def downloads(self, obj):
+        return format_html(
+            '<a href="{}">report.txt</a> | <a href="{}">profile.prof</a>',
+            reverse('admin:durga_profilereport_report', args=[obj.pk]),
+            reverse('admin:durga_profilereport_stats', args=[obj.pk]),
+        )
+    downloads.short_description = 'ডাউনলোড'
@@ -0,0 +1,17 @@
+from django.urls import path
+from . import async_views
+
+# Same routes and names as urls.py, served by the async views under ASGI
+app_name = 'durga'
+
+urlpatterns = [
+    path('', async_views.home, name='home'),
+    path('events/', async_views.events, name='events'),
+    path('events/calendar/', async_views.events_calendar, name='events_calendar'),
+    path('gallery/', async_views.gallery_view, name='gallery'),
+    path('album/<int:album_id>/', async_views.album_detail, name='album_detail'),
+    path('committee/', async_views.committee, name='committee'),
+    path('durga-sangha/', async_views.durga_sangha, name='durga_sangha'),
+    path('contact/', async_views.contact, name='contact'),
+    path('page/<slug:slug>/', async_views.page_detail, name='page_detail'),
+]
@@ -0,0 +1,163 @@
+"""
+Async versions of the public views, served on the ASGI entry point.
+
+Independent queries of a view (the site context, counts, the page itself)
+are fanned out with run_concurrently(), so under ASGI a view waits for its
+slowest query instead of the sum of them. Templates still render in a sync
+thread because they may touch lazy relations and the session.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, render
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+
+from .cache import (
+    HOME_SNAPSHOT_MODELS, aget_home_snapshot, aget_site_context, cache_public_page, conditional_public_page,
+    event_boundaries, get_site_context,
+)
+from .db import run_concurrently
+from .models import CommitteeMember, DurgaSangha, Event, GalleryAlbum, GalleryPhoto, Page
+from .pagination import ChainedQuerySets, decode_cursor, keyset_page
+from .views import (
+    CALENDAR_MAX_AGE, CONTACT_SUCCESS_MESSAGE, PHOTOS_PER_PAGE, calendar_event_data, calendar_queryset,
+    contact_message, group_by_category, photos_response,
+)
+
+arender = sync_to_async(render)
+
+
+@conditional_public_page(*HOME_SNAPSHOT_MODELS)
+@cache_public_page(*HOME_SNAPSHOT_MODELS)
+async def home(request):
+    context, snapshot = await asyncio.gather(aget_site_context(), aget_home_snapshot())
+    context.update(snapshot)
+    return await arender(request, 'durga_mondir/home.html', context)
+
+
+@conditional_public_page()
+@cache_public_page()
+async def page_detail(request, slug):
+    context, page = await run_concurrently(
+        get_site_context,
+        lambda: get_object_or_404(Page.objects.select_related('author'), slug=slug, is_published=True),
+    )
+    context['page'] = page
+    return await arender(request, 'durga_mondir/page_detail.html', context)
+
+
+@conditional_public_page(Event, boundaries=event_boundaries)
+@cache_public_page(Event, boundaries=event_boundaries)
+async def events(request):
+    now = timezone.now()
+    active_events = Event.objects.filter(is_active=True)
+    upcoming_events = active_events.filter(date_time__gt=now).order_by('date_time')
+
+    filter_type = request.GET.get('filter', 'all')
+    if filter_type == 'upcoming':
+        parts = [upcoming_events]
+    elif filter_type == 'past':
+        parts = [active_events.filter(date_time__lt=now).order_by('-date_time')]
+    else:
+        parts = [upcoming_events, active_events.filter(date_time__lte=now).order_by('date_time')]
+
+    # Count every part alongside the site context, then fetch the page
+    event_list = ChainedQuerySets(*parts)
+    context, *counts = await run_concurrently(get_site_context, *(part.count for part in parts))
+    event_list.counts = counts
+    paginator = Paginator(event_list, 6)
+    events_page = await sync_to_async(paginator.get_page)(request.GET.get('page'))
+
+    context.update({
+        'events': events_page,
+        'filter_type': filter_type,
+    })
+    return await arender(request, 'durga_mondir/events.html', context)
+
+
+@conditional_public_page(Event)
+@cache_public_page(Event)
+async def events_calendar(request):
+    """JSON feed of active events between ?start= and ?end= for the calendar view"""
+    calendar_events = calendar_queryset(request)
+    if calendar_events is None:
+        return JsonResponse({'error': 'Invalid start/end range'}, status=400)
+
+    events_data = [calendar_event_data(event) async for event in calendar_events]
+    response = JsonResponse(events_data, safe=False)
+    patch_cache_control(response, public=True, max_age=CALENDAR_MAX_AGE)
+    return response
+
+
+@conditional_public_page(GalleryAlbum, GalleryPhoto)
+@cache_public_page(GalleryAlbum, GalleryPhoto)
+async def gallery_view(request):
+    albums = GalleryAlbum.objects.all().order_by('-created_at')
+    paginator = Paginator(albums, 12)
+    context, album_count = await run_concurrently(get_site_context, albums.count)
+    paginator.count = album_count
+    albums_page = await sync_to_async(paginator.get_page)(request.GET.get('page'))
+
+    context['albums'] = albums_page
+    return await arender(request, 'durga_mondir/gallery.html', context)
+
+
+@conditional_public_page(GalleryAlbum, GalleryPhoto)
+async def album_detail(request, album_id):
+    """Album detail view with infinite scroll for photos"""
+    album = await aget_object_or_404(GalleryAlbum, id=album_id)
+
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        cursor = decode_cursor(request.GET.get('cursor', ''))
+        if cursor is None and 'cursor' in request.GET:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        photos_page, next_cursor = await sync_to_async(keyset_page)(album.photos.all(), cursor, PHOTOS_PER_PAGE)
+        return photos_response(photos_page, next_cursor)
+
+    context, (photos_page, next_cursor) = await run_concurrently(
+        get_site_context,
+        lambda: keyset_page(album.photos.all(), None, PHOTOS_PER_PAGE),
+    )
+    context.update({
+        'album': album,
+        'photos': photos_page,
+        'next_cursor': next_cursor,
+    })
+    return await arender(request, 'durga_mondir/album_detail.html', context)
+
+
+async def contact(request):
+    context = await aget_site_context()
+
+    if request.method == 'POST':
+        await contact_message(request).asave()
+
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({'success': True, 'message': CONTACT_SUCCESS_MESSAGE})
+        context['success_message'] = CONTACT_SUCCESS_MESSAGE
+
+    return await arender(request, 'durga_mondir/contact.html', context)
+
+
+async def _members_page(request, model, template_name):
+    members = model.objects.filter(is_active=True).order_by('category_order', 'order', 'name')
+    context, members_by_category = await run_concurrently(get_site_context, lambda: group_by_category(members))
+    context['members_by_category'] = members_by_category
+    return await arender(request, template_name, context)
+
+
+@conditional_public_page(CommitteeMember)
+@cache_public_page(CommitteeMember)
+async def committee(request):
+    """Committee members view"""
+    return await _members_page(request, CommitteeMember, 'durga_mondir/committee.html')
+
+
+@conditional_public_page(DurgaSangha)
+@cache_public_page(DurgaSangha)
+async def durga_sangha(request):
+    """Durga Sangha members view"""
+    return await _members_page(request, DurgaSangha, 'durga_mondir/durga_sangha.html')
@@ -0,0 +1,438 @@
+"""
+Cache helpers shared by the public views.
+
+Every durga model has a content version stored in the Django cache. Saving or
+deleting a row bumps the version of its model (see signals.py) once the
+transaction commits, so anything cached under a key built from those
+versions is invalidated automatically. Bumping any earlier would let a
+request that still reads the old rows cache them under the new version.
+"""
+import hashlib
+import time
+from datetime import datetime, time as datetime_time
+from functools import partial, wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from . import compression, metrics
+from .db import run_concurrently
+from .routers import note_content_change
+from .models import (
+    SiteSettings, Page, DurgaPujaCountdown, Slider, Event, Gallery, GalleryAlbum, PujaDay, DonationInfo
+)
+
+VERSION_KEY_PREFIX = 'durga:version:'
+
+# Site chrome only changes when one of these models changes
+SITE_CONTEXT_MODELS = (SiteSettings, Page, DurgaPujaCountdown)
+SITE_CONTEXT_TIMEOUT = 60 * 60 * 24
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Everything home.html needs besides the site context, keyed by the versions of these models
+HOME_SNAPSHOT_KEY = 'durga:home_snapshot'
+HOME_SNAPSHOT_MODELS = (Slider, Event, Gallery, GalleryAlbum, PujaDay, DonationInfo)
+HOME_SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+BANGLA_DIGITS = str.maketrans('0123456789', '০১২৩৪৫৬৭৮৯')
+
+# In-process copy of the site chrome: (versions, payload)
+_site_context_local = None
+
+
+def _version_key(model):
+    return VERSION_KEY_PREFIX + model._meta.label_lower
+
+
+def _initial_version():
+    # Start from the clock so a version evicted from the cache never
+    # comes back with a value that was already used for older content
+    return int(time.time() * 1000)
+
+
+def get_versions(models):
+    """Return the current content versions of the given models as a tuple"""
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in found}
+    if missing:
+        for key, value in missing.items():
+            cache.add(key, value, None)
+        found.update(cache.get_many(list(missing)))
+    return tuple(found.get(key, 0) for key in keys)
+
+
+def _bump(model):
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+
+
+class _PendingChanges:
+    """The content changes of one transaction, applied once it commits"""
+
+    def __init__(self):
+        self.models = set()
+        self.home_snapshot = False
+        self.applied = False
+
+    def __call__(self):
+        self.applied = True
+        for model in self.models:
+            _bump(model)
+        if self.models:
+            note_content_change(self.models)
+        if self.home_snapshot:
+            _queue_home_snapshot()
+
+
+def _pending_changes():
+    """Return the changes of the current transaction and whether they wait for a commit"""
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return _PendingChanges(), False
+    for _, func, _ in connection.run_on_commit:
+        if isinstance(func, _PendingChanges) and not func.applied:
+            return func, True
+    pending = _PendingChanges()
+    transaction.on_commit(pending)
+    return pending, True
+
+
+def bump_version(model):
+    """Invalidate everything cached for the given model once the current transaction commits"""
+    pending, deferred = _pending_changes()
+    pending.models.add(model)
+    if not deferred:
+        pending()
+
+
+def versioned_key(prefix, versions, *parts):
+    """Build a cache key from a prefix, model versions and extra parts"""
+    raw = ':'.join(['.'.join(str(version) for version in versions), *[str(part) for part in parts]])
+    return f'{prefix}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def _build_site_payload():
+    site_settings = SiteSettings.objects.first()
+    menu_pages = list(Page.objects.filter(show_in_menu=True, is_published=True).order_by('menu_order'))
+    countdown = DurgaPujaCountdown.objects.filter(is_active=True).first()
+    return {
+        'site_settings': site_settings,
+        'menu_pages': menu_pages,
+        'countdown': countdown,
+    }
+
+
+def get_site_context():
+    """Get common site context for all views"""
+    global _site_context_local
+
+    versions = get_versions(SITE_CONTEXT_MODELS)
+    local = _site_context_local
+    if local is not None and local[0] == versions:
+        payload = local[1]
+        metrics.record_cache('site_context', True)
+    else:
+        key = versioned_key('durga:site_context', versions)
+        payload = cache.get(key)
+        metrics.record_cache('site_context', payload is not None)
+        if payload is None:
+            payload = _build_site_payload()
+            cache.set(key, payload, SITE_CONTEXT_TIMEOUT)
+        _site_context_local = (versions, payload)
+
+    # Days remaining changes with the clock, so it is never cached
+    countdown = payload['countdown']
+    countdown_days_bangla = None
+    if countdown and countdown.is_countdown_active():
+        countdown_days_bangla = str(countdown.days_remaining()).translate(BANGLA_DIGITS)
+
+    return {
+        'site_settings': payload['site_settings'],
+        'menu_pages': payload['menu_pages'],
+        'countdown': countdown,
+        'countdown_days_bangla': countdown_days_bangla,
+    }
+
+
+async def aget_site_context():
+    """get_site_context() for async views"""
+    return await sync_to_async(get_site_context)()
+
+
+# The homepage snapshot; the queries are independent of each other
+HOME_SNAPSHOT_QUERIES = {
+    'slider_items': lambda: list(Slider.objects.filter(is_active=True).order_by('order')[:5]),
+    'upcoming_events': lambda: list(Event.objects.filter(is_active=True).order_by('date_time')[:3]),
+    'featured_gallery': lambda: list(Gallery.objects.filter(is_featured=True)[:6]),
+    'featured_albums': lambda: list(GalleryAlbum.objects.filter(is_featured=True)[:4]),
+    'puja_days': lambda: list(PujaDay.objects.filter(is_active=True).order_by('order', 'date')[:6]),
+    'donation_info': lambda: DonationInfo.objects.filter(is_active=True).first(),
+}
+
+
+def home_snapshot_key():
+    """Cache key of the homepage snapshot for the current content"""
+    return versioned_key(HOME_SNAPSHOT_KEY, get_versions(HOME_SNAPSHOT_MODELS))
+
+
+def build_home_snapshot(key=None):
+    """Query everything the homepage renders and store it under one cache key"""
+    # Take the key first: a change committed meanwhile must not be cached as this content
+    key = key or home_snapshot_key()
+    snapshot = {name: query() for name, query in HOME_SNAPSHOT_QUERIES.items()}
+    cache.set(key, snapshot, HOME_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def get_home_snapshot():
+    """Load the homepage snapshot with a single cache read, building it if missing"""
+    key = home_snapshot_key()
+    snapshot = cache.get(key)
+    metrics.record_cache('home_snapshot', snapshot is not None)
+    if snapshot is None:
+        snapshot = build_home_snapshot(key)
+    return snapshot
+
+
+async def aget_home_snapshot():
+    """get_home_snapshot() for async views, running the snapshot queries concurrently"""
+    key = await sync_to_async(home_snapshot_key)()
+    snapshot = await cache.aget(key)
+    metrics.record_cache('home_snapshot', snapshot is not None)
+    if snapshot is None:
+        results = await run_concurrently(*HOME_SNAPSHOT_QUERIES.values())
+        snapshot = dict(zip(HOME_SNAPSHOT_QUERIES, results))
+        await cache.aset(key, snapshot, HOME_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def _queue_home_snapshot():
+    from .tasks import rebuild_home_snapshot
+    rebuild_home_snapshot.delay()
+
+
+def refresh_home_snapshot():
+    """
+    Rebuild the homepage snapshot in the background once the change is
+    committed, once per transaction however many rows it touched. The old
+    snapshot is keyed by the old content versions, so it is never served again.
+    """
+    pending, deferred = _pending_changes()
+    pending.home_snapshot = True
+    if not deferred:
+        pending()
+
+
+def event_boundaries():
+    """
+    Return the start of the latest active event that has begun and of the next
+    one that has not (either may be None).
+
+    The events page splits events into upcoming and past by the clock, so what
+    it renders changes at these times as well as on edits.
+    """
+    key = versioned_key('durga:event_boundaries', get_versions((Event,)))
+    now = timezone.now()
+    boundaries = cache.get(key)
+    if boundaries is None or (boundaries[1] is not None and boundaries[1] <= now):
+        boundaries = Event.objects.filter(is_active=True).aggregate(
+            started=Max('date_time', filter=Q(date_time__lte=now)),
+            upcoming=Min('date_time', filter=Q(date_time__gt=now)),
+        )
+        boundaries = (boundaries['started'], boundaries['upcoming'])
+        cache.set(key, boundaries, PAGE_CACHE_TIMEOUT)
+    return boundaries
+
+
+def _boundary_part(boundaries):
+    """Cache key part that changes once the next boundary has passed"""
+    if boundaries is None:
+        return ''
+    upcoming = boundaries()[1]
+    return upcoming.isoformat() if upcoming else ''
+
+
+def _is_cacheable_request(request, user):
+    return request.method in ('GET', 'HEAD') and not user.is_authenticated
+
+
+def _is_cacheable_response(response):
+    return response.status_code == 200 and not response.streaming and not response.cookies
+
+
+def _compressed_page(key, response, encoding):
+    """Return the copy of a cached page compressed with encoding, compressing and caching it if needed"""
+    if encoding is None:
+        return response
+    compressed = compression.compressed_copy(response, encoding)
+    if compressed is None:
+        return response
+    cache.set(f'{key}:{encoding}', compressed, PAGE_CACHE_TIMEOUT)
+    return compressed
+
+
+def _cached_page(request, models, boundaries=None):
+    """
+    Return the page cache key for the request and the cached response, if any.
+
+    Clients that accept Brotli or gzip get a compressed copy of the page,
+    made the first time one of them asks for it.
+    """
+    versions = get_versions(SITE_CONTEXT_MODELS + models)
+    key = versioned_key(
+        'durga:page', versions, timezone.localdate().isoformat(), _boundary_part(boundaries),
+        request.get_full_path(),
+    )
+    encoding = compression.negotiate(request)
+    if encoding is not None:
+        response = cache.get(f'{key}:{encoding}')
+        if response is not None:
+            metrics.record_cache('page', True)
+            return key, response
+
+    response = cache.get(key)
+    metrics.record_cache('page', response is not None)
+    if response is not None:
+        response = _compressed_page(key, response, encoding)
+    return key, response
+
+
+def _cache_page(request, key, response):
+    """Cache a freshly rendered page minified and return the response for the request"""
+    compression.minify_response(response)
+    cache.set(key, response, PAGE_CACHE_TIMEOUT)
+    return _compressed_page(key, response, compression.negotiate(request))
+
+
+def cache_public_page(*models, boundaries=None):
+    """
+    Cache the rendered page for anonymous GET requests.
+
+    The key covers the path, the query string, today's date (the countdown
+    is rendered into every page) and the content versions of the site
+    context models plus the models the view renders, so an admin edit shows
+    up on the next request. Pages that also change with the clock pass
+    boundaries, a function like event_boundaries(); the key then changes
+    once the next boundary has passed.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _async_view(request, *args, **kwargs):
+                if not _is_cacheable_request(request, await request.auser()):
+                    return await view_func(request, *args, **kwargs)
+
+                key, response = await sync_to_async(_cached_page)(request, models, boundaries)
+                if response is not None:
+                    return response
+
+                response = await view_func(request, *args, **kwargs)
+                if _is_cacheable_response(response):
+                    response = await sync_to_async(_cache_page)(request, key, response)
+                return response
+            return _async_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if not _is_cacheable_request(request, request.user):
+                return view_func(request, *args, **kwargs)
+
+            key, response = _cached_page(request, models, boundaries)
+            if response is not None:
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if _is_cacheable_response(response):
+                response = _cache_page(request, key, response)
+            return response
+        return _wrapped_view
+    return decorator
+
+
+def _cached_latest_change(models):
+    """Return the cache key for the latest change of the given models and its cached value"""
+    versions = get_versions(models)
+    key = versioned_key('durga:last_modified', versions, *[model._meta.label_lower for model in models])
+    latest = cache.get(key)
+    metrics.record_cache('last_modified', latest is not None)
+    return key, latest
+
+
+def _latest_updated_at(model):
+    return model.objects.aggregate(latest=Max('updated_at'))['latest']
+
+
+def _newest(timestamps):
+    return max((timestamp for timestamp in timestamps if timestamp), default=None) or timezone.now()
+
+
+def _latest_change(models):
+    """Return the latest updated_at across the given models"""
+    key, latest = _cached_latest_change(models)
+    if latest is None:
+        latest = _newest([_latest_updated_at(model) for model in models])
+        cache.set(key, latest, PAGE_CACHE_TIMEOUT)
+    return latest
+
+
+async def _alatest_change(models):
+    """_latest_change() for async views, querying the models concurrently"""
+    key, latest = await sync_to_async(_cached_latest_change)(models)
+    if latest is None:
+        latest = _newest(await run_concurrently(*(partial(_latest_updated_at, model) for model in models)))
+        await cache.aset(key, latest, PAGE_CACHE_TIMEOUT)
+    return latest
+
+
+def conditional_public_page(*models, boundaries=None):
+    """
+    Answer conditional GETs with 304 Not Modified when nothing changed.
+
+    The ETag is derived from the content versions, so deletes (which leave no
+    timestamp behind) also change it. Last-Modified is the latest updated_at
+    of the rendered models, but never earlier than today's local midnight
+    because the countdown in the page changes every day, nor than the last
+    boundary that passed (see cache_public_page).
+    """
+    all_models = SITE_CONTEXT_MODELS + models
+
+    def etag_func(request, *args, **kwargs):
+        versions = get_versions(all_models)
+        return versioned_key(
+            'durga:etag', versions, timezone.localdate().isoformat(), _boundary_part(boundaries),
+            request.headers.get('X-Requested-With', ''),
+        )
+
+    def not_before():
+        midnight = timezone.make_aware(datetime.combine(timezone.localdate(), datetime_time.min))
+        started = boundaries()[0] if boundaries is not None else None
+        return max(midnight, started) if started else midnight
+
+    def last_modified_func(request, *args, **kwargs):
+        return max(_latest_change(all_models), not_before())
+
+    def decorator(view_func):
+        if not iscoroutinefunction(view_func):
+            return condition(etag_func=etag_func, last_modified_func=last_modified_func)(view_func)
+
+        @wraps(view_func)
+        async def _async_view(request, *args, **kwargs):
+            # condition() calls its functions on the event loop, where the
+            # ORM is off limits, so work both validators out beforehand
+            etag = await sync_to_async(etag_func)(request, *args, **kwargs)
+            last_modified = max(await _alatest_change(all_models), await sync_to_async(not_before)())
+            conditional_view = condition(
+                etag_func=lambda *args, **kwargs: etag,
+                last_modified_func=lambda *args, **kwargs: last_modified,
+            )(view_func)
+            return await conditional_view(request, *args, **kwargs)
+        return _async_view
+    return decorator
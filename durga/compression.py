@@ -0,0 +1,235 @@
+"""
+HTML minification and Brotli/gzip response compression.
+
+CompressionMiddleware collapses the whitespace our templates leave in HTML
+responses and compresses every compressible response of at least
+COMPRESSION_MIN_SIZE bytes with the best encoding the client accepts.
+Streaming responses are compressed chunk by chunk and flushed after every
+chunk, so the client still receives them progressively.
+
+The page cache (see cache.py) stores pages minified and keeps a compressed
+copy per encoding, made at the highest quality the first time a client asks
+for it. The middleware leaves responses that are already encoded alone, so a
+cached page costs no compression at all.
+"""
+import gzip
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Preferred first when the client accepts several with the same q-value
+ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(?:text/|application/(?:json|javascript|xml|xhtml\+xml|manifest\+json)|image/svg\+xml)'
+)
+
+# Per request: fast. Page cache copies are made once per content version: small
+BROTLI_QUALITY = 4
+GZIP_LEVEL = 6
+CACHED_BROTLI_QUALITY = 11
+CACHED_GZIP_LEVEL = 9
+
+# Whitespace is significant inside these, and comments may be conditional
+_VERBATIM = re.compile(r'<!--(?!\[if).*?-->|<(pre|textarea|script|style)\b.*?</\1\s*>', re.S | re.I)
+_LINE_BREAKS = re.compile(r'[ \t\r\n]*\n[ \t\r\n]*')
+_SPACES = re.compile(r'[ \t]{2,}')
+
+
+def _min_size():
+    return getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+
+
+def _collapse(html):
+    return _SPACES.sub(' ', _LINE_BREAKS.sub('\n', html))
+
+
+def minify_html(html):
+    """Collapse runs of whitespace and drop comments, leaving <pre>, <textarea>, scripts and styles alone"""
+    parts, text, position = [], '', 0
+    for match in _VERBATIM.finditer(html):
+        text += html[position:match.start()]
+        position = match.end()
+        if match.group(0).startswith('<!--'):
+            continue
+        parts += [_collapse(text), match.group(0)]
+        text = ''
+    parts.append(_collapse(text + html[position:]))
+    return ''.join(parts)
+
+
+def minify_response(response):
+    """Minify a rendered HTML response in place, once"""
+    if (response.streaming or getattr(response, 'minified', False) or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith('text/html')
+            or not getattr(settings, 'HTML_MINIFY', True)):
+        return response
+    minified = minify_html(response.content.decode(response.charset)).encode(response.charset)
+    response.content = minified
+    if response.has_header('Content-Length'):
+        response.headers['Content-Length'] = str(len(minified))
+    response.minified = True
+    return response
+
+
+def accepted_encodings(header):
+    """Parse Accept-Encoding into {coding: q-value}"""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        match = re.search(r'q\s*=\s*([0-9.]+)', params)
+        try:
+            accepted[coding] = float(match.group(1)) if match else 1.0
+        except ValueError:
+            accepted[coding] = 0.0
+    return accepted
+
+
+def negotiate(request):
+    """Return the encoding to compress the response to the request with, or None"""
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    candidates = [
+        (accepted.get(encoding, accepted.get('*', 0)), -index, encoding)
+        for index, encoding in enumerate(ENCODINGS)
+    ]
+    quality, _, encoding = max(candidates)
+    return encoding if quality > 0 else None
+
+
+def compress_bytes(content, encoding, cached=False):
+    if encoding == 'br':
+        return brotli.compress(content, mode=brotli.MODE_TEXT,
+                               quality=CACHED_BROTLI_QUALITY if cached else BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=CACHED_GZIP_LEVEL if cached else GZIP_LEVEL, mtime=0)
+
+
+def is_compressible(response):
+    if response.has_header('Content-Encoding') or not COMPRESSIBLE_TYPES.match(response.get('Content-Type', '')):
+        return False
+    return response.streaming or len(response.content) >= _min_size()
+
+
+def _mark_encoded(response, encoding):
+    response.headers['Content-Encoding'] = encoding
+    # Each encoding is a different representation (RFC 9110 8.8.1)
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response.headers['ETag'] = 'W/' + etag
+
+
+def compressed_copy(response, encoding):
+    """
+    Return a compressed copy of a cached page, compressed at the highest
+    quality, or None if it is not worth compressing.
+    """
+    if not is_compressible(response):
+        return None
+    content = compress_bytes(response.content, encoding, cached=True)
+    if len(content) >= len(response.content):
+        return None
+    copy = HttpResponse(content, status=response.status_code, headers=response.headers)
+    copy.headers['Content-Length'] = str(len(content))
+    patch_vary_headers(copy, ('Accept-Encoding',))
+    _mark_encoded(copy, encoding)
+    return copy
+
+
+class _StreamCompressor:
+    """Compress a stream and flush after every chunk"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self.compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+        else:
+            # wbits 31: a gzip header and trailer around the deflate stream
+            self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        if self.encoding == 'br':
+            return self.compressor.process(chunk) + self.compressor.flush()
+        return self.compressor.compress(chunk) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    compressor = _StreamCompressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    compressor = _StreamCompressor(encoding)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """Minify HTML and compress responses with Brotli or gzip; place right after WhiteNoiseMiddleware"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def _acall(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if response.get('Content-Encoding') in ENCODINGS:
+            # A compressed copy from the page cache; its ETag was added afterwards
+            _mark_encoded(response, response['Content-Encoding'])
+            return response
+
+        minify_response(response)
+        if not is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            # The compressed size is only known once the stream has been sent
+            del response.headers['Content-Length']
+        else:
+            content = compress_bytes(response.content, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers['Content-Length'] = str(len(content))
+        _mark_encoded(response, encoding)
+        return response
@@ -0,0 +1,131 @@
+"""
+Critical (above-the-fold) CSS.
+
+Every public page links its full stylesheets (static/css/base.css plus one
+per page) without blocking rendering, and inlines only the rules the top of
+the page needs. `manage.py build_critical_css` renders each page, keeps the
+rules whose selectors match the navbar and the first sections of <main>, and
+writes them to static/css/<url name>.critical.css. The {% critical_css %} tag
+inlines that file for the current route.
+"""
+import posixpath
+import re
+from functools import lru_cache
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+CRITICAL_SUFFIX = '.critical.css'
+
+COMMENT = re.compile(r'/\*.*?\*/', re.S)
+URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+# States a freshly loaded page is not in, and parts of an element that cannot be selected
+IGNORED_PSEUDO = re.compile(
+    r'::?(?:hover|focus(?:-within|-visible)?|active|visited|target|before|after|placeholder|selection|'
+    r'first-letter|first-line|marker|-webkit-[\w-]+|-moz-[\w-]+|-ms-[\w-]+)(?:\([^)]*\))?'
+)
+ANIMATION = re.compile(r'animation(?:-name)?\s*:([^;}]*)')
+
+
+def critical_path(name):
+    return f'css/{name}{CRITICAL_SUFFIX}'
+
+
+def parse(css):
+    """Split a stylesheet into (prelude, body) pairs; nested blocks stay unparsed in the body"""
+    css = COMMENT.sub('', css)
+    rules, start, depth, prelude = [], 0, 0, None
+    for index, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                prelude, start = css[start:index].strip(), index + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[start:index].strip()))
+                start = index + 1
+        elif char == ';' and depth == 0:
+            # @import and @charset
+            rules.append((css[start:index].strip(), None))
+            start = index + 1
+    return rules
+
+
+def split_selectors(prelude):
+    selectors, depth, current = [], 0, ''
+    for char in prelude:
+        depth += char == '('
+        depth -= char == ')'
+        if char == ',' and depth == 0:
+            selectors.append(current.strip())
+            current = ''
+        else:
+            current += char
+    return [selector for selector in [*selectors, current.strip()] if selector]
+
+
+def selector_matches(selector, fold):
+    selector = IGNORED_PSEUDO.sub('', selector).strip()
+    if not selector or selector.endswith(('>', '+', '~')):
+        # Page-wide parts such as ::-webkit-scrollbar
+        return True
+    try:
+        return fold.select_one(selector) is not None
+    except Exception:
+        # Selectors soupsieve does not understand are kept
+        return True
+
+
+def _format(prelude, body):
+    if body is None:
+        return f'{prelude};'
+    body = re.sub(r'\s+', ' ', body)
+    return f'{prelude}{{{body}}}'
+
+
+def _select(css, fold, keyframes):
+    kept = []
+    for prelude, body in parse(css):
+        prelude = re.sub(r'\s+', ' ', prelude)
+        if body is None or prelude.startswith('@font-face'):
+            kept.append(_format(prelude, body))
+        elif prelude.startswith(('@keyframes', '@-webkit-keyframes')):
+            keyframes.setdefault(prelude.split()[-1], []).append(_format(prelude, body))
+        elif prelude.startswith(('@media', '@supports')):
+            inner = _select(body, fold, keyframes)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif not prelude.startswith('@') and any(
+            selector_matches(selector, fold) for selector in split_selectors(prelude)
+        ):
+            kept.append(_format(prelude, body))
+    return ''.join(kept)
+
+
+def critical_rules(css, fold):
+    """Return the rules of css that apply to the elements in the fold soup, and the keyframes they use"""
+    keyframes = {}
+    text = _select(css, fold, keyframes)
+    used = {name for value in ANIMATION.findall(text) for name in re.findall(r'[\w-]+', value)}
+    return text + ''.join(rule for name in keyframes if name in used for rule in keyframes[name])
+
+
+def absolute_urls(css, base='css/'):
+    """Point the relative url()s of a stylesheet in static/css at their (hashed) static URLs"""
+    def replace(match):
+        url = match.group(2)
+        if re.match(r'^(?:[a-z]+:|/|#)', url):
+            return match.group(0)
+        return f"url('{static(posixpath.normpath(posixpath.join(base, url)))}')"
+    return URL.sub(replace, css)
+
+
+@lru_cache(maxsize=None)
+def load_critical_css(name):
+    """Return the built critical CSS for the route name, ready to inline, or '' if it was never built"""
+    path = finders.find(critical_path(name))
+    if not path:
+        return ''
+    with open(path, encoding='utf-8') as css_file:
+        return absolute_urls(COMMENT.sub('', css_file.read()).strip())
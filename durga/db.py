@@ -0,0 +1,83 @@
+"""
+Database helpers shared by the middleware and the async views.
+
+Query observers (metrics, slow-query capture, profiling) are registered for
+the current request with observe_queries(). They live in a context variable
+rather than on the connection, so they follow the request into every thread
+that runs its queries: the per-request sync thread under ASGI as well as the
+worker threads of run_concurrently().
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_observers = ContextVar('durga_query_observers', default=())
+
+# Worker threads shared by every run_concurrently() call in the process
+_fan_out_executor = None
+
+
+def _dispatch(execute, sql, params, many, context):
+    # connection.execute_wrapper() hook installed once on every connection
+    observers = _observers.get()
+    for observer in reversed(observers):
+        execute = partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_dispatch(sender, connection, **kwargs):
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+@contextmanager
+def observe_queries(observer):
+    """Pass every query of the current request through an execute_wrapper-style observer"""
+    token = _observers.set(_observers.get() + (observer,))
+    try:
+        yield
+    finally:
+        _observers.reset(token)
+
+
+def _run_in_worker(func):
+    try:
+        return func()
+    finally:
+        # Worker threads are reused; do not keep their connections past CONN_MAX_AGE
+        close_old_connections()
+
+
+def _executor():
+    global _fan_out_executor
+    if _fan_out_executor is None:
+        _fan_out_executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'DB_FANOUT_WORKERS', 4), thread_name_prefix='durga-db',
+        )
+    return _fan_out_executor
+
+
+async def run_concurrently(*funcs):
+    """
+    Run blocking ORM callables at the same time and return their results in order.
+
+    The async ORM sends every query through one thread per request, so awaiting
+    several of them still runs them one after another. Each callable here runs
+    in a worker thread, with that thread's database connection. The workers are
+    shared by all requests and capped at DB_FANOUT_WORKERS, so concurrent cold
+    requests queue for a worker instead of opening a connection per callable
+    and draining the connection pool.
+    """
+    executor = _executor()
+    return await asyncio.gather(*(
+        sync_to_async(_run_in_worker, thread_sensitive=False, executor=executor)(func) for func in funcs
+    ))
@@ -0,0 +1,252 @@
+"""
+Image processing helpers used by the background tasks.
+"""
+import base64
+import hashlib
+import json
+import os
+import posixpath
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from . import metrics
+
+# Slider images are shown full width at 16:9
+SLIDER_SIZE = (1920, 1080)
+
+# Album grid thumbnails (the smallest JPEG derivative at least this wide)
+# and the inline blurred placeholder
+THUMBNAIL_WIDTH = 480
+PLACEHOLDER_WIDTH = 16
+
+# Image fields that get responsive derivatives, by model label
+RESPONSIVE_IMAGE_FIELDS = {
+    'durga.page': ('featured_image',),
+    'durga.event': ('featured_image',),
+    'durga.galleryalbum': ('cover_image',),
+    'durga.galleryphoto': ('image',),
+    'durga.committeemember': ('image',),
+    'durga.durgasangha': ('image',),
+    'durga.pujaday': ('image',),
+}
+
+DERIVATIVE_ROOT = 'derivatives'
+DERIVATIVE_WIDTHS = (320, 640, 960, 1280)
+DERIVATIVE_QUALITY = {'avif': 60, 'webp': 75, 'jpeg': 80}
+DERIVATIVE_CACHE_TIMEOUT = 60 * 60 * 24
+# Images without derivatives yet are looked up again soon: the worker may be making them
+DERIVATIVE_MISS_TIMEOUT = 60
+
+
+def file_sha256(field_file):
+    """Return the SHA-256 hex digest of a stored file"""
+    digest = hashlib.sha256()
+    field_file.open('rb')
+    try:
+        for chunk in field_file.chunks():
+            digest.update(chunk)
+    finally:
+        field_file.close()
+    return digest.hexdigest()
+
+
+def fit_slider_image(path, output_size=SLIDER_SIZE):
+    """Center-crop the image at path to the slider ratio and resize it in place"""
+    img = Image.open(path)
+    
+    # Calculate crop dimensions to maintain aspect ratio
+    img_width, img_height = img.size
+    target_ratio = output_size[0] / output_size[1]  # 16:9 = 1.777
+    img_ratio = img_width / img_height
+    
+    if img_ratio > target_ratio:
+        # Image is wider, crop width
+        new_width = int(img_height * target_ratio)
+        left = (img_width - new_width) // 2
+        top = 0
+        right = left + new_width
+        bottom = img_height
+    else:
+        # Image is taller, crop height
+        new_height = int(img_width / target_ratio)
+        left = 0
+        top = (img_height - new_height) // 2
+        right = img_width
+        bottom = top + new_height
+    
+    # Crop and resize
+    img = img.crop((left, top, right, bottom))
+    img = img.resize(output_size, Image.Resampling.LANCZOS)
+    
+    # Save the processed image
+    img.save(path, quality=85, optimize=True)
+
+
+def _open_image(field_file):
+    field_file.open('rb')
+    try:
+        img = Image.open(field_file)
+        img.load()
+    finally:
+        field_file.close()
+    
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+    return img
+
+
+def _encode_jpeg(img, quality):
+    buffer = BytesIO()
+    img.convert('RGB').save(buffer, 'JPEG', quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def build_placeholder(field_file):
+    """
+    Return a tiny base64 JPEG data URI of an image, which the browser scales
+    up (and CSS blurs) while the real thumbnail loads.
+    """
+    img = _open_image(field_file)
+    width, height = img.size
+    placeholder = img.resize(
+        (PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))), Image.Resampling.BILINEAR
+    )
+    return 'data:image/jpeg;base64,' + base64.b64encode(_encode_jpeg(placeholder, 40)).decode()
+
+
+def thumbnail_name(manifest):
+    """The JPEG derivative album grids show: the smallest at least THUMBNAIL_WIDTH wide"""
+    jpeg = manifest['sources']['jpeg']
+    return next((name for name, width in jpeg if width >= THUMBNAIL_WIDTH), jpeg[-1][0])
+
+
+def derivative_formats():
+    """Formats to generate, best first; AVIF only when Pillow can write it"""
+    Image.init()
+    formats = ['webp', 'jpeg']
+    if 'AVIF' in Image.SAVE:
+        formats.insert(0, 'avif')
+    return formats
+
+
+def _derivative_dir(name):
+    # Keep the extension so photo.jpg and photo.png do not share a directory
+    return posixpath.join(DERIVATIVE_ROOT, name)
+
+
+def _manifest_name(name):
+    return posixpath.join(_derivative_dir(name), 'manifest.json')
+
+
+def _manifest_cache_key(name):
+    return 'durga:derivatives:' + hashlib.md5(name.encode()).hexdigest()
+
+
+def has_derivatives(name):
+    return default_storage.exists(_manifest_name(name))
+
+
+def generate_derivatives(field_file):
+    """
+    Write resized copies of an image in every derivative format.
+
+    Returns the manifest, which is also stored next to the files and cached:
+    {'width': ..., 'height': ..., 'sources': {format: [[name, width], ...]}}
+    """
+    img = _open_image(field_file)
+    width, height = img.size
+    
+    # Never upscale: widths above the original collapse into the original width
+    widths = sorted({w for w in DERIVATIVE_WIDTHS if w < width} | {min(width, DERIVATIVE_WIDTHS[-1])})
+    
+    directory = _derivative_dir(field_file.name)
+    sources = {fmt: [] for fmt in derivative_formats()}
+    for target_width in widths:
+        target_height = max(1, round(height * target_width / width))
+        resized = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
+        for fmt in sources:
+            frame = resized.convert('RGB') if fmt == 'jpeg' else resized
+            buffer = BytesIO()
+            frame.save(buffer, fmt.upper(), quality=DERIVATIVE_QUALITY[fmt], optimize=fmt == 'jpeg')
+            name = posixpath.join(directory, f'{target_width}.{"jpg" if fmt == "jpeg" else fmt}')
+            default_storage.delete(name)
+            default_storage.save(name, ContentFile(buffer.getvalue()))
+            sources[fmt].append([name, target_width])
+    
+    manifest = {'width': width, 'height': height, 'sources': sources}
+    _save_manifest(field_file.name, manifest)
+    return manifest
+
+
+def _save_manifest(name, manifest):
+    manifest_name = _manifest_name(name)
+    default_storage.delete(manifest_name)
+    default_storage.save(manifest_name, ContentFile(json.dumps(manifest).encode()))
+    cache.set(_manifest_cache_key(name), manifest, DERIVATIVE_CACHE_TIMEOUT)
+
+
+def link_or_copy(source, name):
+    """Store the file source under the free name as well, as a hard link where the storage is local"""
+    try:
+        path = default_storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.link(default_storage.path(source), path)
+        return name
+    except (NotImplementedError, OSError):
+        with default_storage.open(source) as source_file:
+            return default_storage.save(name, source_file)
+
+
+def copy_derivatives(source, name):
+    """Give the image stored as name the derivatives of source, the same image; return the manifest or None"""
+    manifest = get_derivatives(source)
+    if manifest is None:
+        return None
+    source_dir, directory = _derivative_dir(source), _derivative_dir(name)
+    sources = {
+        fmt: [[link_or_copy(derivative, directory + derivative[len(source_dir):]), width]
+              for derivative, width in entries]
+        for fmt, entries in manifest['sources'].items()
+    }
+    manifest = {**manifest, 'sources': sources}
+    _save_manifest(name, manifest)
+    return manifest
+
+
+def delete_derivatives(name):
+    """Delete every derivative of a stored image name"""
+    directory = _derivative_dir(name)
+    try:
+        _, file_names = default_storage.listdir(directory)
+    except FileNotFoundError:
+        file_names = []
+    for file_name in file_names:
+        default_storage.delete(posixpath.join(directory, file_name))
+    try:
+        os.rmdir(default_storage.path(directory))
+    except (NotImplementedError, OSError):
+        # Not a local storage, or the directory is already gone
+        pass
+    cache.delete(_manifest_cache_key(name))
+
+
+def get_derivatives(name):
+    """Return the derivative manifest for a stored image name, or None"""
+    key = _manifest_cache_key(name)
+    manifest = cache.get(key)
+    metrics.record_cache('derivatives', manifest is not None)
+    if manifest is None:
+        manifest_name = _manifest_name(name)
+        if default_storage.exists(manifest_name):
+            with default_storage.open(manifest_name) as manifest_file:
+                manifest = json.load(manifest_file)
+            cache.set(key, manifest, DERIVATIVE_CACHE_TIMEOUT)
+        else:
+            manifest = {}
+            cache.set(key, manifest, DERIVATIVE_MISS_TIMEOUT)
+    return manifest or None
@@ -0,0 +1,118 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.db.utils import ConnectionHandler
+from django.utils import timezone
+
+from .benchmark_site import percentile
+
+MODES = ('per-request', 'persistent', 'pooled')
+
+
+class Command(BaseCommand):
+    help = ('Measure the per-request database connection overhead with new connections per request, '
+            'persistent connections and a psycopg3 pool')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database settings to start from')
+        parser.add_argument('--requests', type=int, default=500, help='Simulated requests per mode')
+        parser.add_argument('--concurrency', type=int, default=4, help='Threads, each like a server worker thread')
+        parser.add_argument('--queries', type=int, default=1, help='Queries per simulated request')
+        parser.add_argument('--mode', action='append', dest='modes', choices=MODES,
+                            help='Only run these modes (repeatable)')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        self.options = options
+        base = deepcopy(settings.DATABASES[options['database']])
+        base.get('OPTIONS', {}).pop('pool', None)
+
+        results = {}
+        for mode in options['modes'] or MODES:
+            if mode == 'pooled' and base['ENGINE'] != 'django.db.backends.postgresql':
+                self.stderr.write('Skipping pooled: connection pools need PostgreSQL')
+                continue
+            results[mode] = self.run_mode(mode, self.mode_settings(base, mode))
+
+        self.stdout.write(f'{"mode":<14}{"requests":>10}{"mean ms":>10}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}')
+        for mode, result in results.items():
+            self.stdout.write(f'{mode:<14}{result["requests"]:>10}{result["mean_ms"]:>10}{result["p50_ms"]:>9}'
+                              f'{result["p95_ms"]:>9}{result["p99_ms"]:>9}')
+
+        if options['output']:
+            report = {
+                'timestamp': timezone.now().isoformat(),
+                'engine': base['ENGINE'],
+                'host': base.get('HOST') or None,
+                'concurrency': options['concurrency'],
+                'queries': options['queries'],
+                'modes': results,
+            }
+            with open(options['output'], 'w') as output_file:
+                json.dump(report, output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+    def mode_settings(self, base, mode):
+        database = deepcopy(base)
+        database['CONN_HEALTH_CHECKS'] = mode != 'per-request'
+        database['CONN_MAX_AGE'] = 600 if mode == 'persistent' else 0
+        if mode == 'pooled':
+            from psycopg_pool import ConnectionPool
+
+            database.setdefault('OPTIONS', {})['pool'] = {
+                'min_size': self.options['concurrency'],
+                'max_size': self.options['concurrency'],
+                'check': ConnectionPool.check_connection,
+            }
+        return database
+
+    def run_mode(self, mode, database):
+        # A separate alias per mode, so Django keeps a separate pool for each
+        alias = f'benchmark_{mode}'
+        connections = ConnectionHandler({DEFAULT_DB_ALIAS: database, alias: database})
+        concurrency = max(1, self.options['concurrency'])
+        shares = [self.options['requests'] // concurrency + (i < self.options['requests'] % concurrency)
+                  for i in range(concurrency)]
+
+        def warm_up(_):
+            # Opens the pool or the thread's persistent connection
+            self.simulate_request(connections[alias])
+
+        def worker(count):
+            connection = connections[alias]
+            try:
+                return [self.simulate_request(connection) for _ in range(count)]
+            finally:
+                connection.close()
+
+        try:
+            with ThreadPoolExecutor(concurrency) as executor:
+                list(executor.map(warm_up, range(concurrency)))
+                latencies = sorted(ms for batch in executor.map(worker, shares) for ms in batch)
+        finally:
+            if mode == 'pooled':
+                connections[alias].close_pool()
+
+        return {
+            'requests': len(latencies),
+            'mean_ms': round(sum(latencies) / len(latencies), 3),
+            'p50_ms': round(percentile(latencies, 0.50), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+        }
+
+    def simulate_request(self, connection):
+        """One request's database work, between Django's request_started and request_finished handlers"""
+        start = time.perf_counter()
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            for _ in range(self.options['queries']):
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        connection.close_if_unusable_or_obsolete()
+        return (time.perf_counter() - start) * 1000
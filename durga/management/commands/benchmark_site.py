@@ -0,0 +1,296 @@
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from durga.db import observe_queries
+from durga.models import GalleryAlbum, Page
+from durga.pagination import encode_cursor
+
+AJAX_HEADERS = {'X-Requested-With': 'XMLHttpRequest'}
+# AsyncClient always sends this Host header
+ASGI_HOST = 'testserver'
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    # round() first so float noise such as 0.07 * 100 = 7.000000000000001 does not move up a rank
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark throughput, latency and query counts of the public routes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', help='Benchmark a running server (e.g. http://127.0.0.1:8000) '
+                                               'instead of calling the views in-process')
+        parser.add_argument('--host', default='localhost', help='Host header for in-process requests '
+                                                               '(without --asgi)')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per route')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per route')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--route', action='append', dest='routes', help='Only run these routes (repeatable)')
+        parser.add_argument('--cold', action='store_true', help='Clear the cache before every request '
+                                                                '(in-process only)')
+        parser.add_argument('--asgi', action='store_true', help='Serve the requests through the ASGI handler and '
+                                                                'the async views, one event loop for all workers '
+                                                                '(in-process only)')
+        parser.add_argument('--db-latency', type=float, default=0, help='Add this many milliseconds to every '
+                                                                        'query to simulate a remote database '
+                                                                        '(in-process only)')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Compare against a previous --output file')
+
+    def handle(self, *args, **options):
+        for option in ('cold', 'asgi', 'db_latency'):
+            if options[option] and options['base_url']:
+                raise CommandError(f'--{option.replace("_", "-")} only works in-process')
+
+        routes = self.routes()
+        if options['routes']:
+            unknown = set(options['routes']) - set(routes)
+            if unknown:
+                raise CommandError(f'Unknown routes: {", ".join(sorted(unknown))}. '
+                                   f'Available: {", ".join(routes)}')
+            routes = {name: routes[name] for name in options['routes']}
+
+        self.options = options
+        self.local = threading.local()
+        if options['base_url']:
+            in_process = nullcontext()
+        else:
+            # Otherwise every request would be measured as a 400 from the host check
+            host = ASGI_HOST if options['asgi'] else options['host']
+            in_process = override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, host])
+        urlconf = override_settings(ROOT_URLCONF='durga_mondir.asgi_urls') if options['asgi'] else nullcontext()
+        with in_process, urlconf:
+            results = {name: self.run_route(path, headers) for name, (path, headers) in routes.items()}
+
+        report = {
+            'commit': self.git_commit(),
+            'timestamp': timezone.now().isoformat(),
+            'mode': 'http' if options['base_url'] else 'in-process-asgi' if options['asgi'] else 'in-process',
+            'base_url': options['base_url'],
+            'concurrency': options['concurrency'],
+            'requests': options['requests'],
+            'cold': options['cold'],
+            'db_latency_ms': options['db_latency'],
+            'database': connection.vendor,
+            **self.database_setup(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'routes': results,
+        }
+        self.print_setup(report)
+        self.print_table(results)
+        failed = {name: result['errors'] for name, result in results.items() if result['errors']}
+        if failed:
+            raise CommandError('Error responses, so the timings are not comparable: ' + ', '.join(
+                f'{name} {errors}/{results[name]["requests"]}' for name, errors in failed.items()
+            ))
+
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                self.print_comparison(json.load(baseline_file), report)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(report, output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+    def routes(self):
+        """name: (path, extra headers) for every public route that has data to show"""
+        today = timezone.localdate()
+        calendar_query = urlencode({
+            'start': today.replace(day=1).isoformat(),
+            'end': (today.replace(day=1) + timedelta(days=42)).isoformat(),
+        })
+        routes = {
+            'home': (reverse('durga:home'), {}),
+            'events': (reverse('durga:events'), {}),
+            'events_upcoming': (reverse('durga:events') + '?filter=upcoming', {}),
+            'events_calendar': (reverse('durga:events_calendar') + '?' + calendar_query, {}),
+            'gallery': (reverse('durga:gallery'), {}),
+            'committee': (reverse('durga:committee'), {}),
+            'durga_sangha': (reverse('durga:durga_sangha'), {}),
+            'contact': (reverse('durga:contact'), {}),
+        }
+
+        page = Page.objects.filter(is_published=True).order_by('menu_order').first()
+        if page:
+            routes['page_detail'] = (page.get_absolute_url(), {})
+
+        album = GalleryAlbum.objects.order_by('-photo_count').first()
+        if album:
+            album_url = reverse('durga:album_detail', args=[album.pk])
+            routes['album_detail'] = (album_url, {})
+            routes['album_detail_json'] = (album_url, AJAX_HEADERS)
+            # A deep infinite-scroll page, half way through the album
+            photo = album.photos.order_by('created_at', 'id')[album.photo_count // 2:].first()
+            if photo:
+                routes['album_detail_json_deep'] = (album_url + '?cursor=' + encode_cursor(photo), AJAX_HEADERS)
+        return routes
+
+    def fetch(self, path, headers):
+        """Make one request; return (status, seconds, queries or None)"""
+        if self.options['base_url']:
+            request = urllib.request.Request(self.options['base_url'].rstrip('/') + path, headers=headers)
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as error:
+                status = error.code
+            return status, time.perf_counter() - start, None
+
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client(HTTP_HOST=self.options['host'])
+        if self.options['cold']:
+            cache.clear()
+        with CaptureQueriesContext(connection) as ctx, observe_queries(self.simulate_latency):
+            start = time.perf_counter()
+            response = self.local.client.get(path, headers=headers)
+            elapsed = time.perf_counter() - start
+        return response.status_code, elapsed, len(ctx.captured_queries)
+
+    async def afetch(self, client, path, headers):
+        """fetch() through the ASGI handler; queries are counted across every thread the view used"""
+        if self.options['cold']:
+            await cache.aclear()
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with observe_queries(count), observe_queries(self.simulate_latency):
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            elapsed = time.perf_counter() - start
+        return response.status_code, elapsed, len(queries)
+
+    def simulate_latency(self, execute, sql, params, many, context):
+        if self.options['db_latency']:
+            time.sleep(self.options['db_latency'] / 1000)
+        return execute(sql, params, many, context)
+
+    def worker(self, path, headers, count):
+        try:
+            return [self.fetch(path, headers) for _ in range(count)]
+        finally:
+            # Each worker thread opened its own database connection
+            if not self.options['base_url']:
+                connection.close()
+
+    async def aworker(self, client, path, headers, count):
+        return [await self.afetch(client, path, headers) for _ in range(count)]
+
+    async def arun_route(self, path, headers, shares):
+        """Run the workers as tasks on one event loop; return (samples, wall seconds)"""
+        clients = [AsyncClient() for _ in shares]
+        await asyncio.gather(*(self.aworker(client, path, headers, self.options['warmup']) for client in clients))
+        start = time.perf_counter()
+        batches = await asyncio.gather(*(self.aworker(client, path, headers, n) for client, n in zip(clients, shares)))
+        return [sample for batch in batches for sample in batch], time.perf_counter() - start
+
+    def run_route(self, path, headers):
+        options = self.options
+        concurrency = max(1, options['concurrency'])
+        shares = [options['requests'] // concurrency + (i < options['requests'] % concurrency)
+                  for i in range(concurrency)]
+
+        if options['asgi']:
+            samples, wall = asyncio.run(self.arun_route(path, headers, shares))
+        else:
+            with ThreadPoolExecutor(concurrency) as executor:
+                list(executor.map(lambda _: self.worker(path, headers, options['warmup']), range(concurrency)))
+                start = time.perf_counter()
+                samples = [sample for batch in executor.map(lambda n: self.worker(path, headers, n), shares)
+                           for sample in batch]
+                wall = time.perf_counter() - start
+
+        latencies = sorted(seconds * 1000 for _, seconds, _ in samples)
+        queries = [count for _, _, count in samples if count is not None]
+        return {
+            'path': path,
+            'requests': len(samples),
+            'errors': sum(1 for status, _, _ in samples if not 200 <= status < 400),
+            'rps': round(len(samples) / wall, 1) if wall else None,
+            'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            'p50_ms': round(percentile(latencies, 0.50), 2) if latencies else None,
+            'p95_ms': round(percentile(latencies, 0.95), 2) if latencies else None,
+            'p99_ms': round(percentile(latencies, 0.99), 2) if latencies else None,
+            'queries_mean': round(sum(queries) / len(queries), 2) if queries else None,
+            'queries_max': max(queries) if queries else None,
+        }
+
+    def database_setup(self):
+        """How many connections the run could use, so results from different setups are not compared blindly"""
+        pool = connection.settings_dict.get('OPTIONS', {}).get('pool')
+        if pool is True:
+            pool = {}
+        return {
+            'db_pool': {key: value for key, value in pool.items() if key != 'check'} if pool is not None else None,
+            'db_conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'db_fanout_workers': settings.DB_FANOUT_WORKERS,
+        }
+
+    def print_setup(self, report):
+        pool = report['db_pool']
+        if pool is None:
+            pool_text = f'no pool, CONN_MAX_AGE {report["db_conn_max_age"]}'
+        else:
+            # psycopg_pool defaults: min_size 4, max_size = min_size
+            min_size = pool.get('min_size', 4)
+            pool_text = f'pool of {min_size}-{pool.get("max_size", min_size)} connections'
+        self.stdout.write(f'{report["mode"]}, concurrency {report["concurrency"]}, {report["database"]} '
+                          f'({pool_text}), {report["db_fanout_workers"]} fan-out workers\n')
+
+    def print_table(self, results):
+        self.stdout.write(f'{"route":<24}{"rps":>9}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}'
+                          f'{"queries":>9}{"errors":>8}')
+        for name, result in results.items():
+            queries = '-' if result['queries_mean'] is None else f'{result["queries_mean"]:g}'
+            self.stdout.write(f'{name:<24}{result["rps"]:>9}{result["p50_ms"]:>9}{result["p95_ms"]:>9}'
+                              f'{result["p99_ms"]:>9}{queries:>9}{result["errors"]:>8}')
+
+    def print_comparison(self, baseline, report):
+        self.stdout.write(f'\nCompared with {baseline.get("commit") or "baseline"} ({baseline.get("timestamp")}):')
+        for name, result in report['routes'].items():
+            before = baseline.get('routes', {}).get(name)
+            if not before or not before.get('rps') or not before.get('p95_ms'):
+                continue
+            rps_change = (result['rps'] - before['rps']) / before['rps'] * 100
+            p95_change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+            self.stdout.write(f'{name:<24}rps {rps_change:+6.1f}%   p95 {p95_change:+6.1f}%')
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from durga.critical_css import CRITICAL_SUFFIX, critical_path, critical_rules, load_critical_css
+from durga.models import GalleryAlbum, Page
+
+# Route names, as returned by request.resolver_match.url_name
+ROUTES = ('home', 'events', 'gallery', 'album_detail', 'committee', 'durga_sangha', 'contact', 'page_detail')
+
+
+def fold_of(soup, sections):
+    """Cut the page down to what is visible before scrolling: the navbar and the first sections of <main>"""
+    main = soup.body and soup.body.find('main', recursive=False)
+    if main is None:
+        raise CommandError('The page has no <main> directly in <body>')
+    for element in main.find_all(recursive=False)[sections:]:
+        element.decompose()
+    for element in main.find_next_siblings():
+        element.decompose()
+    return soup
+
+
+def stylesheets(soup):
+    """Static names of the stylesheets the page loads without blocking rendering"""
+    names = []
+    for link in soup.find_all('link', rel='preload', attrs={'as': 'style'}):
+        href = link['href']
+        if href.startswith(settings.STATIC_URL):
+            names.append(href[len(settings.STATIC_URL):])
+    return names
+
+
+class Command(BaseCommand):
+    help = (f'Render the public pages and write the CSS each needs above the fold to '
+            f'static/css/<route>{CRITICAL_SUFFIX}, which base.html inlines')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--route', action='append', dest='routes', choices=ROUTES,
+                            help='Only build these routes (repeatable)')
+        parser.add_argument('--sections', type=int, default=2,
+                            help='Top-level elements of <main> that count as above the fold')
+        parser.add_argument('--host', default='localhost', help='Host header for the rendered requests')
+
+    def handle(self, *args, **options):
+        output_dir = Path(settings.BASE_DIR) / 'static' / 'css'
+        paths = self.paths()
+        # Unhashed static URLs, and no page cache so the current templates are rendered
+        isolated = override_settings(
+            STORAGES={**settings.STORAGES,
+                      'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}},
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                'LOCATION': 'critical-css'}},
+        )
+        client = Client(HTTP_HOST=options['host'])
+
+        self.stdout.write(f'{"route":<16}{"stylesheets":>13}{"critical":>10}{"saved %":>9}')
+        with isolated:
+            for route in options['routes'] or ROUTES:
+                path = paths.get(route)
+                if path is None:
+                    self.stderr.write(f'Skipping {route}: no published content to render')
+                    continue
+                response = client.get(path)
+                if response.status_code != 200:
+                    raise CommandError(f'{path} returned {response.status_code}')
+
+                soup = BeautifulSoup(response.content, 'html.parser')
+                css = ''.join(self.read(name) for name in stylesheets(soup))
+                critical = critical_rules(css, fold_of(soup, options['sections']))
+                (output_dir / Path(critical_path(route)).name).write_text(
+                    f'/* Built by manage.py build_critical_css from the {route} page; do not edit */\n{critical}\n',
+                    encoding='utf-8',
+                )
+                full = len(css.encode())
+                self.stdout.write(f'{route:<16}{full:>13,}{len(critical.encode()):>10,}'
+                                  f'{(full - len(critical.encode())) / full * 100 if full else 0:>8.1f}%')
+
+        load_critical_css.cache_clear()
+        self.stdout.write(self.style.SUCCESS(f'Critical CSS written to {output_dir}'))
+
+    def paths(self):
+        paths = {route: reverse(f'durga:{route}') for route in ROUTES if route not in ('album_detail', 'page_detail')}
+        album = GalleryAlbum.objects.order_by('-photo_count').first()
+        if album:
+            paths['album_detail'] = reverse('durga:album_detail', args=[album.pk])
+        page = Page.objects.filter(is_published=True).order_by('menu_order').first()
+        if page:
+            paths['page_detail'] = page.get_absolute_url()
+        return paths
+
+    def read(self, name):
+        path = finders.find(name)
+        if not path:
+            raise CommandError(f'Stylesheet {name} not found')
+        with open(path, encoding='utf-8') as css_file:
+            return css_file.read()
@@ -0,0 +1,238 @@
+import colorsys
+import random
+from datetime import date, datetime, time, timedelta
+from io import BytesIO
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from PIL import Image, ImageDraw
+
+from durga.cache import bump_version, refresh_home_snapshot
+from durga.images import (
+    RESPONSIVE_IMAGE_FIELDS, build_placeholder, copy_derivatives, generate_derivatives, get_derivatives, link_or_copy,
+    thumbnail_name,
+)
+from durga.models import (
+    Page, Event, Gallery, Contact, Slider, GalleryAlbum, GalleryPhoto,
+    CommitteeMember, DurgaSangha, PujaDay
+)
+
+IMAGE_ROOT = 'benchmark'
+LANDSCAPE_SIZE = (1280, 853)
+PORTRAIT_SIZE = (600, 600)
+# Event and puja dates are spread around this day, so every run gives the same data
+ANCHOR_DATE = date(2025, 10, 1)
+
+COMMITTEE_CATEGORIES = ['উপদেষ্টা মণ্ডলী', 'কার্যনির্বাহী কমিটি', 'পূজা উদযাপন কমিটি', 'সদস্য']
+SANGHA_CATEGORIES = ['দুর্গা সংঘ', 'যুব সংঘ', 'মহিলা সংঘ']
+POSITIONS = ['সভাপতি', 'সহ-সভাপতি', 'সাধারণ সম্পাদক', 'কোষাধ্যক্ষ', 'সংগঠক', 'সদস্য']
+LOCATIONS = ['মূল মন্দির প্রাঙ্গণ', 'সৎসঙ্গ হল', 'পাঠাগার', 'নাটমন্দির']
+EVENT_TITLES = ['সাপ্তাহিক সৎসঙ্গ', 'গীতা পাঠ', 'হরিনাম সংকীর্তন', 'লক্ষ্মী পূজা', 'কালী পূজা', 'দুর্গা পূজা']
+WORDS = 'মা দুর্গা পূজা আরতি অঞ্জলি প্রসাদ ভক্ত মন্দির সন্ধ্যা উৎসব শঙ্খ ধূপ প্রদীপ কীর্তন'.split()
+
+
+def render_image(size, rng):
+    """A gradient with a few shapes, so encoders and thumbnails do real work"""
+    width, height = size
+    colours = [colorsys.hsv_to_rgb(rng.random(), 0.6, 0.9) for _ in range(4)]
+    (r1, g1, b1), (r2, g2, b2) = colours[:2]
+    img = Image.new('RGB', size)
+    draw = ImageDraw.Draw(img)
+    for y in range(height):
+        t = y / height
+        draw.line([(0, y), (width, y)], fill=(
+            int(255 * (r1 + (r2 - r1) * t)), int(255 * (g1 + (g2 - g1) * t)), int(255 * (b1 + (b2 - b1) * t)),
+        ))
+    for r, g, b in colours[2:]:
+        x, y = rng.randrange(width), rng.randrange(height)
+        radius = rng.randint(height // 8, height // 3)
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=(int(r * 255), int(g * 255), int(b * 255)))
+    buffer = BytesIO()
+    img.save(buffer, 'JPEG', quality=80)
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = 'Generate festival-scale synthetic data for benchmarking (use --scale for smaller runs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiply every count below except photos per album')
+        parser.add_argument('--albums', type=int, default=500)
+        parser.add_argument('--photos-per-album', type=int, default=2000)
+        parser.add_argument('--events', type=int, default=10000)
+        parser.add_argument('--contacts', type=int, default=5000)
+        parser.add_argument('--committee', type=int, default=300)
+        parser.add_argument('--sangha', type=int, default=300)
+        parser.add_argument('--pages', type=int, default=50)
+        parser.add_argument('--gallery', type=int, default=200)
+        parser.add_argument('--sliders', type=int, default=10)
+        parser.add_argument('--puja-days', type=int, default=10)
+        parser.add_argument('--images', type=int, default=24, help='Distinct placeholder images to generate; '
+                                                                   'every row gets its own copy of one')
+        parser.add_argument('--anchor', type=date.fromisoformat, default=ANCHOR_DATE,
+                            help=f'Date the events and puja days are spread around (default: {ANCHOR_DATE})')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--derivatives', action='store_true',
+                            help='Also generate responsive derivatives for the portrait images '
+                                 '(album photos always get them, their thumbnails are derivatives)')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.seed = options['seed']
+        self.batch_size = options['batch_size']
+        self.row_images = {}
+        self.now = timezone.make_aware(datetime.combine(options['anchor'], time(12)))
+
+        def volume(name):
+            return max(min(options[name], 1), round(options[name] * options['scale']))
+
+        self.stdout.write('Generating placeholder images...')
+        photos = self.image_pool('photos', LANDSCAPE_SIZE, options['images'])
+        portraits = self.image_pool('portraits', PORTRAIT_SIZE, max(1, options['images'] // 2))
+        photo_meta = self.thumbnail_pool(photos)
+        if options['derivatives']:
+            for name in portraits:
+                generate_derivatives(self.field_file(name))
+
+        author, _ = User.objects.get_or_create(username='benchmark', defaults={'is_active': False})
+
+        self.create(Page, (
+            Page(title=f'পাতা {i}', slug=f'benchmark-{self.seed}-{i}', content=self.text(200), author=author,
+                 show_in_menu=i < 6, menu_order=i)
+            for i in range(volume('pages'))
+        ), ignore_conflicts=True)
+        self.create(Slider, (
+            # Slider images are cropped in place, so they get real copies
+            Slider(title=self.text(4), subtitle=self.text(8), image=self.row_image(Slider, photos, link=False),
+                   order=i, is_active=i < 5)
+            for i in range(volume('sliders'))
+        ))
+        self.create(PujaDay, (
+            PujaDay(title=f'পূজার দিন {i + 1}', date=self.now.date() + timedelta(days=i),
+                    image=self.row_image(PujaDay, photos), description=self.text(30), order=i)
+            for i in range(volume('puja_days'))
+        ))
+        self.create(Event, (
+            Event(title=self.random.choice(EVENT_TITLES), description=self.text(60),
+                  date_time=self.now + timedelta(hours=self.random.randint(-24 * 730, 24 * 365)),
+                  location=self.random.choice(LOCATIONS),
+                  featured_image=self.row_image(Event, photos) if self.random.random() < 0.5 else '',
+                  is_featured=self.random.random() < 0.05, is_active=self.random.random() < 0.95)
+            for _ in range(volume('events'))
+        ))
+        self.create(Gallery, (
+            Gallery(title=self.text(4), description=self.text(20), image=self.row_image(Gallery, photos),
+                    is_featured=self.random.random() < 0.05)
+            for _ in range(volume('gallery'))
+        ))
+        self.create(Contact, (
+            Contact(name=f'দর্শনার্থী {i}', email=f'visitor{i}@example.com', phone=f'017{i:08d}'[:11],
+                    subject=self.text(5), message=self.text(80), is_read=self.random.random() < 0.8)
+            for i in range(volume('contacts'))
+        ))
+        for model, count, categories in (
+            (CommitteeMember, volume('committee'), COMMITTEE_CATEGORIES),
+            (DurgaSangha, volume('sangha'), SANGHA_CATEGORIES),
+        ):
+            self.create(model, (
+                model(name=f'শ্রী সদস্য {i}', position=self.random.choice(POSITIONS),
+                      category=categories[i % len(categories)], category_order=i % len(categories),
+                      image=self.row_image(model, portraits), phone=f'018{i:08d}'[:11], order=i,
+                      is_active=self.random.random() < 0.9)
+                for i in range(count)
+            ))
+
+        album_count = volume('albums')
+        self.create(GalleryAlbum, (
+            GalleryAlbum(title=f'অ্যালবাম {i}', description=self.text(30),
+                         cover_image=self.row_image(GalleryAlbum, photos) if self.random.random() < 0.3 else None,
+                         is_featured=i < 4)
+            for i in range(album_count)
+        ))
+        album_ids = sorted(GalleryAlbum.objects.order_by('-id').values_list('id', flat=True)[:album_count])
+        self.create(GalleryPhoto, (
+            self.photo(album_id, i, photos, photo_meta)
+            for album_id in album_ids
+            for i in range(options['photos_per_album'])
+        ))
+
+        # bulk_create() sends no signals, so refresh what they would have
+        call_command('recompute_album_stats', stdout=self.stdout)
+        for model in (Page, Slider, PujaDay, Event, Gallery, Contact, CommitteeMember, DurgaSangha, GalleryPhoto):
+            bump_version(model)
+        refresh_home_snapshot()
+
+        self.stdout.write(self.style.SUCCESS('Benchmark data created successfully!'))
+
+    def create(self, model, objects, **kwargs):
+        """bulk_create objects in batches without materialising them all"""
+        total = 0
+        objects = iter(objects)
+        while batch := list(islice(objects, self.batch_size)):
+            model.objects.bulk_create(batch, **kwargs)
+            total += len(batch)
+        self.stdout.write(f'Created {total} {model._meta.verbose_name_plural}')
+
+    def text(self, words):
+        return ' '.join(self.random.choice(WORDS) for _ in range(words))
+
+    def photo(self, album_id, index, photos, photo_meta):
+        source = self.random.choice(photos)
+        thumbnail, placeholder, width, height = photo_meta[source]
+        # The thumbnail stays the pool image's derivative: deleting the photo only drops its own image's
+        image = self.own_copy(source, f'{IMAGE_ROOT}/albums/{album_id}/{index}.jpg')
+        return GalleryPhoto(
+            album_id=album_id, title=f'ছবি {index + 1}', image=image, description=self.text(10),
+            thumbnail=thumbnail, placeholder=placeholder, width=width, height=height,
+        )
+
+    def own_copy(self, source, name, link=True):
+        """
+        Store a pool image under a name of its own for one row. Deleting or
+        replacing a row's image drops its files and derivatives, which must
+        not take other rows' images with them.
+        """
+        name = default_storage.get_available_name(name)
+        if link:
+            return link_or_copy(source, name)
+        with default_storage.open(source) as source_file:
+            return default_storage.save(name, source_file)
+
+    def row_image(self, model, pool, link=True):
+        """A copy of a random pool image for one row of model, sharing the pool image's derivatives if any"""
+        source = self.random.choice(pool)
+        self.row_images[model] = index = self.row_images.get(model, 0) + 1
+        name = self.own_copy(source, f'{IMAGE_ROOT}/{model._meta.model_name}/{self.seed}-{index}.jpg', link=link)
+        if model._meta.label_lower in RESPONSIVE_IMAGE_FIELDS:
+            copy_derivatives(source, name)
+        return name
+
+    def field_file(self, name):
+        field = GalleryPhoto._meta.get_field('image')
+        return field.attr_class(None, field, name)
+
+    def image_pool(self, kind, size, count):
+        """Return the names of count generated images, reusing ones this seed already wrote"""
+        names = []
+        for i in range(count):
+            name = f'{IMAGE_ROOT}/{kind}/{self.seed}-{i}.jpg'
+            if not default_storage.exists(name):
+                # Own generator per image, so skipping existing files keeps the row data identical
+                default_storage.save(name, ContentFile(render_image(size, random.Random(name))))
+            names.append(name)
+        return names
+
+    def thumbnail_pool(self, names):
+        """Thumbnail, placeholder and dimensions for each pool image, generating its derivatives"""
+        meta = {}
+        for name in names:
+            field_file = self.field_file(name)
+            manifest = get_derivatives(name) or generate_derivatives(field_file)
+            meta[name] = (thumbnail_name(manifest), build_placeholder(field_file), manifest['width'], manifest['height'])
+        return meta
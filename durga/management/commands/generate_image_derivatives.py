@@ -0,0 +1,29 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from durga.images import RESPONSIVE_IMAGE_FIELDS
+from durga.tasks import generate_image_derivatives
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive (srcset) derivatives for existing images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate derivatives that already exist')
+
+    def handle(self, *args, **options):
+        total = 0
+        for model_label, field_names in RESPONSIVE_IMAGE_FIELDS.items():
+            model = apps.get_model(model_label)
+            for field_name in field_names:
+                pks = (
+                    model.objects.exclude(**{field_name: ''})
+                    .exclude(**{f'{field_name}__isnull': True})
+                    .values_list('pk', flat=True)
+                )
+                for pk in pks.iterator():
+                    generate_image_derivatives.delay(model_label, pk, field_name, force=options['force'])
+                    total += 1
+            self.stdout.write(f"Queued {model._meta.verbose_name_plural}")
+
+        self.stdout.write(self.style.SUCCESS(f'Queued derivatives for {total} images'))
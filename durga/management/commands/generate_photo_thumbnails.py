@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from durga.images import DERIVATIVE_ROOT
+from durga.models import GalleryPhoto
+from durga.tasks import process_gallery_photo
+
+
+class Command(BaseCommand):
+    help = 'Generate derivatives, thumbnails, dimensions and placeholders for album photos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate photos that already have a thumbnail')
+
+    def handle(self, *args, **options):
+        photos = GalleryPhoto.objects.exclude(image='')
+        if not options['force']:
+            # Also photos whose thumbnail predates the derivatives
+            photos = photos.exclude(thumbnail__startswith=f'{DERIVATIVE_ROOT}/')
+
+        total = 0
+        for photo_id in photos.values_list('pk', flat=True).iterator():
+            process_gallery_photo.delay(photo_id, force=options['force'])
+            total += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Queued {total} photos'))
@@ -0,0 +1,205 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SUFFIX = '.min.json'
+
+# Editor-only keys that the players never read
+EDITOR_KEYS = {'meta', 'mn', 'cix', 'np'}
+# Names and property indices are only needed by expressions
+EXPRESSION_KEYS = {'nm', 'ix'}
+
+
+def is_lottie(data):
+    return isinstance(data, dict) and 'v' in data and 'layers' in data
+
+
+def has_expressions(node):
+    if isinstance(node, dict):
+        return isinstance(node.get('x'), str) or any(has_expressions(value) for value in node.values())
+    if isinstance(node, list):
+        return any(has_expressions(value) for value in node)
+    return False
+
+
+def round_numbers(node, precision):
+    if isinstance(node, float):
+        value = round(node, precision)
+        return int(value) if value.is_integer() else value
+    if isinstance(node, dict):
+        return {key: round_numbers(value, precision) for key, value in node.items()}
+    if isinstance(node, list):
+        return [round_numbers(value, precision) for value in node]
+    return node
+
+
+def strip_keys(node, keys):
+    if isinstance(node, dict):
+        return {
+            key: strip_keys(value, keys) for key, value in node.items()
+            if key not in keys and not (key == 'hd' and value is False)
+        }
+    if isinstance(node, list):
+        return [strip_keys(value, keys) for value in node]
+    return node
+
+
+def _has_tangents(keyframe):
+    return any(keyframe.get(key) and any(keyframe[key]) for key in ('ti', 'to'))
+
+
+def _is_constant(keyframe, following):
+    """Whether the segment from keyframe to following shows a single value"""
+    if 's' not in keyframe or _has_tangents(keyframe):
+        return False
+    # Before Lottie 5.5 a keyframe carries its own end value in 'e'
+    end = keyframe['e'] if 'e' in keyframe else following.get('s')
+    return end == keyframe['s']
+
+
+def simplify_keyframes(keyframes):
+    """Turn constant segments into holds and drop keyframes in the middle of a constant run"""
+    frames = [dict(keyframe) for keyframe in keyframes]
+    for keyframe, following in zip(frames, frames[1:]):
+        # A hold shows the same value as any easing between two equal values
+        if _is_constant(keyframe, following):
+            for key in ('i', 'o', 'ti', 'to', 'e'):
+                keyframe.pop(key, None)
+            keyframe['h'] = 1
+    simplified = []
+    for index, keyframe in enumerate(frames):
+        previous = simplified[-1] if simplified else None
+        if (previous and index < len(frames) - 1 and previous.get('h') == 1 and keyframe.get('h') == 1
+                and previous.get('s') == keyframe.get('s')):
+            continue
+        simplified.append(keyframe)
+    return simplified
+
+
+def simplify_properties(node):
+    if isinstance(node, list):
+        return [simplify_properties(value) for value in node]
+    if not isinstance(node, dict):
+        return node
+    node = {key: simplify_properties(value) for key, value in node.items()}
+    keyframes = node.get('k')
+    if node.get('a') == 1 and isinstance(keyframes, list) and all(isinstance(k, dict) for k in keyframes):
+        values = [keyframe[key] for keyframe in keyframes for key in ('s', 'e') if key in keyframe]
+        if values and all(value == values[0] for value in values) and not any(map(_has_tangents, keyframes)):
+            # Animated in name only: the value never changes
+            value = values[0]
+            node['a'], node['k'] = 0, value[0] if isinstance(value, list) and len(value) == 1 else value
+        else:
+            node['k'] = [collapse_easing(keyframe) for keyframe in simplify_keyframes(keyframes)]
+    return node
+
+
+def collapse_easing(keyframe):
+    """Write per-dimension easing that is the same for every dimension as a single value"""
+    for key in ('i', 'o'):
+        easing = keyframe.get(key)
+        if not isinstance(easing, dict):
+            continue
+        for axis, values in easing.items():
+            if isinstance(values, list) and values and all(value == values[0] for value in values):
+                easing[axis] = values[0]
+    return keyframe
+
+
+def _referenced_assets(layers, assets_by_id, seen):
+    for layer in layers:
+        ref = layer.get('refId')
+        if ref in assets_by_id and ref not in seen:
+            seen.add(ref)
+            _referenced_assets(assets_by_id[ref].get('layers', ()), assets_by_id, seen)
+    return seen
+
+
+def drop_hidden_layers(layers):
+    needed = {layer['parent'] for layer in layers if 'parent' in layer}
+    return [
+        layer for layer in layers
+        if not layer.get('hd') or layer.get('ind') in needed or layer.get('td')
+    ]
+
+
+def optimize(data, precision=2, keep_names=False):
+    """Return a smaller copy of a Lottie animation that renders the same"""
+    keys = set(EDITOR_KEYS)
+    if not keep_names and not has_expressions(data):
+        keys |= EXPRESSION_KEYS
+    data = dict(data, layers=drop_hidden_layers(data['layers']))
+
+    assets = [
+        dict(asset, layers=drop_hidden_layers(asset['layers'])) if 'layers' in asset else asset
+        for asset in data.get('assets', ())
+    ]
+    used = _referenced_assets(data['layers'], {asset['id']: asset for asset in assets}, set())
+    data['assets'] = [asset for asset in assets if asset['id'] in used]
+
+    data = strip_keys(round_numbers(data, precision), keys)
+    return simplify_properties(data)
+
+
+def dumps(data):
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+def parse_ms(text, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        json.loads(text)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = f'Write minified <name>{SUFFIX} copies of the Lottie animations under static/images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help='Lottie files to optimize (default: static/images/*.json)')
+        parser.add_argument('--precision', type=int, default=2, help='Decimal places kept for numbers')
+        parser.add_argument('--keep-names', action='store_true', help='Keep layer and property names')
+        parser.add_argument('--repeat', type=int, default=20, help='Parses per file when timing json.loads')
+        parser.add_argument('--dry-run', action='store_true', help='Report the savings without writing files')
+
+    def handle(self, *args, **options):
+        if options['precision'] < 0:
+            raise CommandError('--precision must not be negative')
+        paths = [Path(name) for name in options['files']] or sorted(
+            path for path in (Path(settings.BASE_DIR) / 'static' / 'images').glob('*.json')
+            if not path.name.endswith(SUFFIX)
+        )
+
+        self.stdout.write(f'{"file":<28}{"original":>11}{"optimized":>11}{"saved %":>9}'
+                          f'{"parse ms":>10}{"-> ms":>8}')
+        total_before = total_after = 0
+        for path in paths:
+            original = path.read_text(encoding='utf-8')
+            data = json.loads(original)
+            if not is_lottie(data):
+                self.stderr.write(f'Skipping {path.name}: not a Lottie animation')
+                continue
+
+            minified = dumps(optimize(data, options['precision'], options['keep_names']))
+            before, after = len(original.encode()), len(minified.encode())
+            parse_before = parse_ms(original, options['repeat'])
+            parse_after = parse_ms(minified, options['repeat'])
+            total_before += before
+            total_after += after
+            self.stdout.write(f'{path.name[:27]:<28}{before:>11,}{after:>11,}{(before - after) / before * 100:>8.1f}%'
+                              f'{parse_before:>10.2f}{parse_after:>8.2f}')
+
+            if not options['dry_run']:
+                path.with_name(path.name[:-len('.json')] + SUFFIX).write_text(minified, encoding='utf-8')
+
+        if total_before:
+            saved = total_before - total_after
+            self.stdout.write(self.style.SUCCESS(
+                f'{total_before:,} -> {total_after:,} bytes, {saved:,} saved ({saved / total_before * 100:.1f}%)'
+            ))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+
+from durga.cache import bump_version, refresh_home_snapshot
+from durga.models import GalleryAlbum, GalleryPhoto
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored photo count and fallback cover of every gallery album'
+
+    def handle(self, *args, **options):
+        first_photo = (
+            GalleryPhoto.objects.filter(album=OuterRef('pk'))
+            .order_by('created_at', 'id')
+            .values('image')[:1]
+        )
+        albums = GalleryAlbum.objects.annotate(
+            actual_count=Count('photos'),
+            actual_first_photo=Subquery(first_photo),
+        )
+
+        updated = 0
+        for album in albums.iterator():
+            first_photo_image = album.actual_first_photo or ''
+            if album.photo_count != album.actual_count or album.first_photo_image.name != first_photo_image:
+                GalleryAlbum.objects.filter(pk=album.pk).update(
+                    photo_count=album.actual_count, first_photo_image=first_photo_image,
+                )
+                updated += 1
+
+        if updated:
+            bump_version(GalleryAlbum)
+            refresh_home_snapshot()
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} albums'))
@@ -0,0 +1,78 @@
+import json
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Report the bytes saved per static file by the precompressed gzip and Brotli variants'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', choices=('saved', 'size', 'name'), default='saved')
+        parser.add_argument('--limit', type=int, help='Only list the first N files')
+        parser.add_argument('--output', help='Write the report as JSON to this file')
+
+    def handle(self, *args, **options):
+        if not isinstance(staticfiles_storage, ManifestFilesMixin):
+            raise CommandError('The static files storage is not hashed; run with DJANGO_DEBUG=0')
+        # Loaded from staticfiles.json by the storage
+        manifest = staticfiles_storage.hashed_files
+        if not manifest:
+            raise CommandError(f'No staticfiles manifest in {settings.STATIC_ROOT}; run collectstatic first')
+
+        rows = []
+        for name, hashed_name in manifest.items():
+            path = staticfiles_storage.path(hashed_name)
+            size = _size(path)
+            if size is None:
+                continue
+            gzip_size, brotli_size = _size(path + '.gz'), _size(path + '.br')
+            best = min(filter(None, (size, gzip_size, brotli_size)))
+            rows.append({
+                'name': name,
+                'hashed_name': hashed_name,
+                'size': size,
+                'gzip': gzip_size,
+                'brotli': brotli_size,
+                'saved': size - best,
+            })
+
+        sort_key = {
+            'saved': lambda row: -row['saved'],
+            'size': lambda row: -row['size'],
+            'name': lambda row: row['name'],
+        }[options['sort']]
+        rows.sort(key=sort_key)
+
+        self.stdout.write(f'{"file":<52}{"original":>11}{"gzip":>11}{"brotli":>11}{"saved":>11}{"saved %":>9}')
+        for row in rows[:options['limit']]:
+            self.stdout.write(
+                f'{row["name"][:51]:<52}{row["size"]:>11,}{self.format_size(row["gzip"])}'
+                f'{self.format_size(row["brotli"])}{row["saved"]:>11,}{self.percent(row["saved"], row["size"])}'
+            )
+
+        total = sum(row['size'] for row in rows)
+        saved = sum(row['saved'] for row in rows)
+        self.stdout.write(f'{len(rows)} files, {total:,} bytes; precompression saves {saved:,} bytes '
+                          f'({self.percent(saved, total).strip()}) for browsers that accept Brotli')
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump({'total': total, 'saved': saved, 'files': rows}, output_file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Report written to {options["output"]}'))
+
+    def format_size(self, size):
+        # Files that are already compressed (images, fonts) get no variants
+        return f'{"-":>11}' if size is None else f'{size:>11,}'
+
+    def percent(self, part, whole):
+        return f'{part / whole * 100 if whole else 0:>8.1f}%'
@@ -0,0 +1,158 @@
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+from durga.webfonts import FAMILY, MANIFEST, SLUG, clear_font_faces, face_path, load_manifest
+
+# Always available: ASCII for forms, e-mail addresses and URLs, Bengali digits (bn_numbers)
+# and the zero-width (non-)joiners that pick conjunct forms
+BASE_CHARACTERS = ''.join(map(chr, range(0x20, 0x7f))) + '০১২৩৪৫৬৭৮৯\u200c\u200d'
+# Visitor messages and diagnostics are only shown in the admin, which has its own fonts
+PRIVATE_MODELS = {'contact', 'slowquery', 'profilereport'}
+# The events calendar formats dates with Intl in the bn locale
+CALENDAR_TEXT = (
+    'জানুয়ারী ফেব্রুয়ারী মার্চ এপ্রিল মে জুন জুলাই আগস্ট সেপ্টেম্বর অক্টোবর নভেম্বর ডিসেম্বর '
+    'রবিবার সোমবার মঙ্গলবার বুধবার বৃহস্পতিবার শুক্রবার শনিবার রবি সোম মঙ্গল বুধ বৃহস্পতি শুক্র শনি'
+)
+# Besides our own stylesheets, Bootstrap uses 300 for .lead and .display-*, 500 for headings
+# and 700 for <strong> and .fw-bold
+DEFAULT_WEIGHTS = {300, 400, 500, 700}
+FONT_WEIGHT = re.compile(r'font-weight\s*:\s*(\d{3}|bold|normal)')
+KEYWORD_WEIGHTS = {'normal': 400, 'bold': 700}
+# Body text and the navbar links, which every page shows above the fold
+PRELOAD_WEIGHTS = (400, 600)
+
+
+def matching_weight(desired, available):
+    """The available weight a browser uses for the desired one (CSS Fonts 4, font-weight matching)"""
+    if desired in available:
+        return desired
+    lighter = sorted((weight for weight in available if weight < desired), reverse=True)
+    heavier = sorted(weight for weight in available if weight > desired)
+    if 400 <= desired <= 500:
+        up_to_500 = [weight for weight in heavier if weight <= 500]
+        order = up_to_500 + lighter + [weight for weight in heavier if weight > 500]
+    elif desired < 400:
+        order = lighter + heavier
+    else:
+        order = heavier + lighter
+    return order[0]
+
+
+def _text_files():
+    directories = [Path(directory) for engine in settings.TEMPLATES for directory in engine.get('DIRS', ())]
+    directories += [Path(app.path) / 'templates' for app in apps.get_app_configs() if app.name == 'durga']
+    for directory in directories:
+        yield from directory.rglob('*.html')
+    for directory in settings.STATICFILES_DIRS:
+        for pattern in ('css/*.css', 'js/*.js'):
+            yield from Path(directory).glob(pattern)
+
+
+class Command(BaseCommand):
+    help = (f'Subset the vendored {FAMILY} fonts to the characters and weights the site uses '
+            f'and write WOFF2 files to static/fonts/')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', default=str(Path(settings.BASE_DIR) / 'fonts' / SLUG),
+                            help='Directory with the full TTF/OTF files, one per weight')
+        parser.add_argument('--output-dir', default=str(Path(settings.BASE_DIR) / 'static'),
+                            help='Static directory to write fonts/ into')
+        parser.add_argument('--preload', type=int, action='append',
+                            help=f'Weights to preload (repeatable, default: {", ".join(map(str, PRELOAD_WEIGHTS))})')
+        parser.add_argument('--check', action='store_true',
+                            help='Only report whether the built subsets cover the current content; '
+                                 'exits with an error if they do not')
+
+    def handle(self, *args, **options):
+        characters = self.characters()
+        if options['check']:
+            return self.check(characters)
+
+        sources = self.sources(Path(options['source']))
+        weights = sorted({matching_weight(weight, sources) for weight in self.used_weights()})
+        preload = set(options['preload'] or PRELOAD_WEIGHTS)
+        output_dir = Path(options['output_dir'])
+
+        faces = []
+        self.stdout.write(f'{"weight":<8}{"source":>11}{"woff2":>9}{"saved %":>9}')
+        for weight in weights:
+            source = sources[weight]
+            font = TTFont(source)
+            subsetter = subset.Subsetter(self.subset_options())
+            subsetter.populate(text=characters)
+            subsetter.subset(font)
+            font.flavor = 'woff2'
+            output = output_dir / face_path(weight)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            font.save(output)
+
+            before, after = source.stat().st_size, output.stat().st_size
+            faces.append({'weight': weight, 'file': face_path(weight), 'preload': weight in preload, 'size': after})
+            self.stdout.write(f'{weight:<8}{before:>11,}{after:>9,}{(before - after) / before * 100:>8.1f}%')
+
+        manifest = {'family': FAMILY, 'characters': characters, 'faces': faces}
+        (output_dir / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+        clear_font_faces()
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(faces)} weights, {len(characters)} characters; skipped weights: '
+            f'{", ".join(str(weight) for weight in sorted(set(sources) - set(weights))) or "none"}'
+        ))
+
+    def subset_options(self):
+        options = subset.Options()
+        options.flavor = 'woff2'
+        # Bengali conjuncts and vowel signs are built by the layout features
+        options.layout_features = ['*']
+        options.notdef_outline = True
+        return options
+
+    def sources(self, directory):
+        """{weight: path} of the vendored font files"""
+        sources = {}
+        for path in sorted(directory.glob('*.[ot]tf')):
+            sources[TTFont(path, lazy=True)['OS/2'].usWeightClass] = path
+        if not sources:
+            raise CommandError(f'No TTF or OTF files in {directory}; see fonts/README.txt')
+        return sources
+
+    def used_weights(self):
+        weights = set(DEFAULT_WEIGHTS)
+        for path in _text_files():
+            for value in FONT_WEIGHT.findall(path.read_text(encoding='utf-8')):
+                weights.add(KEYWORD_WEIGHTS.get(value) or int(value))
+        return weights
+
+    def characters(self):
+        """Every character the templates, scripts, stylesheets and durga content can show"""
+        found = set(BASE_CHARACTERS) | set(CALENDAR_TEXT)
+        for path in _text_files():
+            found.update(path.read_text(encoding='utf-8'))
+        for model in apps.get_app_config('durga').get_models():
+            if model._meta.model_name in PRIVATE_MODELS:
+                continue
+            fields = [field.name for field in model._meta.concrete_fields
+                      if isinstance(field, (models.CharField, models.TextField))]
+            if not fields:
+                continue
+            for values in model.objects.values_list(*fields).iterator():
+                found.update(''.join(value for value in values if value))
+        return ''.join(sorted(character for character in found if unicodedata.category(character) != 'Cc'))
+
+    def check(self, characters):
+        manifest = load_manifest()
+        if manifest is None:
+            raise CommandError('The fonts have not been built yet; run subset_webfonts')
+        missing = set(characters) - set(manifest['characters'])
+        if missing:
+            raise CommandError(f'{len(missing)} characters are not in the subsets: {"".join(sorted(missing))}; '
+                               f'run subset_webfonts again')
+        self.stdout.write(self.style.SUCCESS(f'The subsets cover all {len(characters)} characters'))
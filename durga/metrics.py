@@ -0,0 +1,268 @@
+"""
+Request metrics in Prometheus exposition format.
+
+MetricsMiddleware records, per route: request counts, a latency histogram,
+database query count and time, template render time and response sizes.
+The cache helpers record hits and misses per cache. Everything is exposed
+on /metrics to staff and to localhost.
+
+Counters are sharded per thread: a thread only ever writes its own dicts,
+so recording needs no lock and costs the same on every request. A scrape
+copies each shard (dict.copy() is atomic under the GIL) and sums them.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpResponse, HttpResponseForbidden
+from django.template.backends.django import DjangoTemplates
+
+from .db import observe_queries
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+LOCAL_ADDRESSES = ('127.0.0.1', '::1')
+
+# name: (type, help, histogram buckets), in exposition order
+METRICS = {
+    'durga_http_requests_total': ('counter', 'HTTP requests by route, method and status', None),
+    'durga_http_request_duration_seconds': ('histogram', 'Time to produce the response', LATENCY_BUCKETS),
+    'durga_http_response_size_bytes': ('histogram', 'Response body size', SIZE_BUCKETS),
+    'durga_db_queries_per_request': ('histogram', 'Database queries per request', QUERY_BUCKETS),
+    'durga_db_query_duration_seconds_total': ('counter', 'Time spent in database queries', None),
+    'durga_template_render_seconds_total': ('counter', 'Time spent rendering templates', None),
+    'durga_template_renders_total': ('counter', 'Templates rendered', None),
+    'durga_cache_requests_total': ('counter', 'Cache lookups by cache and result', None),
+}
+
+_shards = []
+_shards_lock = threading.Lock()
+_local = threading.local()
+
+# Stats of the request being handled, for the template backend
+_current_request = ContextVar('durga_metrics_request', default=None)
+
+
+class _Shard:
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+
+def _shard():
+    try:
+        return _local.shard
+    except AttributeError:
+        # Taken once per thread, never per request
+        shard = _local.shard = _Shard()
+        with _shards_lock:
+            _shards.append(shard)
+        return shard
+
+
+def inc(name, labels, amount=1):
+    counters = _shard().counters
+    key = (name, labels)
+    counters[key] = counters.get(key, 0) + amount
+
+
+def observe(name, labels, value):
+    buckets = METRICS[name][2]
+    histograms = _shard().histograms
+    key = (name, labels)
+    histogram = histograms.get(key)
+    if histogram is None:
+        # One slot per bucket plus +Inf, then the sum
+        histogram = histograms[key] = [0] * (len(buckets) + 2)
+    histogram[bisect_left(buckets, value)] += 1
+    histogram[-1] += value
+
+
+def record_cache(cache_name, hit):
+    inc('durga_cache_requests_total', (('cache', cache_name), ('result', 'hit' if hit else 'miss')))
+
+
+class _RequestStats:
+    __slots__ = ('queries', 'query_seconds', 'render_seconds', 'renders', 'lock')
+
+    def __init__(self):
+        # The async views run a request's queries in several threads at once (db.run_concurrently)
+        self.lock = threading.Lock()
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.render_seconds = 0.0
+        self.renders = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper() hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.queries += 1
+                self.query_seconds += elapsed
+
+
+def route_name(request):
+    """Label for the view that handled the request"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return match.view_name or match.route
+
+
+def _response_size(response):
+    if response.streaming:
+        return int(response.get('Content-Length', 0)) or None
+    return len(response.content)
+
+
+class MetricsMiddleware:
+    """Record per-route request metrics; keep it first in MIDDLEWARE"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        stats = _RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            with observe_queries(stats):
+                response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def _acall(self, request):
+        stats = _RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            with observe_queries(stats):
+                response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, stats, duration):
+        route = (('route', route_name(request)),)
+        inc('durga_http_requests_total', route + (('method', request.method), ('status', str(response.status_code))))
+        observe('durga_http_request_duration_seconds', route, duration)
+        observe('durga_db_queries_per_request', route, stats.queries)
+        inc('durga_db_query_duration_seconds_total', route, stats.query_seconds)
+        if stats.renders:
+            inc('durga_template_render_seconds_total', route, stats.render_seconds)
+            inc('durga_template_renders_total', route, stats.renders)
+        size = _response_size(response)
+        if size is not None:
+            observe('durga_http_response_size_bytes', route, size)
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        stats = _current_request.get()
+        if stats is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            stats.render_seconds += time.perf_counter() - start
+            stats.renders += 1
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing each render for the metrics"""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
+
+
+def _format_labels(labels, extra=()):
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _collect():
+    """Sum the counters and histograms of every thread"""
+    with _shards_lock:
+        shards = list(_shards)
+    counters, histograms = {}, {}
+    for shard in shards:
+        for key, value in shard.counters.copy().items():
+            counters[key] = counters.get(key, 0) + value
+        for key, values in shard.histograms.copy().items():
+            values = list(values)
+            total = histograms.get(key)
+            histograms[key] = values if total is None else [a + b for a, b in zip(total, values)]
+    return counters, histograms
+
+
+def render_metrics():
+    counters, histograms = _collect()
+    lines = []
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        if metric_type == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+            continue
+
+        for (metric, labels), values in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), values):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels, (("le", bound),))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(values[-1])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def _is_local(request):
+    # A request relayed by a reverse proxy on this host is not local
+    return request.META.get('REMOTE_ADDR') in LOCAL_ADDRESSES and 'HTTP_X_FORWARDED_FOR' not in request.META
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, for staff and localhost only"""
+    if not (request.user.is_staff or _is_local(request)):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
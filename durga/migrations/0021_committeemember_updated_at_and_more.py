@@ -0,0 +1,74 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('durga', '0020_donationinfo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='committeemember',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='durgapujacountdown',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='durgasangha',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='galleryalbum',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='galleryphoto',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='pujaday',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='sitesettings',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='slider',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='সর্বশেষ আপডেট'),
+            preserve_default=False,
+        ),
+    ]
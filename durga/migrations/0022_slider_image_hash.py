@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('durga', '0021_committeemember_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slider',
+            name='image_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='প্রক্রিয়াকৃত ছবির হ্যাশ'),
+        ),
+    ]
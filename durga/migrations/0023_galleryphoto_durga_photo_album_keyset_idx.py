@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('durga', '0022_slider_image_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryphoto',
+            index=models.Index(fields=['album', 'created_at', 'id'], name='durga_photo_album_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('durga', '0023_galleryphoto_durga_photo_album_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryphoto',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='উচ্চতা'),
+        ),
+        migrations.AddField(
+            model_name='galleryphoto',
+            name='placeholder',
+            field=models.TextField(blank=True, editable=False, verbose_name='প্লেসহোল্ডার'),
+        ),
+        migrations.AddField(
+            model_name='galleryphoto',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, upload_to='albums/thumbnails/', verbose_name='থাম্বনেইল'),
+        ),
+        migrations.AddField(
+            model_name='galleryphoto',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='প্রস্থ'),
+        ),
+    ]
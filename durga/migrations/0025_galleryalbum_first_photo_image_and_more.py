@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+def populate_photo_stats(apps, schema_editor):
+    GalleryAlbum = apps.get_model('durga', 'GalleryAlbum')
+    GalleryPhoto = apps.get_model('durga', 'GalleryPhoto')
+    for album in GalleryAlbum.objects.all():
+        photos = GalleryPhoto.objects.filter(album=album)
+        first_photo = photos.order_by('created_at', 'id').values_list('image', flat=True).first()
+        GalleryAlbum.objects.filter(pk=album.pk).update(
+            photo_count=photos.count(), first_photo_image=first_photo or '',
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('durga', '0024_galleryphoto_height_galleryphoto_placeholder_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryalbum',
+            name='first_photo_image',
+            field=models.ImageField(blank=True, editable=False, upload_to='albums/photos/', verbose_name='প্রথম ছবি'),
+        ),
+        migrations.AddField(
+            model_name='galleryalbum',
+            name='photo_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='ছবির সংখ্যা'),
+        ),
+        migrations.RunPython(populate_photo_stats, migrations.RunPython.noop),
+    ]
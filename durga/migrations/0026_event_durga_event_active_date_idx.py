@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('durga', '0025_galleryalbum_first_photo_image_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['date_time'], name='durga_event_active_date_idx'),
+        ),
+    ]
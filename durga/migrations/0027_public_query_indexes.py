@@ -0,0 +1,57 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('durga', '0026_event_durga_event_active_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='committeemember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category_order', 'order', 'name'], name='durga_committee_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['-created_at'], name='durga_contact_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['-created_at'], name='durga_contact_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='durgapujacountdown',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='durga_countdown_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='durgasangha',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category_order', 'order', 'name'], name='durga_sangha_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['-created_at'], name='durga_gallery_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryalbum',
+            index=models.Index(fields=['-created_at'], name='durga_album_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryalbum',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['-created_at'], name='durga_album_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='page',
+            index=models.Index(condition=models.Q(('is_published', True), ('show_in_menu', True)), fields=['menu_order'], name='durga_page_menu_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pujaday',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'date'], name='durga_pujaday_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slider',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order'], name='durga_slider_active_order_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('durga', '0027_public_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view', models.CharField(max_length=200, verbose_name='ভিউ')),
+                ('fingerprint_hash', models.CharField(editable=False, max_length=32, verbose_name='ফিঙ্গারপ্রিন্ট হ্যাশ')),
+                ('fingerprint', models.TextField(verbose_name='SQL ফিঙ্গারপ্রিন্ট')),
+                ('count', models.PositiveBigIntegerField(default=0, verbose_name='কলের সংখ্যা')),
+                ('total_time', models.FloatField(default=0, verbose_name='মোট সময় (সেকেন্ড)')),
+                ('max_time', models.FloatField(default=0, verbose_name='সর্বোচ্চ সময় (সেকেন্ড)')),
+                ('first_seen', models.DateTimeField(verbose_name='প্রথম দেখা')),
+                ('last_seen', models.DateTimeField(verbose_name='সর্বশেষ দেখা')),
+            ],
+            options={
+                'verbose_name': 'ধীর কোয়েরি',
+                'verbose_name_plural': 'ধীর কোয়েরিসমূহ',
+                'ordering': ['-total_time'],
+                'constraints': [models.UniqueConstraint(fields=('view', 'fingerprint_hash'), name='durga_slowquery_view_fingerprint_uniq')],
+            },
+        ),
+    ]
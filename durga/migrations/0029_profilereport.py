@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('durga', '0028_slowquery'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500, verbose_name='URL')),
+                ('view', models.CharField(max_length=200, verbose_name='ভিউ')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='স্ট্যাটাস')),
+                ('duration', models.FloatField(verbose_name='মোট সময় (সেকেন্ড)')),
+                ('query_count', models.PositiveIntegerField(verbose_name='কোয়েরির সংখ্যা')),
+                ('query_time', models.FloatField(verbose_name='কোয়েরির সময় (সেকেন্ড)')),
+                ('report', models.TextField(verbose_name='রিপোর্ট')),
+                ('stats', models.BinaryField(verbose_name='cProfile ডেটা')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='তৈরির তারিখ')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='ব্যবহারকারী')),
+            ],
+            options={
+                'verbose_name': 'প্রোফাইল রিপোর্ট',
+                'verbose_name_plural': 'প্রোফাইল রিপোর্টসমূহ',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
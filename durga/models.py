@@ -1,10 +1,14 @@
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils import timezone
 from django.contrib.auth.models import User
-from PIL import Image
 import os
 
+# Indexes on the public filter/order paths are partial (WHERE is_active etc.)
+# because Django filters booleans as a bare "WHERE is_active", which SQLite
+# cannot match against a composite (is_active, ...) index.
+# durga/tests/test_query_plans.py checks that every public query uses them.
+
 # Page Management Models
 class Page(models.Model):
     title = models.CharField(max_length=200, verbose_name="পাতার শিরোনাম")
@@ -24,6 +28,10 @@ class Page(models.Model):
         verbose_name = "পাতা"
         verbose_name_plural = "পাতাসমূহ"
         ordering = ['menu_order', 'title']
+        indexes = [
+            models.Index(fields=['menu_order'], condition=models.Q(show_in_menu=True, is_published=True),
+                         name='durga_page_menu_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -43,11 +51,16 @@ class Event(models.Model):
     is_featured = models.BooleanField(default=False, verbose_name="বৈশিষ্ট্যযুক্ত")
     is_active = models.BooleanField(default=True, verbose_name="সক্রিয়")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="তৈরির তারিখ")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "অনুষ্ঠান"
         verbose_name_plural = "অনুষ্ঠানসমূহ"
         ordering = ['date_time']
+        indexes = [
+            # Calendar feed and upcoming events: active events by date
+            models.Index(fields=['date_time'], condition=models.Q(is_active=True), name='durga_event_active_date_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -62,33 +75,85 @@ class GalleryAlbum(models.Model):
     description = models.TextField(blank=True, verbose_name="বিবরণ")
     cover_image = models.ImageField(upload_to='albums/covers/', blank=True, null=True, verbose_name="কভার ছবি")
     is_featured = models.BooleanField(default=False, verbose_name="বৈশিষ্ট্যযুক্ত")
+    # Kept up to date by the GalleryPhoto signals (see signals.py)
+    photo_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="ছবির সংখ্যা")
+    first_photo_image = models.ImageField(upload_to='albums/photos/', blank=True, editable=False,
+                                          verbose_name="প্রথম ছবি")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="তৈরির তারিখ")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "গ্যালারি অ্যালবাম"
         verbose_name_plural = "গ্যালারি অ্যালবামসমূহ"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='durga_album_created_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(is_featured=True), name='durga_album_featured_idx'),
+        ]
     
     def __str__(self):
         return self.title
     
     def get_photos_count(self):
-        return self.photos.count()
+        return self.photo_count
+    
+    def get_cover_image(self):
+        """Cover image, falling back to the album's first photo"""
+        return self.cover_image or self.first_photo_image or None
+    
+    def refresh_photo_stats(self):
+        """Recompute photo_count and first_photo_image from the album's photos"""
+        first_photo = self.photos.order_by('created_at', 'id').values_list('image', flat=True).first()
+        self.photo_count = self.photos.count()
+        self.first_photo_image = first_photo or ''
+        GalleryAlbum.objects.filter(pk=self.pk).update(
+            photo_count=self.photo_count, first_photo_image=self.first_photo_image,
+        )
 
 class GalleryPhoto(models.Model):
     album = models.ForeignKey(GalleryAlbum, on_delete=models.CASCADE, related_name='photos', verbose_name="অ্যালবাম")
     title = models.CharField(max_length=200, blank=True, verbose_name="ছবির নাম")
     image = models.ImageField(upload_to='albums/photos/', verbose_name="ছবি")
     description = models.TextField(blank=True, verbose_name="বিবরণ")
+    # Filled in by the background task after upload (see tasks.process_gallery_photo);
+    # the thumbnail is one of the image's srcset derivatives
+    thumbnail = models.ImageField(upload_to='albums/thumbnails/', blank=True, editable=False, verbose_name="থাম্বনেইল")
+    width = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="প্রস্থ")
+    height = models.PositiveIntegerField(blank=True, null=True, editable=False, verbose_name="উচ্চতা")
+    placeholder = models.TextField(blank=True, editable=False, verbose_name="প্লেসহোল্ডার")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="আপলোড তারিখ")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "গ্যালারি ছবি"
         verbose_name_plural = "গ্যালারি ছবিসমূহ"
         ordering = ['created_at']
+        indexes = [
+            # Keyset pagination of an album's photos (see pagination.py)
+            models.Index(fields=['album', 'created_at', 'id'], name='durga_photo_album_keyset_idx'),
+        ]
     
     def __str__(self):
         return f"{self.album.title} - {self.title or 'ছবি'}"
+    
+    def save(self, *args, **kwargs):
+        previous = GalleryPhoto.objects.filter(pk=self.pk).values_list('image', 'album_id').first() if self.pk else None
+        previous_image, self._previous_album_id = previous or (None, None)
+        # The signals drop the derivatives of a replaced image and recount
+        # the album a moved photo left
+        self._stored_images = {'image': previous_image}
+        if previous_image is not None and previous_image != self.image.name:
+            # A new image was uploaded, the old thumbnail no longer matches
+            self.thumbnail = ''
+            self.placeholder = ''
+            self.width = self.height = None
+        super().save(*args, **kwargs)
+        
+        # Derivatives, thumbnail and placeholder in one background task
+        if self.image and not self.thumbnail:
+            from .tasks import process_gallery_photo
+            photo_id = self.pk
+            transaction.on_commit(lambda: process_gallery_photo.delay(photo_id))
 
 class Gallery(models.Model):
     GALLERY_TYPES = [
@@ -103,11 +168,15 @@ class Gallery(models.Model):
     video_url = models.URLField(blank=True, verbose_name="ভিডিও লিংক")
     is_featured = models.BooleanField(default=False, verbose_name="বৈশিষ্ট্যযুক্ত")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="তৈরির তারিখ")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "গ্যালারি"
         verbose_name_plural = "গ্যালারিসমূহ"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], condition=models.Q(is_featured=True), name='durga_gallery_featured_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -143,6 +212,10 @@ class Contact(models.Model):
         verbose_name = "যোগাযোগ"
         verbose_name_plural = "যোগাযোগসমূহ"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='durga_contact_created_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(is_read=False), name='durga_contact_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.subject}"
@@ -157,52 +230,37 @@ class Slider(models.Model):
     button_link = models.CharField(max_length=200, blank=True, verbose_name="বাটনের লিংক")
     is_active = models.BooleanField(default=True, verbose_name="সক্রিয়")
     order = models.IntegerField(default=0, verbose_name="ক্রম")
+    image_hash = models.CharField(max_length=64, blank=True, editable=False, verbose_name="প্রক্রিয়াকৃত ছবির হ্যাশ")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="তৈরির তারিখ")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "স্লাইডার"
         verbose_name_plural = "স্লাইডারসমূহ"
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['order'], condition=models.Q(is_active=True), name='durga_slider_active_order_idx'),
+        ]
     
     def __str__(self):
         return self.title
     
     def save(self, *args, **kwargs):
+        previous = Slider.objects.filter(pk=self.pk).values_list('image', 'image_hash').first() if self.pk else None
+        if previous and previous[0] == self.image.name:
+            # Keep the hash the background task stored, this instance may be stale
+            self.image_hash = previous[1]
+            image_changed = not self.image_hash
+        else:
+            image_changed = True
         super().save(*args, **kwargs)
         
-        if self.image:
-            # Open image
-            img = Image.open(self.image.path)
-            
-            # Set desired dimensions for slider (16:9 aspect ratio)
-            output_size = (1920, 1080)  # Full HD resolution
-            
-            # Calculate crop dimensions to maintain aspect ratio
-            img_width, img_height = img.size
-            target_ratio = output_size[0] / output_size[1]  # 16:9 = 1.777
-            img_ratio = img_width / img_height
-            
-            if img_ratio > target_ratio:
-                # Image is wider, crop width
-                new_width = int(img_height * target_ratio)
-                left = (img_width - new_width) // 2
-                top = 0
-                right = left + new_width
-                bottom = img_height
-            else:
-                # Image is taller, crop height
-                new_height = int(img_width / target_ratio)
-                left = 0
-                top = (img_height - new_height) // 2
-                right = img_width
-                bottom = top + new_height
-            
-            # Crop and resize
-            img = img.crop((left, top, right, bottom))
-            img = img.resize(output_size, Image.Resampling.LANCZOS)
-            
-            # Save the processed image
-            img.save(self.image.path, quality=85, optimize=True)
+        # Crop/resize in the background, and only when a new image was uploaded
+        # (not when just the order or is_active changed from the list page)
+        if self.image and image_changed:
+            from .tasks import process_slider_image
+            slider_id = self.pk
+            transaction.on_commit(lambda: process_slider_image.delay(slider_id))
 
 # Site Settings Model
 class SiteSettings(models.Model):
@@ -224,6 +282,7 @@ class SiteSettings(models.Model):
     prasad_hall_image = models.ImageField(upload_to='settings/', blank=True, null=True, 
                                          verbose_name="প্রসাদ হল ও ভক্ত নিবাস ছবি",
                                          help_text="হোম পেইজে প্রদর্শিত হবে")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "সাইট সেটিংস"
@@ -245,11 +304,16 @@ class CommitteeMember(models.Model):
                                         help_text="একই ক্যাটাগরির মধ্যে সদস্যের ক্রম")
     is_active = models.BooleanField(default=True, verbose_name="সক্রিয়")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="যোগ করার তারিখ")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "কমিটির সদস্য"
         verbose_name_plural = "কমিটির সদস্যবর্গ"
         ordering = ['category_order', 'order', 'name']
+        indexes = [
+            models.Index(fields=['category_order', 'order', 'name'], condition=models.Q(is_active=True),
+                         name='durga_committee_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.position}"
@@ -269,11 +333,16 @@ class DurgaSangha(models.Model):
                                         help_text="একই ক্যাটাগরির মধ্যে সদস্যের ক্রম")
     is_active = models.BooleanField(default=True, verbose_name="সক্রিয়")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="যোগ করার তারিখ")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "দুর্গা সংঘের সদস্য"
         verbose_name_plural = "দুর্গা সংঘের সদস্যবর্গ"
         ordering = ['category_order', 'order', 'name']
+        indexes = [
+            models.Index(fields=['category_order', 'order', 'name'], condition=models.Q(is_active=True),
+                         name='durga_sangha_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.position}"
@@ -287,11 +356,15 @@ class DurgaPujaCountdown(models.Model):
     message_before = models.CharField(max_length=100, default="মা আসছে", verbose_name="পূর্বের বার্তা")
     message_after = models.CharField(max_length=100, default="দিন পরে", verbose_name="পরের বার্তা")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="তৈরির তারিখ")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "দুর্গা পূজা কাউন্টডাউন"
         verbose_name_plural = "দুর্গা পূজা কাউন্টডাউনসমূহ"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], condition=models.Q(is_active=True), name='durga_countdown_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.target_date.strftime('%d/%m/%Y')}"
@@ -317,11 +390,15 @@ class PujaDay(models.Model):
     is_active = models.BooleanField(default=True, verbose_name="সক্রিয়")
     order = models.PositiveIntegerField(default=0, verbose_name="ক্রম")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="তৈরির তারিখ")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="সর্বশেষ আপডেট")
     
     class Meta:
         verbose_name = "পূজার দিন"
         verbose_name_plural = "পূজার দিনসমূহ"
         ordering = ['order', 'date']
+        indexes = [
+            models.Index(fields=['order', 'date'], condition=models.Q(is_active=True), name='durga_pujaday_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.date.strftime('%d %B')}"
@@ -388,3 +465,52 @@ class DonationInfo(models.Model):
     
     def __str__(self):
         return "দান/অনুদান তথ্য"
+
+
+# Slow queries recorded by durga.slow_queries, aggregated per view and SQL fingerprint
+class SlowQuery(models.Model):
+    view = models.CharField(max_length=200, verbose_name="ভিউ")
+    fingerprint_hash = models.CharField(max_length=32, editable=False, verbose_name="ফিঙ্গারপ্রিন্ট হ্যাশ")
+    fingerprint = models.TextField(verbose_name="SQL ফিঙ্গারপ্রিন্ট")
+    count = models.PositiveBigIntegerField(default=0, verbose_name="কলের সংখ্যা")
+    total_time = models.FloatField(default=0, verbose_name="মোট সময় (সেকেন্ড)")
+    max_time = models.FloatField(default=0, verbose_name="সর্বোচ্চ সময় (সেকেন্ড)")
+    first_seen = models.DateTimeField(verbose_name="প্রথম দেখা")
+    last_seen = models.DateTimeField(verbose_name="সর্বশেষ দেখা")
+    
+    class Meta:
+        verbose_name = "ধীর কোয়েরি"
+        verbose_name_plural = "ধীর কোয়েরিসমূহ"
+        ordering = ['-total_time']
+        constraints = [
+            models.UniqueConstraint(fields=['view', 'fingerprint_hash'], name='durga_slowquery_view_fingerprint_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.view}: {self.fingerprint[:80]}"
+    
+    @property
+    def average_time(self):
+        return self.total_time / self.count if self.count else 0
+
+
+# Reports from ?__profile=1 requests by staff (see durga.profiling)
+class ProfileReport(models.Model):
+    path = models.CharField(max_length=500, verbose_name="URL")
+    view = models.CharField(max_length=200, verbose_name="ভিউ")
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True, verbose_name="ব্যবহারকারী")
+    status_code = models.PositiveSmallIntegerField(verbose_name="স্ট্যাটাস")
+    duration = models.FloatField(verbose_name="মোট সময় (সেকেন্ড)")
+    query_count = models.PositiveIntegerField(verbose_name="কোয়েরির সংখ্যা")
+    query_time = models.FloatField(verbose_name="কোয়েরির সময় (সেকেন্ড)")
+    report = models.TextField(verbose_name="রিপোর্ট")
+    stats = models.BinaryField(verbose_name="cProfile ডেটা")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="তৈরির তারিখ")
+    
+    class Meta:
+        verbose_name = "প্রোফাইল রিপোর্ট"
+        verbose_name_plural = "প্রোফাইল রিপোর্টসমূহ"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.path} ({self.created_at:%Y-%m-%d %H:%M})"
@@ -0,0 +1,94 @@
+"""
+Pagination helpers.
+
+Keyset (cursor) pagination:
+
+Instead of COUNT(*) plus OFFSET, each page continues after the
+(created_at, id) of the last row of the previous page, so every page costs
+one index range scan no matter how deep the visitor has scrolled. The
+cursor handed to the client is an opaque URL-safe token.
+
+ChainedQuerySets lets Paginator page through several ordered querysets
+back to back, so a "these first, then those" listing can be served from
+index order instead of sorting on a CASE expression.
+"""
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+
+def encode_cursor(obj):
+    """Return the cursor token pointing just after obj"""
+    raw = json.dumps([obj.created_at.isoformat(), obj.pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Return (created_at, pk) from a cursor token, or None if it is invalid"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, pk = json.loads(raw)
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    if created_at is None:
+        return None
+    return created_at, pk
+
+
+def keyset_page(queryset, cursor, per_page):
+    """
+    Return (items, next_cursor) for the page after cursor.
+
+    Rows are ordered by (created_at, id); next_cursor is None on the last
+    page. One extra row is fetched to know whether another page exists.
+    """
+    queryset = queryset.order_by('created_at', 'id')
+    if cursor is not None:
+        created_at, pk = cursor
+        # created_at >= x keeps this an index range scan on (created_at, id)
+        queryset = queryset.filter(Q(created_at__gt=created_at) | Q(id__gt=pk), created_at__gte=created_at)
+    
+    items = list(queryset[:per_page + 1])
+    next_cursor = encode_cursor(items[per_page - 1]) if len(items) > per_page else None
+    return items[:per_page], next_cursor
+
+
+class ChainedQuerySets:
+    """
+    Concatenation of ordered querysets that Paginator can count and slice.
+
+    Each slice is fetched with LIMIT/OFFSET on only the querysets it
+    overlaps, so every query can walk an index.
+    """
+    
+    def __init__(self, *querysets):
+        self.querysets = querysets
+    
+    @cached_property
+    def counts(self):
+        return [queryset.count() for queryset in self.querysets]
+    
+    def count(self):
+        return sum(self.counts)
+    
+    def __len__(self):
+        return self.count()
+    
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start, stop, _ = key.indices(self.count())
+        items = []
+        offset = 0
+        for queryset, count in zip(self.querysets, self.counts):
+            low, high = max(start - offset, 0), min(stop - offset, count)
+            if low < high:
+                items.extend(queryset[low:high])
+            offset += count
+        return items
@@ -0,0 +1,174 @@
+"""
+On-demand request profiling for staff.
+
+A staff user adds ?__profile=1 to any URL and gets back a plain-text report
+of that request instead of the page: the top functions from cProfile, the
+ORM queries and a per-template render breakdown. Every report is stored as
+a ProfileReport, with the raw cProfile data downloadable from the admin for
+snakeviz or pstats.
+
+Requests without the flag only pay one dict lookup. The template hook is
+installed only while a profiled request is running.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import HttpResponse
+from django.template.base import Template
+from django.urls import reverse
+
+from .db import observe_queries
+from .metrics import route_name
+
+PROFILE_PARAM = '__profile'
+TOP_FUNCTIONS = 40
+TOP_QUERIES = 20
+
+_session = ContextVar('durga_profile_session', default=None)
+
+_hook_lock = threading.Lock()
+_hook_users = 0
+_original_render = Template._render
+
+
+class _Session:
+    def __init__(self):
+        self.queries = []
+        self.templates = defaultdict(lambda: [0, 0.0])
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper() hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+
+def _profiled_render(self, context):
+    session = _session.get()
+    if session is None:
+        return _original_render(self, context)
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context)
+    finally:
+        entry = session.templates[self.origin.template_name or self.origin.name]
+        entry[0] += 1
+        entry[1] += time.perf_counter() - start
+
+
+def _install_template_hook():
+    global _hook_users
+    with _hook_lock:
+        _hook_users += 1
+        Template._render = _profiled_render
+
+
+def _remove_template_hook():
+    global _hook_users
+    with _hook_lock:
+        _hook_users -= 1
+        if not _hook_users:
+            Template._render = _original_render
+
+
+def _format_report(request, response, duration, session, profiler):
+    out = io.StringIO()
+    query_time = sum(seconds for _, seconds in session.queries)
+    out.write(f'{request.method} {request.get_full_path()}\n')
+    out.write(f'View: {route_name(request)}   Status: {response.status_code}   Total: {duration * 1000:.1f} ms\n')
+    out.write(f'Queries: {len(session.queries)} in {query_time * 1000:.1f} ms\n\n')
+
+    out.write('== Templates (inclusive time) ==\n')
+    for name, (renders, seconds) in sorted(session.templates.items(), key=lambda item: -item[1][1]):
+        out.write(f'{seconds * 1000:9.1f} ms  {renders:4}x  {name}\n')
+
+    out.write(f'\n== Slowest queries (top {TOP_QUERIES}) ==\n')
+    for sql, seconds in sorted(session.queries, key=lambda query: -query[1])[:TOP_QUERIES]:
+        out.write(f'{seconds * 1000:9.2f} ms  {sql}\n')
+
+    repeated = [(sql, count) for sql, count in Counter(sql for sql, _ in session.queries).most_common() if count > 1]
+    if repeated:
+        out.write('\n== Repeated queries (possible N+1) ==\n')
+        for sql, count in repeated:
+            out.write(f'{count:4}x  {sql}\n')
+
+    out.write(f'\n== Top functions by cumulative time (top {TOP_FUNCTIONS}) ==\n')
+    stats = pstats.Stats(profiler, stream=out)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    return out.getvalue(), query_time
+
+
+class ProfilingMiddleware:
+    """Profile requests that carry ?__profile=1 from staff users; place after AuthenticationMiddleware"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        if PROFILE_PARAM not in request.GET or not request.user.is_staff:
+            return self.get_response(request)
+        return self.profile(request, self.get_response)
+
+    async def _acall(self, request):
+        if PROFILE_PARAM not in request.GET or not (await request.auser()).is_staff:
+            return await self.get_response(request)
+        # cProfile follows one thread: run the view from a sync thread so the
+        # ORM and template work it hands back to that thread is profiled too
+        return await sync_to_async(self.profile)(request, async_to_sync(self.get_response))
+
+    def profile(self, request, get_response):
+        from .models import ProfileReport
+
+        session = _Session()
+        profiler = cProfile.Profile()
+        token = _session.set(session)
+        _install_template_hook()
+        start = time.perf_counter()
+        try:
+            with observe_queries(session):
+                profiler.enable()
+                try:
+                    response = get_response(request)
+                finally:
+                    profiler.disable()
+        finally:
+            duration = time.perf_counter() - start
+            _remove_template_hook()
+            _session.reset(token)
+
+        report, query_time = _format_report(request, response, duration, session, profiler)
+        profiler.create_stats()
+        profile = ProfileReport.objects.create(
+            path=request.get_full_path()[:500],
+            view=route_name(request),
+            user=request.user,
+            status_code=response.status_code,
+            duration=duration,
+            query_count=len(session.queries),
+            query_time=query_time,
+            report=report,
+            stats=marshal.dumps(profiler.stats),
+        )
+
+        download_url = reverse('admin:durga_profilereport_stats', args=[profile.pk])
+        result = HttpResponse(f'Saved as profile #{profile.pk}; cProfile data: {download_url}\n\n{report}',
+                              content_type='text/plain; charset=utf-8')
+        result['Cache-Control'] = 'private, no-store'
+        result['X-Profile-Report'] = str(profile.pk)
+        return result
@@ -0,0 +1,137 @@
+"""
+Primary/replica database routing.
+
+Reads of durga content go to one of the DATABASE_REPLICAS aliases, but only
+inside requests that ReplicaRoutingMiddleware has cleared for it: anonymous
+style GET/HEAD traffic to the public pages. Everything else (the admin,
+form POSTs, management commands, Celery tasks) uses the primary.
+
+Replicas lag behind the primary, so a request goes to the primary when:
+
+* it is not a GET or HEAD, or it is for the admin;
+* it has already written something;
+* the visitor wrote something within DATABASE_REPLICA_LAG seconds, which
+  the sticky cookie remembers;
+* site content changed within DATABASE_REPLICA_LAG seconds, so the pages
+  cached for the new content version are never rendered from a replica
+  that has not caught up yet. Contact messages and the diagnostics tables
+  are not shown on those pages, so writing them does not count.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import reverse
+
+STICKY_COOKIE = 'durga_primary'
+RECENT_CHANGE_KEY = 'durga:recent_content_change'
+
+# Only the site content is read from replicas; sessions and users are not
+REPLICA_APPS = {'durga'}
+# Written by visitors and the diagnostics, never read by the public pages
+PRIVATE_MODELS = {'durga.contact', 'durga.slowquery', 'durga.profilereport'}
+
+_routing = ContextVar('durga_db_routing', default=None)
+
+
+class _Routing:
+    __slots__ = ('replica', 'wrote')
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+def _replica_lag():
+    return getattr(settings, 'DATABASE_REPLICA_LAG', 10)
+
+
+def note_content_change(models):
+    """Send reads to the primary until the replicas have caught up with a change to these models"""
+    if not getattr(settings, 'DATABASE_REPLICAS', None):
+        return
+    if any(model._meta.label_lower not in PRIVATE_MODELS for model in models):
+        cache.set(RECENT_CHANGE_KEY, True, _replica_lag())
+
+
+class PrimaryReplicaRouter:
+    """Route reads of durga content to a replica when the current request allows it"""
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        replicas = getattr(settings, 'DATABASE_REPLICAS', None)
+        if routing is None or not routing.replica or not replicas or model._meta.app_label not in REPLICA_APPS:
+            return None
+        # Reads inside a transaction must see its writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            # Later reads of this request must see the write
+            routing.replica = False
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *getattr(settings, 'DATABASE_REPLICAS', ())}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary
+        if db in getattr(settings, 'DATABASE_REPLICAS', ()):
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Let safe public requests read from the replicas and keep the primary sticky after a write"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.admin_prefix = None
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def may_use_replica(self, request):
+        if not getattr(settings, 'DATABASE_REPLICAS', None):
+            return False
+        if request.method not in ('GET', 'HEAD') or STICKY_COOKIE in request.COOKIES:
+            return False
+        if self.admin_prefix is None:
+            self.admin_prefix = reverse('admin:index')
+        return not request.path_info.startswith(self.admin_prefix)
+
+    def finish(self, request, response, routing):
+        if routing.wrote and getattr(settings, 'DATABASE_REPLICAS', None):
+            response.set_cookie(STICKY_COOKIE, '1', max_age=_replica_lag(), httponly=True, samesite='Lax')
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        routing = _Routing(self.may_use_replica(request) and cache.get(RECENT_CHANGE_KEY) is None)
+        token = _routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(request, response, routing)
+
+    async def _acall(self, request):
+        routing = _Routing(self.may_use_replica(request) and await cache.aget(RECENT_CHANGE_KEY) is None)
+        token = _routing.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return self.finish(request, response, routing)
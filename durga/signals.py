@@ -0,0 +1,97 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_version, refresh_home_snapshot, HOME_SNAPSHOT_MODELS
+from .images import RESPONSIVE_IMAGE_FIELDS
+from .models import GalleryAlbum, GalleryPhoto
+
+
+@receiver([post_save, post_delete])
+def bump_content_version(sender, **kwargs):
+    """Bump the cached content version whenever a durga model changes"""
+    if sender._meta.app_label == 'durga':
+        bump_version(sender)
+
+
+@receiver([post_save, post_delete])
+def rebuild_home_snapshot(sender, **kwargs):
+    """Rebuild the homepage snapshot when one of the models it shows changes"""
+    if sender in HOME_SNAPSHOT_MODELS:
+        refresh_home_snapshot()
+
+
+@receiver(pre_save)
+def remember_stored_images(sender, instance, raw=False, **kwargs):
+    """Note the files the responsive image fields held before the save"""
+    field_names = RESPONSIVE_IMAGE_FIELDS.get(sender._meta.label_lower)
+    # GalleryPhoto.save() already looked its image up
+    if raw or not field_names or instance.pk is None or sender is GalleryPhoto:
+        return
+    instance._stored_images = sender.objects.filter(pk=instance.pk).values(*field_names).first() or {}
+
+
+@receiver(post_save)
+def queue_image_derivatives(sender, instance, raw=False, **kwargs):
+    """Generate responsive derivatives for uploaded images, and drop those of replaced ones, in the background"""
+    field_names = RESPONSIVE_IMAGE_FIELDS.get(sender._meta.label_lower)
+    if raw or not field_names:
+        return
+    
+    from .tasks import delete_image_derivatives, generate_image_derivatives
+    stored = getattr(instance, '_stored_images', {})
+    replaced = [
+        stored[field_name] for field_name in field_names
+        if stored.get(field_name) and stored[field_name] != getattr(instance, field_name).name
+    ]
+    if replaced:
+        transaction.on_commit(lambda: delete_image_derivatives.delay(replaced))
+    
+    # process_gallery_photo makes an album photo's derivatives along with its thumbnail
+    if sender is GalleryPhoto:
+        return
+    for field_name in field_names:
+        if getattr(instance, field_name):
+            transaction.on_commit(
+                lambda field_name=field_name: generate_image_derivatives.delay(
+                    sender._meta.label_lower, instance.pk, field_name
+                )
+            )
+
+
+@receiver(post_delete)
+def drop_deleted_image_derivatives(sender, instance, **kwargs):
+    """Drop the derivatives of a deleted row's images in the background"""
+    field_names = RESPONSIVE_IMAGE_FIELDS.get(sender._meta.label_lower)
+    if not field_names:
+        return
+    
+    from .tasks import delete_image_derivatives
+    names = [getattr(instance, field_name).name for field_name in field_names if getattr(instance, field_name)]
+    if names:
+        transaction.on_commit(lambda: delete_image_derivatives.delay(names))
+
+
+@receiver([post_save, post_delete], sender=GalleryPhoto)
+def update_album_photo_stats(sender, instance, raw=False, origin=None, **kwargs):
+    """Keep GalleryAlbum.photo_count and the fallback cover in sync with its photos"""
+    # Deleting albums, one or a queryset of them (the admin's bulk delete),
+    # cascades to their photos; there is nothing left to count
+    if raw or isinstance(origin, GalleryAlbum):
+        return
+    if isinstance(origin, QuerySet) and issubclass(origin.model, GalleryAlbum):
+        return
+    
+    # A photo moved to another album changes the stats of both
+    album_ids = {instance.album_id, getattr(instance, '_previous_album_id', None)} - {None}
+    albums = list(GalleryAlbum.objects.filter(pk__in=album_ids))
+    if not albums:
+        return
+    for album in albums:
+        album.refresh_photo_stats()
+    
+    # refresh_photo_stats() uses update(), so invalidate the album caches here
+    bump_version(GalleryAlbum)
+    if any(album.is_featured for album in albums):
+        refresh_home_snapshot()
@@ -0,0 +1,150 @@
+"""
+Slow-query capture.
+
+SlowQueryMiddleware wraps every database query of a request. Queries slower
+than SLOW_QUERY_THRESHOLD_MS are aggregated in memory by (view, SQL
+fingerprint) and flushed to the SlowQuery table at most every
+SLOW_QUERY_FLUSH_INTERVAL seconds, so a slow festival day costs a handful of
+writes rather than one per query. Only parameterised SQL is kept, never the
+parameter values.
+"""
+import atexit
+import hashlib
+import logging
+import re
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .db import observe_queries
+from .metrics import route_name
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_SPACE = re.compile(r'\s+')
+
+# (view, fingerprint hash): [fingerprint, count, total, max, first_seen, last_seen]
+_pending = {}
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def fingerprint(sql):
+    """Normalise SQL so the same query with different values groups together"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql.replace('%s', '?'))
+    sql = _IN_LIST.sub('(...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+def record(view, sql, duration):
+    normalised = fingerprint(sql)
+    key = (view, hashlib.md5(normalised.encode()).hexdigest())
+    now = timezone.now()
+    # Only slow queries get here, so a lock is cheap
+    with _pending_lock:
+        entry = _pending.get(key)
+        if entry is None:
+            _pending[key] = [normalised, 1, duration, duration, now, now]
+        else:
+            entry[1] += 1
+            entry[2] += duration
+            entry[3] = max(entry[3], duration)
+            entry[5] = now
+
+
+def flush():
+    """Write the aggregated slow queries to the database"""
+    from .models import SlowQuery
+
+    global _pending, _last_flush
+    with _pending_lock:
+        pending, _pending = _pending, {}
+        _last_flush = time.monotonic()
+
+    for (view, fingerprint_hash), (normalised, count, total, longest, first_seen, last_seen) in pending.items():
+        changes = {
+            'count': F('count') + count,
+            'total_time': F('total_time') + total,
+            'max_time': Greatest('max_time', longest),
+            'last_seen': last_seen,
+        }
+        rows = SlowQuery.objects.filter(view=view, fingerprint_hash=fingerprint_hash)
+        try:
+            if rows.update(**changes):
+                continue
+            try:
+                SlowQuery.objects.create(
+                    view=view, fingerprint_hash=fingerprint_hash, fingerprint=normalised, count=count,
+                    total_time=total, max_time=longest, first_seen=first_seen, last_seen=last_seen,
+                )
+            except IntegrityError:
+                # Another process created the row first
+                rows.update(**changes)
+        except DatabaseError:
+            logger.exception('Could not store slow query statistics')
+            return
+
+
+def _flush_at_exit():
+    if _pending:
+        try:
+            flush()
+        except Exception:
+            logger.exception('Could not store slow query statistics at exit')
+
+
+atexit.register(_flush_at_exit)
+
+
+class SlowQueryMiddleware:
+    """Record queries slower than SLOW_QUERY_THRESHOLD_MS with their view"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100) / 1000
+        self.flush_interval = getattr(settings, 'SLOW_QUERY_FLUSH_INTERVAL', 60)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def observer(self, request):
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                duration = time.perf_counter() - start
+                if duration >= self.threshold:
+                    record(route_name(request), sql, duration)
+        return wrapper
+
+    def flush_due(self):
+        return _pending and time.monotonic() - _last_flush >= self.flush_interval
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        with observe_queries(self.observer(request)):
+            response = self.get_response(request)
+        # Outside the observer, so the flush does not record itself
+        if self.flush_due():
+            flush()
+        return response
+
+    async def _acall(self, request):
+        with observe_queries(self.observer(request)):
+            response = await self.get_response(request)
+        if self.flush_due():
+            await sync_to_async(flush)()
+        return response
@@ -0,0 +1,83 @@
+from celery import shared_task
+from django.apps import apps
+
+from .cache import build_home_snapshot, bump_version
+from .images import (
+    DERIVATIVE_ROOT, build_placeholder, delete_derivatives, file_sha256, fit_slider_image, generate_derivatives,
+    get_derivatives, has_derivatives, thumbnail_name,
+)
+from .models import GalleryPhoto, Slider
+
+
+@shared_task(ignore_result=True)
+def process_slider_image(slider_id):
+    """Crop and resize a newly uploaded slider image once"""
+    slider = Slider.objects.filter(pk=slider_id).first()
+    if slider is None or not slider.image:
+        return
+    
+    # Skip files we already processed, e.g. the same image uploaded again
+    if file_sha256(slider.image) == slider.image_hash:
+        return
+    
+    fit_slider_image(slider.image.path)
+    
+    # update() keeps the save signals (and this task) from running again
+    Slider.objects.filter(pk=slider_id).update(image_hash=file_sha256(slider.image))
+
+
+@shared_task(ignore_result=True)
+def generate_image_derivatives(model_label, pk, field_name, force=False):
+    """Generate srcset derivatives for one image field, once per stored file"""
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    field_file = getattr(instance, field_name, None)
+    if not field_file:
+        return
+    if not force and has_derivatives(field_file.name):
+        return
+    
+    generate_derivatives(field_file)
+    
+    # Cached pages rendered before the derivatives existed use the original
+    bump_version(model)
+
+
+@shared_task(ignore_result=True)
+def delete_image_derivatives(names):
+    """Delete the derivatives of images that were replaced or whose row was deleted"""
+    # Uploads get unique names, so no other row shows these files
+    for name in names:
+        delete_derivatives(name)
+
+
+@shared_task(ignore_result=True)
+def process_gallery_photo(photo_id, force=False):
+    """
+    Generate the srcset derivatives of an uploaded album photo and store its
+    thumbnail (one of the derivatives), dimensions and placeholder.
+    """
+    photo = GalleryPhoto.objects.filter(pk=photo_id).first()
+    if photo is None or not photo.image:
+        return
+    
+    manifest = None if force else get_derivatives(photo.image.name)
+    if manifest is None:
+        manifest = generate_derivatives(photo.image)
+    thumbnail = thumbnail_name(manifest)
+    
+    # update() so the save signals do not queue this task again
+    GalleryPhoto.objects.filter(pk=photo_id).update(
+        thumbnail=thumbnail, placeholder=build_placeholder(photo.image),
+        width=manifest['width'], height=manifest['height'],
+    )
+    # Thumbnails written before they were derivatives
+    if photo.thumbnail and not photo.thumbnail.name.startswith(f'{DERIVATIVE_ROOT}/'):
+        photo.thumbnail.delete(save=False)
+    bump_version(GalleryPhoto)
+
+
+@shared_task(ignore_result=True)
+def rebuild_home_snapshot():
+    """Rebuild the homepage snapshot after one of the models it shows changed"""
+    build_home_snapshot()
@@ -0,0 +1,15 @@
+from django import template
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from durga.critical_css import load_critical_css
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def critical_css(context):
+    """Inline the above-the-fold CSS built for the current route (see durga.critical_css)"""
+    match = getattr(context.get('request'), 'resolver_match', None)
+    css = load_critical_css(match.url_name) if match else ''
+    return format_html('<style>{}</style>', mark_safe(css)) if css else ''
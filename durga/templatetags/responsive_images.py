@@ -0,0 +1,57 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from durga.images import get_derivatives
+
+register = template.Library()
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+# Width used for the plain src of browsers without srcset support
+FALLBACK_WIDTH = 960
+
+
+def _srcset(entries):
+    return ', '.join(f'{default_storage.url(name)} {width}w' for name, width in entries)
+
+
+@register.simple_tag
+def responsive_image(field_file, sizes='100vw', **attrs):
+    """
+    Render an ImageField as a <picture> with AVIF/WebP/JPEG srcsets.
+
+    Usage: {% responsive_image member.image sizes="(max-width: 576px) 100vw, 25vw" alt=member.name %}
+
+    Extra keyword arguments become <img> attributes. Falls back to a plain
+    <img> of the original file until the derivatives have been generated.
+    """
+    if not field_file:
+        return ''
+
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+
+    manifest = get_derivatives(field_file.name)
+    if not manifest:
+        return format_html('<img src="{}"{}>', field_file.url, flatatt(attrs))
+
+    sources = manifest['sources']
+    jpeg = sources['jpeg']
+    fallback = next((name for name, width in reversed(jpeg) if width <= FALLBACK_WIDTH), jpeg[0][0])
+    attrs.update({
+        'srcset': _srcset(jpeg),
+        'sizes': sizes,
+        'width': manifest['width'],
+        'height': manifest['height'],
+    })
+
+    source_tags = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((MIME_TYPES[fmt], _srcset(entries), sizes) for fmt, entries in sources.items() if fmt != 'jpeg'),
+    )
+    return format_html(
+        '<picture class="responsive-image">{}<img src="{}"{}></picture>',
+        source_tags, default_storage.url(fallback), flatatt(attrs),
+    )
@@ -0,0 +1,26 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from durga.webfonts import FAMILY, GOOGLE_FONTS_URL, font_faces
+
+register = template.Library()
+
+
+@register.simple_tag
+def webfonts():
+    """Preload and declare the self-hosted font subsets, or link Google Fonts until they are built"""
+    faces = font_faces()
+    if faces is None:
+        return format_html('<link href="{}" rel="stylesheet">', GOOGLE_FONTS_URL)
+
+    preloads = format_html_join(
+        '\n', '<link rel="preload" href="{}" as="font" type="font/woff2" crossorigin>',
+        ((url,) for weight, url, preload in faces if preload),
+    )
+    declarations = ''.join(
+        f"@font-face{{font-family:'{FAMILY}';font-style:normal;font-weight:{weight};"
+        f"font-display:swap;src:url('{url}') format('woff2')}}"
+        for weight, url, preload in faces
+    )
+    return format_html('{}\n<style>{}</style>', preloads, mark_safe(declarations))
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from durga.models import (
+    Page, Event, Gallery, Contact, SiteSettings, Slider, GalleryAlbum, GalleryPhoto,
+    CommitteeMember, DurgaSangha, DurgaPujaCountdown, PujaDay, DonationInfo
+)
+
+
+def create_scaled_dataset(scale=1):
+    """
+    Bulk-create a dataset large enough for the planner to prefer indexes.
+
+    Most filtered rows are inactive/unpublished so the public pages stay
+    small to render while the tables are big enough that a missing index
+    shows up as a full scan. Returns the album holding the photos.
+    """
+    now = timezone.now()
+    author = User.objects.create_user('author')
+
+    SiteSettings.objects.create(site_title='দুর্গা মন্দির')
+    DonationInfo.objects.create(bkash_number='01700000000')
+    DurgaPujaCountdown.objects.bulk_create(
+        DurgaPujaCountdown(target_date=now + timedelta(days=i), is_active=i == 0)
+        for i in range(200 * scale)
+    )
+    Page.objects.bulk_create(
+        Page(title=f'Page {i}', slug=f'page-{i}', content='...', author=author,
+             show_in_menu=i % 50 == 0, is_published=i % 10 == 0, menu_order=i)
+        for i in range(1000 * scale)
+    )
+    Slider.objects.bulk_create(
+        Slider(title=f'Slide {i}', image=f'slider/{i}.jpg', is_active=i % 100 == 0, order=i)
+        for i in range(1000 * scale)
+    )
+    Event.objects.bulk_create(
+        Event(title=f'Event {i}', description='...', location='মন্দির',
+              date_time=now + timedelta(days=i - 500 * scale), is_active=i % 20 == 0)
+        for i in range(2000 * scale)
+    )
+    Gallery.objects.bulk_create(
+        Gallery(title=f'Gallery {i}', image=f'gallery/{i}.jpg', is_featured=i % 100 == 0)
+        for i in range(1000 * scale)
+    )
+    GalleryAlbum.objects.bulk_create(
+        GalleryAlbum(title=f'Album {i}', is_featured=i % 100 == 0)
+        for i in range(1000 * scale)
+    )
+    album = GalleryAlbum.objects.order_by('id').first()
+    GalleryPhoto.objects.bulk_create(
+        GalleryPhoto(album=album, title=f'Photo {i}', image=f'albums/photos/{i}.jpg')
+        for i in range(2000 * scale)
+    )
+    album.refresh_photo_stats()
+    PujaDay.objects.bulk_create(
+        PujaDay(title=f'Day {i}', date=now.date() + timedelta(days=i), image=f'puja_days/{i}.jpg',
+                is_active=i % 100 == 0, order=i)
+        for i in range(1000 * scale)
+    )
+    for model in (CommitteeMember, DurgaSangha):
+        model.objects.bulk_create(
+            model(name=f'Member {i}', position='সদস্য', category_order=i % 5, order=i,
+                  image=f'members/{i}.jpg', is_active=i % 20 == 0)
+            for i in range(2000 * scale)
+        )
+    Contact.objects.bulk_create(
+        Contact(name=f'Visitor {i}', email=f'visitor{i}@example.com', subject='...', message='...',
+                is_read=i % 10 != 0)
+        for i in range(2000 * scale)
+    )
+    return album
@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from durga.models import GalleryAlbum, GalleryPhoto
+
+
+class AlbumPhotoStatsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.album = GalleryAlbum.objects.create(title='মহা সপ্তমী')
+        self.other = GalleryAlbum.objects.create(title='মহা অষ্টমী')
+
+    def add_photo(self, album, name):
+        return GalleryPhoto.objects.create(album=album, image=f'albums/photos/{name}.jpg')
+
+    def assertStats(self, album, count, cover):
+        album.refresh_from_db()
+        self.assertEqual(album.photo_count, count)
+        self.assertEqual(album.first_photo_image.name, cover)
+
+    def test_adding_photos(self):
+        self.add_photo(self.album, 'first')
+        self.add_photo(self.album, 'second')
+        self.assertStats(self.album, 2, 'albums/photos/first.jpg')
+
+    def test_deleting_photos(self):
+        first = self.add_photo(self.album, 'first')
+        self.add_photo(self.album, 'second')
+        first.delete()
+        self.assertStats(self.album, 1, 'albums/photos/second.jpg')
+
+    def test_moving_a_photo_updates_both_albums(self):
+        photo = self.add_photo(self.album, 'first')
+        self.add_photo(self.album, 'second')
+        self.add_photo(self.other, 'third')
+
+        photo.album = self.other
+        photo.save()
+        self.assertStats(self.album, 1, 'albums/photos/second.jpg')
+        self.assertStats(self.other, 2, 'albums/photos/first.jpg')
+
+        # The cover no longer belongs to the album it left
+        self.add_photo(self.album, 'fourth')
+        GalleryPhoto.objects.get(image='albums/photos/second.jpg').delete()
+        self.assertStats(self.album, 1, 'albums/photos/fourth.jpg')
+
+    def test_deleting_albums_skips_the_recount(self):
+        for name in ('first', 'second'):
+            self.add_photo(self.album, name)
+        self.add_photo(self.other, 'third')
+        with mock.patch.object(GalleryAlbum, 'refresh_photo_stats') as refresh:
+            self.album.delete()
+            GalleryAlbum.objects.filter(pk=self.other.pk).delete()
+        refresh.assert_not_called()
+        self.assertFalse(GalleryPhoto.objects.exists())
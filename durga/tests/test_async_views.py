@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.test import AsyncClient, SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from durga.db import observe_queries, run_concurrently
+from durga.models import Event, GalleryAlbum
+from .data import create_scaled_dataset
+
+# Pages whose HTML carries no per-request token
+PAGES = [
+    ('durga:home', []),
+    ('durga:events', []),
+    ('durga:gallery', []),
+    ('durga:committee', []),
+    ('durga:durga_sangha', []),
+    ('durga:page_detail', ['page-0']),
+]
+
+
+@override_settings(ROOT_URLCONF='durga_mondir.asgi_urls')
+class AsyncViewTests(TransactionTestCase):
+    """The views run in worker threads with their own connections, so data must be committed"""
+
+    def setUp(self):
+        cache.clear()
+        self.album = create_scaled_dataset(scale=1)
+        self.async_client = AsyncClient()
+
+    def tearDown(self):
+        cache.clear()
+
+    async def aget(self, url, **extra):
+        return await self.async_client.get(url, **extra)
+
+    async def sync_get(self, url):
+        with override_settings(ROOT_URLCONF='durga_mondir.urls'):
+            return await self.async_client.get(url)
+
+    async def test_pages_match_the_sync_views(self):
+        urls = [reverse(name, args=args) for name, args in PAGES]
+        urls += [reverse('durga:album_detail', args=[self.album.pk]), reverse('durga:events') + '?filter=past']
+        for url in urls:
+            with self.subTest(url=url):
+                await cache.aclear()
+                expected = await self.sync_get(url)
+                await cache.aclear()
+                response = await self.aget(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.resolver_match.func.__module__, 'durga.async_views')
+                self.assertEqual(response.content, expected.content)
+
+    async def test_missing_objects_are_404(self):
+        self.assertEqual((await self.aget(reverse('durga:page_detail', args=['missing']))).status_code, 404)
+        self.assertEqual((await self.aget(reverse('durga:album_detail', args=[0]))).status_code, 404)
+
+    async def test_conditional_get(self):
+        url = reverse('durga:events')
+        response = await self.aget(url)
+        not_modified = await self.aget(url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+
+    async def test_album_infinite_scroll(self):
+        url = reverse('durga:album_detail', args=[self.album.pk])
+        response = await self.aget(url, headers={'X-Requested-With': 'XMLHttpRequest'})
+        data = response.json()
+        self.assertEqual(len(data['photos']), 20)
+        self.assertTrue(data['has_next'])
+
+    async def test_fan_out_queries_are_observed(self):
+        seen = []
+
+        def observer(execute, sql, params, many, context):
+            seen.append(sql)
+            return execute(sql, params, many, context)
+
+        with observe_queries(observer):
+            events, albums = await run_concurrently(Event.objects.count, GalleryAlbum.objects.count)
+        self.assertGreater(events, 0)
+        self.assertGreater(albums, 0)
+        self.assertEqual(len(seen), 2)
+
+
+class FanOutTests(SimpleTestCase):
+
+    def test_fan_out_is_capped(self):
+        lock = threading.Lock()
+        running, peak = 0, 0
+
+        def query(value):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return value
+
+        async def two_requests():
+            return await asyncio.gather(*(
+                run_concurrently(*(lambda value=value: query(value) for value in range(start, start + 6)))
+                for start in (0, 6)
+            ))
+
+        first, second = async_to_sync(two_requests)()
+        self.assertEqual(first + second, list(range(12)))
+        self.assertEqual(peak, settings.DB_FANOUT_WORKERS)
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from durga.images import get_derivatives
+from durga.models import Event, GalleryAlbum, GalleryPhoto, Slider
+
+
+class GenerateBenchmarkDataTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+    def generate(self, seed):
+        call_command('generate_benchmark_data', seed=seed, scale=0.002, photos_per_album=5, images=2,
+                     stdout=StringIO())
+
+    def test_volumes_and_album_stats(self):
+        self.generate(seed=3)
+
+        self.assertEqual(Event.objects.count(), 20)
+        self.assertEqual(GalleryAlbum.objects.count(), 1)
+        self.assertEqual(GalleryPhoto.objects.count(), 5)
+        album = GalleryAlbum.objects.get()
+        self.assertEqual(album.photo_count, 5)
+        self.assertTrue(album.get_cover_image())
+        self.assertFalse(GalleryPhoto.objects.filter(thumbnail='').exists())
+
+    def test_same_seed_gives_same_data(self):
+        self.generate(seed=3)
+        fields = ('title', 'location', 'is_active', 'date_time')
+        first = list(Event.objects.order_by('id').values_list(*fields))
+        Event.objects.all().delete()
+
+        self.generate(seed=3)
+        self.assertEqual(list(Event.objects.order_by('id').values_list(*fields)), first)
+
+    def test_every_row_has_its_own_image(self):
+        self.generate(seed=3)
+        photos = list(GalleryPhoto.objects.all())
+        events = list(Event.objects.exclude(featured_image=''))
+        images = [photo.image.name for photo in photos] + [event.featured_image.name for event in events]
+        self.assertEqual(len(set(images)), len(images))
+        self.assertIsNotNone(get_derivatives(events[0].featured_image.name))
+
+        # Sliders are cropped in place, so theirs are not links to a shared file
+        slider = Slider.objects.first()
+        self.assertEqual(os.stat(slider.image.path).st_nlink, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            photos[0].delete()
+            events[0].delete()
+        for photo in photos[1:]:
+            self.assertTrue(default_storage.exists(photo.image.name))
+            self.assertTrue(default_storage.exists(photo.thumbnail.name))
+        for event in events[1:]:
+            self.assertTrue(default_storage.exists(event.featured_image.name))
+            self.assertIsNotNone(get_derivatives(event.featured_image.name))
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from durga.management.commands.benchmark_site import Command, percentile
+from durga.models import Event
+
+
+class PercentileTests(SimpleTestCase):
+
+    def test_nearest_rank(self):
+        values = list(range(1, 21))
+        self.assertEqual(percentile(values, 0.50), 10)
+        # 0.95 * 20 = 19 exactly: the 19th value, not the maximum
+        self.assertEqual(percentile(values, 0.95), 19)
+        self.assertEqual(percentile(values, 0.99), 20)
+        self.assertEqual(percentile(list(range(1, 101)), 0.07), 7)
+        self.assertEqual(percentile(list(range(1, 101)), 0.95), 95)
+
+    def test_edges(self):
+        self.assertIsNone(percentile([], 0.5))
+        self.assertEqual(percentile([4], 0.99), 4)
+        self.assertEqual(percentile([1, 2, 3], 0), 1)
+        self.assertEqual(percentile([1, 2, 3], 1), 3)
+
+
+# No host allowed beyond Django's own defaults, as in production before ALLOWED_HOSTS is set
+@override_settings(ALLOWED_HOSTS=[])
+class BenchmarkSiteTests(TransactionTestCase):
+    """The ASGI run serves the views from worker threads, so data must be committed"""
+
+    def setUp(self):
+        cache.clear()
+        Event.objects.create(title='মহা সপ্তমী', description='...', location='মন্দির', date_time='2025-09-29T18:00+06:00')
+
+    def benchmark(self, *args):
+        handle, output = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self.addCleanup(os.remove, output)
+        call_command('benchmark_site', *args, '--route', 'events', '--requests', '4', '--warmup', '1',
+                     '--output', output, stdout=StringIO())
+        with open(output) as output_file:
+            return json.load(output_file)['routes']['events']
+
+    def test_requests_are_served(self):
+        for args in [(), ('--asgi',), ('--asgi', '--cold')]:
+            with self.subTest(args=args):
+                result = self.benchmark(*args)
+                self.assertEqual((result['requests'], result['errors']), (4, 0))
+                self.assertIsNotNone(result['queries_mean'])
+
+    def test_error_responses_fail_the_run(self):
+        with mock.patch.object(Command, 'fetch', return_value=(400, 0.01, 0)):
+            with self.assertRaisesMessage(CommandError, 'events 4/4'):
+                self.benchmark()
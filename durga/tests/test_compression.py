@@ -0,0 +1,129 @@
+import gzip
+
+import brotli
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from durga.cache import HOME_SNAPSHOT_MODELS, _cached_page
+from durga.compression import CompressionMiddleware, minify_html, negotiate
+
+PAGE = '<p>{}</p>'.format('দুর্গা পূজা ' * 200)
+
+
+def respond(request, response):
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+class MinifyTests(SimpleTestCase):
+
+    def test_collapses_whitespace_and_drops_comments(self):
+        html = (
+            '<div>\n    <!-- Navigation -->\n    <a>  এক  </a>\n\n\n</div>\n'
+            '<!--[if IE]><p>IE</p><![endif]-->\n'
+            '<pre>  keep\n\n  this</pre>\n<textarea>\n  as is</textarea>\n'
+            '<script>\n    let a  =  1;\n</script>'
+        )
+        self.assertEqual(minify_html(html), (
+            '<div>\n<a> এক </a>\n</div>\n'
+            '<!--[if IE]><p>IE</p><![endif]-->\n'
+            '<pre>  keep\n\n  this</pre>\n<textarea>\n  as is</textarea>\n'
+            '<script>\n    let a  =  1;\n</script>'
+        ))
+
+    def test_negotiates_by_q_value(self):
+        factory = RequestFactory()
+        for header, expected in [
+            ('gzip, deflate, br', 'br'),
+            ('br;q=0.5, gzip', 'gzip'),
+            ('gzip;q=0, br;q=0', None),
+            ('*', 'br'),
+            ('', None),
+        ]:
+            with self.subTest(header):
+                self.assertEqual(negotiate(factory.get('/', HTTP_ACCEPT_ENCODING=header)), expected)
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_compresses_with_the_accepted_encoding(self):
+        brotli_response = respond(self.factory.get('/', HTTP_ACCEPT_ENCODING='gzip, br'), HttpResponse(PAGE))
+        self.assertEqual(brotli_response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(brotli_response.content).decode(), PAGE)
+        self.assertEqual(brotli_response['Content-Length'], str(len(brotli_response.content)))
+        self.assertEqual(brotli_response['Vary'], 'Accept-Encoding')
+
+        gzip_response = respond(self.factory.get('/', HTTP_ACCEPT_ENCODING='gzip'), HttpResponse(PAGE))
+        self.assertEqual(gzip.decompress(gzip_response.content).decode(), PAGE)
+
+        plain = respond(self.factory.get('/'), HttpResponse(PAGE))
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(plain['Vary'], 'Accept-Encoding')
+
+    @override_settings(COMPRESSION_MIN_SIZE=100_000)
+    def test_small_responses_are_left_alone(self):
+        response = respond(self.factory.get('/', HTTP_ACCEPT_ENCODING='br'), HttpResponse(PAGE))
+        self.assertNotIn('Content-Encoding', response)
+        self.assertFalse(response.has_header('Vary'))
+
+    def test_images_are_left_alone(self):
+        response = respond(self.factory.get('/', HTTP_ACCEPT_ENCODING='br'),
+                           HttpResponse(b'\x89PNG' * 1000, content_type='image/png'))
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_streams_are_compressed_chunk_by_chunk(self):
+        chunks = [PAGE.encode()] * 3
+        response = respond(self.factory.get('/', HTTP_ACCEPT_ENCODING='br'), StreamingHttpResponse(iter(chunks)))
+        self.assertEqual(response['Content-Encoding'], 'br')
+        # Every chunk is flushed, so the client can start on it right away
+        compressed = list(response.streaming_content)
+        decompressor = brotli.Decompressor()
+        self.assertEqual(decompressor.process(compressed[0]), chunks[0])
+        self.assertEqual(b''.join(decompressor.process(part) for part in compressed[1:]), b''.join(chunks[1:]))
+
+    def test_async_streams(self):
+        async def chunks():
+            for _ in range(3):
+                yield PAGE.encode()
+
+        async def get_response(request):
+            return StreamingHttpResponse(chunks())
+
+        async def consume():
+            response = await CompressionMiddleware(get_response)(
+                self.factory.get('/', HTTP_ACCEPT_ENCODING='gzip'))
+            return response, b''.join([chunk async for chunk in response.streaming_content])
+
+        response, body = async_to_sync(consume)()
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(body), PAGE.encode() * 3)
+
+
+class CompressedPageCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_page_cache_keeps_minified_and_compressed_copies(self):
+        url = reverse('durga:home')
+        compressed = self.client.get(url, HTTP_ACCEPT_ENCODING='br')
+        self.assertEqual(compressed['Content-Encoding'], 'br')
+        self.assertTrue(compressed['ETag'].startswith('W/'))
+
+        plain = self.client.get(url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertNotIn('<!-- Navigation -->', plain.content.decode())
+        self.assertEqual(brotli.decompress(compressed.content), plain.content)
+
+        # Served from the cache as is, without compressing again
+        _, cached = _cached_page(RequestFactory().get(url, HTTP_ACCEPT_ENCODING='br'), HOME_SNAPSHOT_MODELS)
+        self.assertEqual(cached['Content-Encoding'], 'br')
+        self.assertEqual(cached.content, compressed.content)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=compressed['ETag'],
+                                         HTTP_ACCEPT_ENCODING='br').status_code, 304)
@@ -0,0 +1,61 @@
+from bs4 import BeautifulSoup
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from durga.critical_css import absolute_urls, critical_path, critical_rules
+from durga.management.commands.build_critical_css import ROUTES
+
+CSS = """
+/* Navbar */
+.navbar { color: red; }
+.navbar a:hover { color: blue; }
+.footer { color: green; }
+::-webkit-scrollbar { width: 14px; }
+@media (max-width: 768px) {
+    .hero-title { font-size: 2rem; animation: fadeInUp 1s; }
+    .footer { display: none; }
+}
+@keyframes fadeInUp { from { opacity: 0; } to { opacity: 1; } }
+@keyframes spin { to { transform: rotate(360deg); } }
+"""
+
+
+class CriticalRulesTests(SimpleTestCase):
+
+    def test_keeps_only_rules_for_the_fold(self):
+        fold = BeautifulSoup('<body><nav class="navbar"><a>x</a></nav><h1 class="hero-title"></h1></body>',
+                             'html.parser')
+        self.assertEqual(critical_rules(CSS, fold), (
+            '.navbar{color: red;}.navbar a:hover{color: blue;}::-webkit-scrollbar{width: 14px;}'
+            '@media (max-width: 768px){.hero-title{font-size: 2rem; animation: fadeInUp 1s;}}'
+            '@keyframes fadeInUp{from { opacity: 0; } to { opacity: 1; }}'
+        ))
+
+    def test_relative_urls_become_static_urls(self):
+        self.assertEqual(
+            absolute_urls("a{background:url('../images/bg.jpg')}b{background:url(data:image/png;base64,AA)}"),
+            "a{background:url('/static/images/bg.jpg')}b{background:url(data:image/png;base64,AA)}",
+        )
+
+
+class PageStylesTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_every_route_has_critical_css(self):
+        for route in ROUTES:
+            self.assertIsNotNone(finders.find(critical_path(route)), route)
+
+    def test_pages_inline_critical_css_and_load_stylesheets_async(self):
+        soup = BeautifulSoup(self.client.get(reverse('durga:home')).content, 'html.parser')
+
+        styles = soup.find_all('style')
+        self.assertEqual(len(styles), 1)
+        self.assertIn('.navbar{', styles[0].string)
+        self.assertNotIn('/*', styles[0].string)
+        preloaded = [link['href'] for link in soup.find_all('link', rel='preload', attrs={'as': 'style'})]
+        self.assertEqual(preloaded, ['/static/css/base.css', '/static/css/home.css'])
+        self.assertIsNone(soup.find('script', src=None))
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from durga.models import Event
+
+
+class EventsCalendarFeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.start = timezone.make_aware(datetime(2025, 9, 28))
+        cls.long_description = ' '.join(['মা'] * 60)
+        for day, title, is_active in [(1, 'মহা ষষ্ঠী', True), (0, 'মহালয়া', True), (3, 'গোপন', False),
+                                      (40, 'লক্ষ্মী পূজা', True)]:
+            Event.objects.create(title=title, description=cls.long_description, location='মন্দির',
+                                 date_time=cls.start + timedelta(days=day, hours=18), is_active=is_active)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('durga:events_calendar')
+
+    def feed(self, **params):
+        return self.client.get(self.url, params)
+
+    def test_active_events_in_range(self):
+        response = self.feed(start='2025-09-28', end='2025-10-05')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([event['title'] for event in response.json()], ['মহালয়া', 'মহা ষষ্ঠী'])
+        self.assertEqual(response.json()[0]['datetime'], '2025-09-28 18:00')
+
+    def test_full_calendar_datetimes(self):
+        response = self.feed(start='2025-09-28T00:00:00+06:00', end='2025-11-09T00:00:00+06:00')
+        self.assertEqual(len(response.json()), 3)
+
+    def test_invalid_ranges(self):
+        for params in [
+            {},
+            {'start': '2025-09-28'},
+            {'start': 'yesterday', 'end': '2025-10-05'},
+            {'start': '2025-09-28', 'end': '2025-13-40'},
+            {'start': '2025-10-05', 'end': '2025-10-05'},
+            {'start': '2025-10-05', 'end': '2025-09-28'},
+            {'start': '2025-09-28', 'end': '2025-11-30'},
+        ]:
+            with self.subTest(params=params):
+                response = self.feed(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+    def test_longest_range(self):
+        self.assertEqual(self.feed(start='2025-09-28', end='2025-11-29').status_code, 200)
+
+    def test_descriptions_are_truncated(self):
+        description = self.feed(start='2025-09-28', end='2025-10-05').json()[0]['description']
+        self.assertEqual(len(description.split()), 40)
+        self.assertTrue(description.endswith('…'))
+
+    def test_browsers_may_cache_the_feed(self):
+        response = self.feed(start='2025-09-28', end='2025-10-05')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=300')
@@ -0,0 +1,201 @@
+import shutil
+import tempfile
+import time
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from durga.images import (
+    DERIVATIVE_MISS_TIMEOUT, SLIDER_SIZE, file_sha256, generate_derivatives, get_derivatives, has_derivatives,
+)
+from durga.models import Event, GalleryAlbum, GalleryPhoto, Slider
+from durga.tasks import process_slider_image
+
+
+def jpeg_bytes(size=(800, 600), color='orange'):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def image_upload(name='photo.jpg', size=(800, 600), color='orange'):
+    return SimpleUploadedFile(name, jpeg_bytes(size, color), content_type='image/jpeg')
+
+
+class MediaTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+
+class SliderImageTests(MediaTestCase):
+
+    def create_slider(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Slider.objects.create(title='মহালয়া', image=image_upload(size=(1000, 1000)), **fields)
+
+    def test_new_images_are_cropped_in_the_background(self):
+        slider = self.create_slider()
+        slider.refresh_from_db()
+        with Image.open(slider.image.path) as img:
+            self.assertEqual(img.size, SLIDER_SIZE)
+        self.assertEqual(slider.image_hash, file_sha256(slider.image))
+
+    def test_list_edits_do_not_queue_the_task(self):
+        slider = self.create_slider()
+        slider.order, slider.is_active = 5, False
+        with mock.patch('durga.tasks.process_slider_image.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                slider.save()
+        delay.assert_not_called()
+
+        slider.image = image_upload('new.jpg')
+        with mock.patch('durga.tasks.process_slider_image.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                slider.save()
+        delay.assert_called_once_with(slider.pk)
+
+    def test_processed_files_are_skipped(self):
+        slider = self.create_slider()
+        with mock.patch('durga.tasks.fit_slider_image') as fit:
+            process_slider_image(slider.pk)
+        fit.assert_not_called()
+
+
+class DerivativeTests(MediaTestCase):
+
+    def stored_image(self, name='events/puja.jpg', size=(1000, 500)):
+        return Event(featured_image=default_storage.save(name, ContentFile(jpeg_bytes(size)))).featured_image
+
+    def create_event(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Event.objects.create(title='কুমারী পূজা', description='...', location='মন্দির',
+                                        date_time=timezone.now(), featured_image=image)
+
+    def test_generate_derivatives(self):
+        image = self.stored_image()
+        manifest = generate_derivatives(image)
+        self.assertEqual((manifest['width'], manifest['height']), (1000, 500))
+        self.assertIn('webp', manifest['sources'])
+        # Never wider than the original
+        self.assertEqual([width for _, width in manifest['sources']['jpeg']], [320, 640, 960, 1000])
+        for entries in manifest['sources'].values():
+            for name, width in entries:
+                with default_storage.open(name) as derivative, Image.open(derivative) as img:
+                    self.assertEqual(img.size, (width, width // 2))
+        self.assertEqual(get_derivatives(image.name), manifest)
+
+    def test_missing_derivatives_are_looked_up_again(self):
+        image = self.stored_image()
+        self.assertIsNone(get_derivatives(image.name))
+        # Made by a worker that did not update this cache entry
+        with mock.patch('durga.images.cache'):
+            manifest = generate_derivatives(image)
+        with mock.patch('time.time', return_value=time.time() + DERIVATIVE_MISS_TIMEOUT + 1):
+            self.assertEqual(get_derivatives(image.name), manifest)
+
+    def test_picture_tag(self):
+        image = self.stored_image()
+        template = Template('{% load responsive_images %}{% responsive_image image sizes="50vw" alt="পূজা" %}')
+
+        plain = template.render(Context({'image': image}))
+        self.assertEqual(plain, f'<img src="{image.url}" alt="পূজা" decoding="async" loading="lazy">')
+
+        generate_derivatives(image)
+        picture = template.render(Context({'image': image}))
+        self.assertTrue(picture.startswith('<picture class="responsive-image"><source type="image/'))
+        self.assertIn('<source type="image/webp" srcset="', picture)
+        self.assertIn(f'src="{default_storage.url("derivatives/events/puja.jpg/960.jpg")}"', picture)
+        self.assertIn('sizes="50vw"', picture)
+        self.assertIn('height="500"', picture)
+        self.assertIn('width="1000"', picture)
+
+    def test_command_queues_existing_images(self):
+        image = self.stored_image()
+        Event.objects.bulk_create([Event(title='পূজা', description='...', location='মন্দির',
+                                         date_time=timezone.now(), featured_image=image.name)])
+        call_command('generate_image_derivatives', stdout=StringIO())
+        self.assertTrue(has_derivatives(image.name))
+
+        with mock.patch('durga.tasks.generate_derivatives') as generate:
+            call_command('generate_image_derivatives', stdout=StringIO())
+            generate.assert_not_called()
+            call_command('generate_image_derivatives', force=True, stdout=StringIO())
+            generate.assert_called_once()
+
+    def test_replaced_and_deleted_images_lose_their_derivatives(self):
+        event = self.create_event(image_upload('first.jpg'))
+        first = event.featured_image.name
+        self.assertTrue(has_derivatives(first))
+
+        event.featured_image = image_upload('second.jpg')
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+        second = event.featured_image.name
+        self.assertFalse(default_storage.exists(f'derivatives/{first}'))
+        self.assertIsNone(get_derivatives(first))
+        self.assertTrue(has_derivatives(second))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.delete()
+        self.assertFalse(default_storage.exists(f'derivatives/{second}'))
+
+
+class GalleryPhotoTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.album = GalleryAlbum.objects.create(title='বিজয়া দশমী')
+
+    def add_photo(self, name='arati.jpg'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return GalleryPhoto.objects.create(album=self.album, image=image_upload(name, size=(1200, 800)))
+
+    def test_upload_fills_in_thumbnail_dimensions_and_placeholder(self):
+        with mock.patch('durga.tasks.generate_image_derivatives.delay') as generate:
+            photo = self.add_photo()
+        # One pipeline: the thumbnail is one of the photo's derivatives
+        generate.assert_not_called()
+        photo.refresh_from_db()
+        self.assertEqual(photo.thumbnail.name, f'derivatives/{photo.image.name}/640.jpg')
+        self.assertTrue(photo.thumbnail.storage.exists(photo.thumbnail.name))
+        self.assertEqual((photo.width, photo.height), (1200, 800))
+        self.assertTrue(photo.placeholder.startswith('data:image/jpeg;base64,'))
+
+    def test_new_image_gets_a_new_thumbnail(self):
+        photo = self.add_photo()
+        old_thumbnail = GalleryPhoto.objects.get(pk=photo.pk).thumbnail.name
+
+        photo.image = image_upload('sindoor.jpg')
+        with self.captureOnCommitCallbacks(execute=True):
+            photo.save()
+        photo.refresh_from_db()
+        self.assertEqual(photo.thumbnail.name, f'derivatives/{photo.image.name}/640.jpg')
+        self.assertFalse(photo.thumbnail.storage.exists(old_thumbnail))
+
+    def test_json_uses_the_original_until_processed(self):
+        url = reverse('durga:album_detail', args=[self.album.pk])
+        with mock.patch('durga.tasks.process_gallery_photo.delay'):
+            photo = self.add_photo()
+        data = self.client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest').json()['photos'][0]
+        self.assertEqual(data['thumbnail_url'], photo.image.url)
+        self.assertEqual(data['image_url'], photo.image.url)
+        self.assertEqual((data['width'], data['height'], data['placeholder']), (None, None, ''))
+
+        call_command('generate_photo_thumbnails', stdout=StringIO())
+        data = self.client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest').json()['photos'][0]
+        self.assertTrue(data['thumbnail_url'].endswith('/640.jpg'))
+        self.assertEqual((data['width'], data['height']), (1200, 800))
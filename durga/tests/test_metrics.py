@@ -0,0 +1,80 @@
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from durga import metrics
+from durga.db import run_concurrently
+from durga.models import Event
+
+
+class MetricsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def scrape(self, **extra):
+        return self.client.get(reverse('metrics'), REMOTE_ADDR='127.0.0.1', **extra)
+
+    def test_records_requests_queries_templates_and_cache(self):
+        self.client.get(reverse('durga:events'))
+        self.client.get(reverse('durga:events'))
+
+        body = self.scrape().content.decode()
+        self.assertIn('durga_http_requests_total{route="durga:events",method="GET",status="200"}', body)
+        self.assertIn('durga_http_request_duration_seconds_bucket{route="durga:events",le="+Inf"}', body)
+        self.assertIn('durga_db_queries_per_request_count{route="durga:events"}', body)
+        self.assertIn('durga_template_renders_total{route="durga:events"}', body)
+        self.assertIn('durga_http_response_size_bytes_sum{route="durga:events"}', body)
+        self.assertIn('durga_cache_requests_total{cache="page",result="hit"}', body)
+        self.assertIn('# TYPE durga_http_request_duration_seconds histogram', body)
+
+    def test_only_staff_or_localhost(self):
+        remote = {'REMOTE_ADDR': '203.0.113.5'}
+        self.assertEqual(self.client.get(reverse('metrics'), **remote).status_code, 403)
+        # Behind a local reverse proxy every request comes from 127.0.0.1
+        self.assertEqual(self.scrape(HTTP_X_FORWARDED_FOR='203.0.113.5').status_code, 403)
+        self.assertEqual(self.scrape().status_code, 200)
+
+        staff = User.objects.create_user('staff', password='x', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(reverse('metrics'), **remote).status_code, 200)
+
+    def test_counts_from_every_thread_are_summed(self):
+        labels = (('cache', 'test-threads'), ('result', 'hit'))
+
+        def record():
+            for _ in range(1000):
+                metrics.record_cache('test-threads', True)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        counters, _ = metrics._collect()
+        self.assertEqual(counters[('durga_cache_requests_total', labels)], 4000)
+
+
+class RequestQueryCountTests(TransactionTestCase):
+    """The fan-out threads need their own connections, so nothing may be left uncommitted"""
+
+    def test_fan_out_queries_are_all_counted(self):
+        def count_events():
+            for _ in range(50):
+                Event.objects.count()
+
+        async def view(request):
+            await run_concurrently(*[count_events] * 8)
+            return HttpResponse()
+
+        middleware = metrics.MetricsMiddleware(view)
+        with mock.patch.object(middleware, 'record') as record:
+            async_to_sync(middleware)(RequestFactory().get('/'))
+        self.assertEqual(record.call_args.args[2].queries, 8 * 50)
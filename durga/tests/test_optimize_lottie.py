@@ -0,0 +1,97 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from durga.management.commands.optimize_lottie import optimize
+
+
+def animation(**overrides):
+    opacity = {'a': 1, 'k': [
+        {'i': {'x': [0.667], 'y': [1]}, 'o': {'x': [0.333], 'y': [0]}, 't': 0, 's': [100]},
+        {'i': {'x': [0.667], 'y': [1]}, 'o': {'x': [0.333], 'y': [0]}, 't': 10, 's': [100]},
+        {'i': {'x': [0.667], 'y': [1]}, 'o': {'x': [0.333], 'y': [0]}, 't': 20, 's': [100]},
+        {'t': 30, 's': [0]},
+    ], 'ix': 11}
+    rotation = {'a': 1, 'k': [{'t': 0, 's': [45.123456]}, {'t': 30, 's': [45.123456]}], 'ix': 10}
+    data = {
+        'v': '5.7.4', 'fr': 60, 'ip': 0, 'op': 30, 'w': 100, 'h': 100, 'nm': 'Test',
+        'meta': {'g': 'LottieFiles AE'},
+        'assets': [{'id': 'comp_0', 'layers': []}, {'id': 'unused', 'layers': []}],
+        'layers': [
+            {'ind': 1, 'ty': 0, 'nm': 'Pre-comp', 'mn': 'ADBE Layer', 'refId': 'comp_0', 'hd': False,
+             'ks': {'o': opacity, 'r': rotation}},
+            {'ind': 2, 'ty': 4, 'nm': 'Hidden', 'hd': True, 'ks': {}},
+        ],
+    }
+    data.update(overrides)
+    return data
+
+
+class OptimizeLottieTests(SimpleTestCase):
+
+    def test_strips_editor_data_and_unused_content(self):
+        data = optimize(animation())
+        self.assertNotIn('meta', data)
+        self.assertEqual([asset['id'] for asset in data['assets']], ['comp_0'])
+        self.assertEqual([layer['ind'] for layer in data['layers']], [1])
+        self.assertEqual(data['layers'][0], {'ind': 1, 'ty': 0, 'refId': 'comp_0', 'ks': data['layers'][0]['ks']})
+
+    def test_simplifies_keyframes(self):
+        ks = optimize(animation())['layers'][0]['ks']
+        # Never changes, so no longer animated, and rounded
+        self.assertEqual(ks['r'], {'a': 0, 'k': 45.12})
+        # The constant run becomes one hold; the last segment keeps its easing
+        self.assertEqual(ks['o']['k'], [
+            {'t': 0, 's': [100], 'h': 1},
+            {'i': {'x': 0.67, 'y': 1}, 'o': {'x': 0.33, 'y': 0}, 't': 20, 's': [100]},
+            {'t': 30, 's': [0]},
+        ])
+
+    def test_keyframes_with_end_values(self):
+        # Before Lottie 5.5 each keyframe carries the value it animates to
+        position = {'a': 1, 'k': [
+            {'t': 0, 's': [0, 0], 'e': [50, 0], 'i': {'x': [1], 'y': [1]}, 'o': {'x': [0], 'y': [0]}},
+            {'t': 10, 's': [0, 0], 'e': [0, 0], 'i': {'x': [1], 'y': [1]}, 'o': {'x': [0], 'y': [0]}},
+            {'t': 20, 's': [0, 0]},
+        ]}
+        data = animation(v='5.1.0')
+        data['layers'][0]['ks']['p'] = position
+        keyframes = optimize(data)['layers'][0]['ks']['p']['k']
+        self.assertEqual(keyframes, [
+            {'t': 0, 's': [0, 0], 'e': [50, 0], 'i': {'x': 1, 'y': 1}, 'o': {'x': 0, 'y': 0}},
+            {'t': 10, 's': [0, 0], 'h': 1},
+            {'t': 20, 's': [0, 0]},
+        ])
+
+        # Equal start values with a different end value are still animated
+        data['layers'][0]['ks']['p'] = {'a': 1, 'k': [{'t': 0, 's': [0, 0], 'e': [50, 0]}, {'t': 10, 's': [0, 0]}]}
+        self.assertEqual(optimize(data)['layers'][0]['ks']['p']['a'], 1)
+
+    def test_expressions_keep_names(self):
+        data = animation()
+        data['layers'][0]['ks']['o']['x'] = 'var $bm_rt;\n$bm_rt = thisComp.layer("Pre-comp").opacity;'
+        layer = optimize(data)['layers'][0]
+        self.assertEqual(layer['nm'], 'Pre-comp')
+        self.assertEqual(layer['ks']['o']['ix'], 11)
+        self.assertNotIn('mn', layer)
+
+    def test_command_writes_minified_copy(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+        source = directory / 'swastika.json'
+        shutil.copy(Path(settings.BASE_DIR) / 'static' / 'images' / 'swastika.json', source)
+
+        out = StringIO()
+        call_command('optimize_lottie', str(source), repeat=1, stdout=out)
+        minified = directory / 'swastika.min.json'
+        original = json.loads(source.read_text())
+        optimized = json.loads(minified.read_text())
+        self.assertLess(minified.stat().st_size, source.stat().st_size)
+        self.assertEqual((optimized['op'], len(optimized['layers'])), (original['op'], len(original['layers'])))
+        self.assertIn('swastika.json', out.getvalue())
@@ -0,0 +1,166 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from durga.cache import event_boundaries, get_home_snapshot, get_site_context, get_versions, home_snapshot_key
+from durga.models import Event, SiteSettings
+
+
+class SiteContextTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings = SiteSettings.objects.create(site_title='দুর্গা মন্দির')
+
+    def test_cached_until_a_site_model_changes(self):
+        self.assertEqual(get_site_context()['site_settings'].site_title, 'দুর্গা মন্দির')
+        with self.assertNumQueries(0):
+            get_site_context()
+
+        self.settings.site_title = 'নতুন নাম'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings.save()
+        self.assertEqual(get_site_context()['site_settings'].site_title, 'নতুন নাম')
+
+
+class PageCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event = Event.objects.create(
+                title='সন্ধ্যা আরতি', description='...', location='মন্দির', date_time=self.now + timedelta(hours=1),
+            )
+        self.url = reverse('durga:events')
+
+    def get(self, url, at=None, **extra):
+        with mock.patch('django.utils.timezone.now', return_value=at or self.now):
+            return self.client.get(url, **extra)
+
+    def test_anonymous_pages_are_served_from_the_cache(self):
+        self.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertContains(self.get(self.url), 'সন্ধ্যা আরতি')
+
+    def test_query_string_is_part_of_the_key(self):
+        self.assertContains(self.get(self.url + '?filter=upcoming'), 'সন্ধ্যা আরতি')
+        self.assertNotContains(self.get(self.url + '?filter=past'), 'সন্ধ্যা আরতি')
+
+    def test_model_changes_invalidate_the_page(self):
+        self.get(self.url)
+        self.event.title = 'মহা অষ্টমী'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.assertContains(self.get(self.url), 'মহা অষ্টমী')
+
+    def test_versions_change_when_the_save_commits(self):
+        self.get(self.url)
+        versions = get_versions((Event,))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = 'মহা অষ্টমী'
+            self.event.save()
+            # Until the commit other requests read the old rows, so the old version must stay
+            self.assertEqual(get_versions((Event,)), versions)
+            self.assertContains(self.get(self.url), 'সন্ধ্যা আরতি')
+        self.assertNotEqual(get_versions((Event,)), versions)
+        self.assertContains(self.get(self.url), 'মহা অষ্টমী')
+
+    def test_rolled_back_changes_keep_the_version(self):
+        versions = get_versions((Event,))
+        with self.assertRaises(DatabaseError), self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.event.save()
+                raise DatabaseError
+        self.assertEqual(get_versions((Event,)), versions)
+
+    def test_logged_in_users_bypass_the_cache(self):
+        self.get(self.url)
+        self.client.force_login(User.objects.create_user('editor'))
+        with mock.patch('durga.cache._cached_page') as cached_page:
+            self.get(self.url)
+        cached_page.assert_not_called()
+
+    def test_events_move_to_past_when_they_start(self):
+        upcoming = self.url + '?filter=upcoming'
+        before = self.get(upcoming)
+        self.assertContains(before, 'সন্ধ্যা আরতি')
+
+        later = self.now + timedelta(hours=2)
+        self.assertNotContains(self.get(upcoming, at=later), 'সন্ধ্যা আরতি')
+        self.assertContains(self.get(self.url + '?filter=past', at=later), 'সন্ধ্যা আরতি')
+
+        # Neither validator of the earlier page still matches
+        self.assertEqual(self.get(upcoming, at=later, HTTP_IF_NONE_MATCH=before['ETag']).status_code, 200)
+        self.assertEqual(
+            self.get(upcoming, at=later, HTTP_IF_MODIFIED_SINCE=before['Last-Modified']).status_code, 200
+        )
+
+    def test_event_boundaries(self):
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            self.assertEqual(event_boundaries(), (None, self.event.date_time))
+        with mock.patch('django.utils.timezone.now', return_value=self.now + timedelta(hours=2)):
+            self.assertEqual(event_boundaries(), (self.event.date_time, None))
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings = SiteSettings.objects.create(site_title='দুর্গা মন্দির')
+        self.url = reverse('durga:committee')
+
+    def test_unchanged_pages_are_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304
+        )
+
+    def test_changes_and_deletes_change_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings.save()
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.settings.delete()
+        self.assertNotEqual(self.client.get(self.url)['ETag'], changed['ETag'])
+
+
+class HomeSnapshotTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def create_event(self, title):
+        return Event.objects.create(title=title, description='...', location='মন্দির', date_time=timezone.now())
+
+    def test_changes_queue_one_rebuild_per_commit(self):
+        get_home_snapshot()
+        with mock.patch('durga.tasks.rebuild_home_snapshot.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.create_event('মহা সপ্তমী')
+                self.create_event('মহা অষ্টমী')
+                # Requests before the commit still see the old rows
+                self.assertIsNotNone(cache.get(home_snapshot_key()))
+                delay.assert_not_called()
+        self.assertIsNone(cache.get(home_snapshot_key()))
+        delay.assert_called_once_with()
+
+    def test_snapshot_is_rebuilt_with_the_change(self):
+        get_home_snapshot()
+        with self.captureOnCommitCallbacks(execute=True):
+            event = self.create_event('মহা নবমী')
+        self.assertEqual(cache.get(home_snapshot_key())['upcoming_events'], [event])
+        with self.assertNumQueries(0):
+            get_home_snapshot()
@@ -0,0 +1,69 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from durga.models import GalleryAlbum, GalleryPhoto
+from durga.pagination import decode_cursor, encode_cursor
+from durga.views import PHOTOS_PER_PAGE
+
+
+def token(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip('=')
+
+
+class KeysetPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.album = GalleryAlbum.objects.create(title='মহা অষ্টমী')
+        GalleryPhoto.objects.bulk_create(
+            GalleryPhoto(album=cls.album, title=f'ছবি {i}', image=f'albums/photos/{i}.jpg')
+            for i in range(PHOTOS_PER_PAGE * 2 + 5)
+        )
+        # Uploaded in bursts: many photos share a created_at
+        start = timezone.now()
+        for photo in GalleryPhoto.objects.all():
+            GalleryPhoto.objects.filter(pk=photo.pk).update(created_at=start + timedelta(seconds=photo.pk % 3))
+        cls.expected = list(GalleryPhoto.objects.order_by('created_at', 'id').values_list('id', flat=True))
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('durga:album_detail', args=[self.album.pk])
+
+    def get_page(self, **params):
+        return self.client.get(self.url, params, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    def test_scrolls_through_every_photo_once(self):
+        seen, pages, params = [], [], {}
+        while True:
+            data = self.get_page(**params).json()
+            seen += [photo['id'] for photo in data['photos']]
+            pages.append(len(data['photos']))
+            if not data['has_next']:
+                break
+            params = {'cursor': data['next_cursor']}
+
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(pages, [PHOTOS_PER_PAGE, PHOTOS_PER_PAGE, 5])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_last_full_page_has_no_next_cursor(self):
+        GalleryPhoto.objects.filter(pk__in=self.expected[PHOTOS_PER_PAGE:]).delete()
+        data = self.get_page().json()
+        self.assertEqual(len(data['photos']), PHOTOS_PER_PAGE)
+        self.assertFalse(data['has_next'])
+        self.assertIsNone(data['next_cursor'])
+
+    def test_tampered_cursors_are_rejected(self):
+        for cursor in ['', 'not a cursor', token(['yesterday', 1]), token(['2025-10-01T10:00:00', 'x']), token([1])]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.get_page(cursor=cursor).status_code, 400)
+
+    def test_cursor_round_trip(self):
+        photo = GalleryPhoto.objects.get(pk=self.expected[0])
+        self.assertEqual(decode_cursor(encode_cursor(photo)), (photo.created_at, photo.pk))
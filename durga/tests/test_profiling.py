@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.template.base import Template
+from django.test import TestCase
+from django.urls import reverse
+
+from durga import profiling
+from durga.models import ProfileReport
+
+
+class ProfilingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_staff_get_a_stored_report(self):
+        self.client.force_login(User.objects.create_user('staff', is_staff=True, is_superuser=True))
+        response = self.client.get(reverse('durga:events'), {'__profile': 1})
+
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        report = ProfileReport.objects.get(pk=response['X-Profile-Report'])
+        self.assertEqual(report.view, 'durga:events')
+        self.assertGreater(report.query_count, 0)
+        self.assertIn('durga_mondir/events.html', report.report)
+        self.assertIn('Top functions', report.report)
+        # The template hook is removed once the request is done
+        self.assertIs(Template._render, profiling._original_render)
+
+        download = self.client.get(reverse('admin:durga_profilereport_stats', args=[report.pk]))
+        self.assertEqual(bytes(report.stats), download.content)
+
+    def test_flag_is_ignored_for_anonymous_users(self):
+        response = self.client.get(reverse('durga:events'), {'__profile': 1})
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        self.assertFalse(ProfileReport.objects.exists())
+        self.assertEqual(self.client.get(reverse('admin:durga_profilereport_stats', args=[1])).status_code, 302)
@@ -0,0 +1,121 @@
+"""
+Per-view query and render-time budgets.
+
+Each public URL is requested against a scaled dataset, first with an empty
+cache and then again warm, and must stay within its budget. A template that
+starts lazily loading a relation per row blows the query budget long before
+anyone notices it in production.
+
+Render budgets are wall-clock and generous; set DURGA_PERF_BUDGET_SCALE to
+stretch them on slow machines.
+"""
+import os
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from durga.urls import urlpatterns
+from .data import create_scaled_dataset
+
+# url name (or variant): (cold queries, warm queries, cold render ms)
+BUDGETS = {
+    'home': (18, 0, 250),
+    'page_detail': (7, 0, 150),
+    'events': (11, 0, 200),
+    'events_calendar': (5, 0, 150),
+    'gallery': (10, 0, 200),
+    'album_detail': (10, 2, 200),
+    'album_detail_json': (7, 2, 150),
+    'committee': (8, 0, 250),
+    'durga_sangha': (8, 0, 250),
+    'contact': (3, 0, 150),
+    'contact_post': (4, 1, 150),
+}
+
+# Cached responses are served without rendering
+WARM_RENDER_MS = 50
+
+BUDGET_SCALE = float(os.environ.get('DURGA_PERF_BUDGET_SCALE', 1))
+
+
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.album = create_scaled_dataset()
+
+    def setUp(self):
+        cache.clear()
+
+    def request(self, method, url, data=None, **extra):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = getattr(self.client, method)(url, data, **extra)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), elapsed_ms
+
+    def assertWithinBudget(self, budget, method, url, data=None, **extra):
+        max_queries, max_warm_queries, max_ms = BUDGETS[budget]
+
+        for phase, query_budget, ms_budget in (
+            ('cold', max_queries, max_ms),
+            ('warm', max_warm_queries, WARM_RENDER_MS),
+        ):
+            queries, elapsed_ms = self.request(method, url, data, **extra)
+            self.assertLessEqual(queries, query_budget, f'{budget} ({phase}): {queries} queries')
+            self.assertLessEqual(elapsed_ms, ms_budget * BUDGET_SCALE,
+                                 f'{budget} ({phase}): rendered in {elapsed_ms:.0f} ms')
+
+    def test_every_url_has_a_budget(self):
+        for pattern in urlpatterns:
+            self.assertIn(pattern.name, BUDGETS)
+
+    def test_home(self):
+        self.assertWithinBudget('home', 'get', reverse('durga:home'))
+
+    def test_page_detail(self):
+        self.assertWithinBudget('page_detail', 'get', reverse('durga:page_detail', args=['page-0']))
+
+    def test_events(self):
+        self.assertWithinBudget('events', 'get', reverse('durga:events'))
+
+    def test_events_calendar(self):
+        today = timezone.localdate()
+        self.assertWithinBudget('events_calendar', 'get', reverse('durga:events_calendar'), {
+            'start': today.isoformat(),
+            'end': (today + timedelta(days=42)).isoformat(),
+        })
+
+    def test_gallery(self):
+        self.assertWithinBudget('gallery', 'get', reverse('durga:gallery'))
+
+    def test_album_detail(self):
+        self.assertWithinBudget('album_detail', 'get', reverse('durga:album_detail', args=[self.album.pk]))
+
+    def test_album_detail_json(self):
+        self.assertWithinBudget('album_detail_json', 'get', reverse('durga:album_detail', args=[self.album.pk]),
+                                headers={'X-Requested-With': 'XMLHttpRequest'})
+
+    def test_committee(self):
+        self.assertWithinBudget('committee', 'get', reverse('durga:committee'))
+
+    def test_durga_sangha(self):
+        self.assertWithinBudget('durga_sangha', 'get', reverse('durga:durga_sangha'))
+
+    def test_contact(self):
+        self.assertWithinBudget('contact', 'get', reverse('durga:contact'))
+
+    def test_contact_post(self):
+        self.assertWithinBudget('contact_post', 'post', reverse('durga:contact'), {
+            'name': 'দর্শনার্থী',
+            'email': 'visitor@example.com',
+            'subject': 'পূজার সময়',
+            'message': 'অষ্টমীর অঞ্জলি কখন?',
+        })
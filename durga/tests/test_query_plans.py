@@ -0,0 +1,113 @@
+"""
+Query-plan regression tests.
+
+Every SELECT a public view issues is re-run under EXPLAIN against a scaled
+dataset. A query that both scans a whole table and sorts the result means an
+index on that filter/order path is missing or no longer matches the query.
+"""
+import re
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from durga.pagination import encode_cursor
+from .data import create_scaled_dataset
+
+# SQLite: "SCAN durga_event" without "USING [COVERING] INDEX"
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+SQLITE_SORT = re.compile(r'USE TEMP B-TREE FOR (RIGHT PART OF )?ORDER BY')
+POSTGRES_FULL_SCAN = re.compile(r'Seq Scan on (\w+)')
+POSTGRES_SORT = re.compile(r'^\s*(->\s+)?Sort\s+\(', re.MULTILINE)
+
+# Singleton tables (site settings, donation info) are cheaper to sort than
+# to index, and the planner rightly does so
+SMALL_TABLE_ROWS = 100
+
+
+def explain(sql):
+    """Return (plan text, full-scan tables, sorts) for a captured query"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            details = [row[-1] for row in cursor.fetchall()]
+            scans = [m.group(1) for m in map(SQLITE_FULL_SCAN.match, details) if m]
+            sorts = [detail for detail in details if SQLITE_SORT.search(detail)]
+            plan = '\n'.join(details)
+        else:
+            cursor.execute('EXPLAIN ' + sql)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+            scans = POSTGRES_FULL_SCAN.findall(plan)
+            sorts = POSTGRES_SORT.findall(plan)
+    return plan, scans, sorts
+
+
+class QueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.album = create_scaled_dataset()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            cls.table_rows = {}
+            for table in connection.introspection.table_names(cursor):
+                cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                cls.table_rows[table] = cursor.fetchone()[0]
+
+    def setUp(self):
+        # Cached pages and the home snapshot would hide the queries
+        cache.clear()
+
+    def assertIndexedPlans(self, url, params=None, **extra):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params, **extra)
+        self.assertEqual(response.status_code, 200)
+
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertTrue(selects, f'{url} issued no queries')
+        for sql in selects:
+            plan, scans, sorts = explain(sql)
+            scans = [table for table in scans if self.table_rows.get(table, SMALL_TABLE_ROWS) >= SMALL_TABLE_ROWS]
+            if scans and sorts:
+                self.fail(f'{url}: full scan of {", ".join(scans)} plus sort\n{sql}\n{plan}')
+
+    def test_home(self):
+        self.assertIndexedPlans(reverse('durga:home'))
+
+    def test_page_detail(self):
+        self.assertIndexedPlans(reverse('durga:page_detail', args=['page-0']))
+
+    def test_events(self):
+        for filter_type in ('all', 'upcoming', 'past'):
+            with self.subTest(filter=filter_type):
+                self.assertIndexedPlans(reverse('durga:events'), {'filter': filter_type, 'page': 3})
+
+    def test_events_calendar(self):
+        today = timezone.localdate()
+        self.assertIndexedPlans(reverse('durga:events_calendar'), {
+            'start': today.isoformat(),
+            'end': (today + timedelta(days=42)).isoformat(),
+        })
+
+    def test_gallery(self):
+        self.assertIndexedPlans(reverse('durga:gallery'), {'page': 5})
+
+    def test_album_detail(self):
+        url = reverse('durga:album_detail', args=[self.album.pk])
+        self.assertIndexedPlans(url)
+
+        photo = self.album.photos.order_by('created_at', 'id')[500]
+        self.assertIndexedPlans(url, {'cursor': encode_cursor(photo)}, headers={'X-Requested-With': 'XMLHttpRequest'})
+
+    def test_contact(self):
+        self.assertIndexedPlans(reverse('durga:contact'))
+
+    def test_committee(self):
+        self.assertIndexedPlans(reverse('durga:committee'))
+
+    def test_durga_sangha(self):
+        self.assertIndexedPlans(reverse('durga:durga_sangha'))
@@ -0,0 +1,94 @@
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+
+from durga.cache import bump_version
+from durga.models import Contact, Page, ProfileReport, SlowQuery
+from durga.routers import RECENT_CHANGE_KEY, STICKY_COOKIE, PrimaryReplicaRouter, ReplicaRoutingMiddleware
+
+router = PrimaryReplicaRouter()
+
+
+def route(request, model=Page, before=None):
+    """Return (read alias chosen for model inside the request, response)"""
+    chosen = []
+
+    def get_response(request):
+        if before:
+            before()
+        chosen.append(router.db_for_read(model))
+        return HttpResponse()
+
+    response = ReplicaRoutingMiddleware(get_response)(request)
+    return chosen[0], response
+
+
+# TestCase would wrap every test in a transaction, which always reads from the primary
+@override_settings(DATABASE_REPLICAS=['replica1'], DATABASE_REPLICA_LAG=10)
+class ReplicaRoutingTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_public_get_reads_from_a_replica(self):
+        alias, response = route(self.factory.get('/events/'))
+        self.assertEqual(alias, 'replica1')
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_posts_admin_and_sessions_use_the_primary(self):
+        self.assertIsNone(route(self.factory.post('/contact/'))[0])
+        self.assertIsNone(route(self.factory.get('/admin/durga/page/'))[0])
+        self.assertIsNone(route(self.factory.get('/events/'), model=Session)[0])
+
+    def test_reads_after_a_write_stick_to_the_primary(self):
+        alias, response = route(self.factory.post('/contact/'), before=lambda: router.db_for_write(Contact))
+        self.assertIsNone(alias)
+        self.assertEqual(response.cookies[STICKY_COOKIE]['max-age'], 10)
+
+        request = self.factory.get('/events/')
+        request.COOKIES[STICKY_COOKIE] = '1'
+        self.assertIsNone(route(request)[0])
+
+    def test_content_changes_pause_replica_reads(self):
+        bump_version(Page)
+        self.assertTrue(cache.get(RECENT_CHANGE_KEY))
+        self.assertIsNone(route(self.factory.get('/events/'))[0])
+
+        cache.delete(RECENT_CHANGE_KEY)
+        self.assertEqual(route(self.factory.get('/events/'))[0], 'replica1')
+
+    def test_private_changes_keep_replica_reads(self):
+        for model in (Contact, SlowQuery, ProfileReport):
+            bump_version(model)
+        self.assertIsNone(cache.get(RECENT_CHANGE_KEY))
+        self.assertEqual(route(self.factory.get('/events/'))[0], 'replica1')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertIs(router.allow_migrate('replica1', 'durga'), False)
+        self.assertIsNone(router.allow_migrate('default', 'durga'))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        alias, response = route(self.factory.post('/contact/'), before=lambda: router.db_for_write(Contact))
+        self.assertIsNone(alias)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+        self.assertIsNone(route(self.factory.get('/events/'))[0])
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaTransactionTests(TransactionTestCase):
+
+    def test_reads_inside_a_transaction_use_the_primary(self):
+        cache.clear()
+        with transaction.atomic():
+            alias, _ = route(RequestFactory().get('/events/'))
+        self.assertEqual(alias, 'default')
+
+    def test_contact_messages_do_not_pin_reads_to_the_primary(self):
+        cache.clear()
+        Contact.objects.create(name='অতিথি', email='guest@example.com', subject='পূজা', message='...')
+        self.assertIsNone(cache.get(RECENT_CHANGE_KEY))
+        self.assertEqual(route(RequestFactory().get('/events/'))[0], 'replica1')
@@ -0,0 +1,31 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from durga import slow_queries
+from durga.models import SlowQuery
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_FLUSH_INTERVAL=0)
+class SlowQueryTests(TestCase):
+
+    def setUp(self):
+        slow_queries._pending.clear()
+
+    def test_fingerprint_groups_values(self):
+        self.assertEqual(
+            slow_queries.fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  LIMIT 21"),
+            'SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?',
+        )
+
+    def test_queries_are_aggregated_per_view(self):
+        url = reverse('durga:events')
+        self.client.get(url)
+        self.client.get(url, {'page': 2})
+
+        rows = SlowQuery.objects.filter(view='durga:events')
+        self.assertTrue(rows.exists())
+        self.assertEqual(rows.values('fingerprint_hash').distinct().count(), rows.count())
+        row = rows.order_by('-count').first()
+        self.assertGreaterEqual(row.count, 2)
+        self.assertGreaterEqual(row.total_time, row.max_time)
+        self.assertNotIn('%s', row.fingerprint)
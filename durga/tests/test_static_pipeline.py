@@ -0,0 +1,53 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import Client, SimpleTestCase, override_settings
+
+LOTTIE = 'images/swastika.json'
+
+
+class StaticPipelineTests(SimpleTestCase):
+
+    def setUp(self):
+        source, static_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source)
+        self.addCleanup(shutil.rmtree, static_root)
+        (Path(source) / 'images').mkdir()
+        shutil.copy(Path(settings.BASE_DIR) / 'static' / LOTTIE, Path(source) / LOTTIE)
+
+        # Only the one Lottie file, so collectstatic stays fast
+        self.enterContext(override_settings(
+            STATIC_ROOT=static_root,
+            STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STORAGES={
+                **settings.STORAGES,
+                'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+            },
+        ))
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_serves_hashed_precompressed_immutable_files(self):
+        url = static(LOTTIE)
+        self.assertRegex(url, r'/images/swastika\.[0-9a-f]{12}\.json$')
+
+        client = Client()
+        brotli = client.get(url, HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(brotli['Content-Encoding'], 'br')
+        self.assertIn('immutable', brotli['Cache-Control'])
+        self.assertEqual(brotli['Vary'], 'Accept-Encoding')
+        self.assertEqual(client.get(url, HTTP_ACCEPT_ENCODING='gzip')['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Encoding', client.get(url))
+
+    def test_report_lists_bytes_saved(self):
+        out = StringIO()
+        call_command('static_compression_report', stdout=out)
+        row = next(line for line in out.getvalue().splitlines() if line.startswith(LOTTIE))
+        original, gzip_size, brotli_size, saved = (int(value.replace(',', '')) for value in row.split()[1:5])
+        self.assertLess(brotli_size, gzip_size)
+        self.assertEqual(saved, original - brotli_size)
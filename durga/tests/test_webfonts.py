@@ -0,0 +1,135 @@
+import json
+import shutil
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+
+from durga.management.commands.subset_webfonts import matching_weight
+from durga.models import CommitteeMember
+from durga.webfonts import FACES_CHECK_INTERVAL, GOOGLE_FONTS_URL, clear_font_faces, font_faces
+
+# A few Latin and Bengali letters plus ones no page uses
+CHARACTERS = 'abcকখগ€Ж'
+
+
+def build_font(path, weight):
+    names = ['.notdef'] + [f'uni{ord(character):04X}' for character in CHARACTERS]
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(names)
+    builder.setupCharacterMap({ord(character): f'uni{ord(character):04X}' for character in CHARACTERS})
+    glyphs = {}
+    for name in names:
+        pen = TTGlyphPen(None)
+        pen.moveTo((0, 0))
+        pen.lineTo((0, 500))
+        pen.lineTo((500, 500))
+        pen.closePath()
+        glyphs[name] = pen.glyph()
+    builder.setupGlyf(glyphs)
+    builder.setupHorizontalMetrics({name: (600, 0) for name in names})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({'familyName': 'Test', 'styleName': str(weight)})
+    builder.setupOS2(usWeightClass=weight)
+    builder.setupPost()
+    builder.save(path)
+
+
+class MatchingWeightTests(TestCase):
+
+    def test_follows_the_css_matching_rules(self):
+        available = {300, 400, 600}
+        self.assertEqual(matching_weight(500, available), 400)
+        self.assertEqual(matching_weight(700, available), 600)
+        self.assertEqual(matching_weight(900, available), 600)
+        self.assertEqual(matching_weight(200, available), 300)
+
+
+class SubsetWebfontsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.source, self.static = Path(tempfile.mkdtemp()), Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.static)
+        for weight in (300, 400, 600):
+            build_font(self.source / f'Test-{weight}.ttf', weight)
+        self.enterContext(override_settings(STATICFILES_DIRS=[self.static, *settings.STATICFILES_DIRS]))
+        clear_font_faces()
+        self.addCleanup(clear_font_faces)
+
+    def subset(self, *args):
+        call_command('subset_webfonts', *args, source=str(self.source), output_dir=str(self.static),
+                     stdout=StringIO())
+
+    def test_writes_used_weights_as_woff2_subsets(self):
+        self.subset()
+
+        manifest = json.loads((self.static / 'fonts' / 'hind-siliguri.json').read_text())
+        # Bootstrap's .lead needs 300; 500 falls back to 400, 700 and up to 600
+        self.assertEqual([(face['weight'], face['preload']) for face in manifest['faces']],
+                         [(300, False), (400, True), (600, True)])
+        font = TTFont(self.static / 'fonts' / 'hind-siliguri-400.woff2')
+        self.assertEqual(font.flavor, 'woff2')
+        self.assertEqual({chr(code) for code in font.getBestCmap()}, set('abcকখগ'))
+
+    def test_base_template_preloads_the_subsets(self):
+        self.assertContains(self.client.get(reverse('durga:home')), GOOGLE_FONTS_URL.replace('&', '&amp;'))
+
+        self.subset()
+        cache.clear()
+        response = self.client.get(reverse('durga:home'))
+        self.assertNotContains(response, 'fonts.googleapis.com')
+        self.assertContains(response, '<link rel="preload" href="/static/fonts/hind-siliguri-400.woff2" '
+                                      'as="font" type="font/woff2" crossorigin>', html=False)
+        self.assertContains(response, "font-weight:600;font-display:swap;"
+                                      "src:url('/static/fonts/hind-siliguri-600.woff2') format('woff2')")
+
+    def test_check_reports_new_characters(self):
+        self.subset()
+        self.subset('--check')
+
+        CommitteeMember.objects.create(name='Ж', position='সদস্য')
+        with self.assertRaisesMessage(CommandError, '1 characters are not in the subsets: Ж'):
+            self.subset('--check')
+
+    def test_rebuilt_fonts_are_looked_up_again(self):
+        self.subset()
+        self.assertEqual(len(font_faces()), 3)
+        (self.source / 'Test-300.ttf').unlink()
+        self.subset()
+        self.assertEqual(len(font_faces()), 2)
+
+    def test_renders_do_not_look_the_fonts_up(self):
+        self.subset()
+        with mock.patch('durga.webfonts.finders.find', wraps=finders.find) as find:
+            for _ in range(3):
+                font_faces()
+            self.assertEqual(find.call_count, 1)
+            with mock.patch('time.monotonic', return_value=time.monotonic() + FACES_CHECK_INTERVAL):
+                font_faces()
+            self.assertEqual(find.call_count, 2)
+
+    def test_falls_back_until_collectstatic_has_run(self):
+        self.subset()
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        storages = {**settings.STORAGES, 'staticfiles': {
+            'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+        }}
+        with override_settings(STORAGES=storages, STATIC_ROOT=static_root):
+            clear_font_faces()
+            self.assertIsNone(font_faces())
+            self.assertIn('fonts.googleapis.com', Template('{% load webfonts %}{% webfonts %}').render(Context()))
@@ -6,6 +6,7 @@ app_name = 'durga'
 urlpatterns = [
     path('', views.home, name='home'),
     path('events/', views.events, name='events'),
+    path('events/calendar/', views.events_calendar, name='events_calendar'),
     path('gallery/', views.gallery_view, name='gallery'),
     path('album/<int:album_id>/', views.album_detail, name='album_detail'),
     path('committee/', views.committee, name='committee'),
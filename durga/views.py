@@ -2,109 +2,75 @@ from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
 from django.db.models import Q
 from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.text import Truncator
+from collections import OrderedDict
+from datetime import datetime, timedelta
 import re
 from .models import (
-    Page, Event, Gallery, Contact, SiteSettings, Slider,
-    GalleryAlbum, GalleryPhoto, CommitteeMember, DurgaSangha, DurgaPujaCountdown, PujaDay, DonationInfo
+    Page, Event, Contact, GalleryAlbum, GalleryPhoto, CommitteeMember, DurgaSangha
+)
+from .pagination import ChainedQuerySets, decode_cursor, keyset_page
+from .cache import (
+    get_site_context, get_home_snapshot, cache_public_page, conditional_public_page, event_boundaries,
+    HOME_SNAPSHOT_MODELS
 )
 
-def get_site_context():
-    """Get common site context for all views"""
-    try:
-        site_settings = SiteSettings.objects.first()
-    except SiteSettings.DoesNotExist:
-        site_settings = None
-    
-    menu_pages = Page.objects.filter(show_in_menu=True, is_published=True).order_by('menu_order')
-    
-    # Get active countdown for all pages
-    countdown = DurgaPujaCountdown.objects.filter(is_active=True).first()
-    
-    # Convert countdown days to Bengali
-    countdown_days_bangla = None
-    if countdown and countdown.is_countdown_active():
-        days = countdown.days_remaining()
-        # Convert to Bengali digits
-        bangla_digits = {'0': '০', '1': '১', '2': '২', '3': '৩', '4': '৪', 
-                        '5': '৫', '6': '৬', '7': '৭', '8': '৮', '9': '৯'}
-        countdown_days_bangla = ''.join(bangla_digits.get(d, d) for d in str(days))
-    
-    return {
-        'site_settings': site_settings,
-        'menu_pages': menu_pages,
-        'countdown': countdown,
-        'countdown_days_bangla': countdown_days_bangla,
-    }
+PHOTOS_PER_PAGE = 20  # photos per infinite scroll load
 
+# Calendar feed: a month view spans at most six weeks
+CALENDAR_MAX_RANGE = timedelta(days=62)
+CALENDAR_MAX_AGE = 60 * 5
+
+CONTACT_SUCCESS_MESSAGE = 'আপনার বার্তা সফলভাবে পাঠানো হয়েছে!'
+
+@conditional_public_page(*HOME_SNAPSHOT_MODELS)
+@cache_public_page(*HOME_SNAPSHOT_MODELS)
 def home(request):
     context = get_site_context()
     
-    # Get slider items
-    slider_items = Slider.objects.filter(is_active=True).order_by('order')[:5]
-    
-    # Get featured content for homepage
-    upcoming_events = Event.objects.filter(is_active=True).order_by('date_time')[:3]
-    featured_gallery = Gallery.objects.filter(is_featured=True)[:6]
-    
-    # Get active countdown
-    countdown = DurgaPujaCountdown.objects.filter(is_active=True).first()
-    
-    # Get gallery albums for showcase
-    featured_albums = GalleryAlbum.objects.filter(is_featured=True)[:4]
-    
-    # Get puja days
-    puja_days = PujaDay.objects.filter(is_active=True).order_by('order', 'date')[:6]
-    
-    # Get donation info
-    donation_info = DonationInfo.objects.filter(is_active=True).first()
-    
-    context.update({
-        'slider_items': slider_items,
-        'upcoming_events': upcoming_events,
-        'donation_info': donation_info,
-        'featured_gallery': featured_gallery,
-        'countdown': countdown,
-        'featured_albums': featured_albums,
-        'puja_days': puja_days,
-    })
+    # Slider, events, albums, puja days and donation info come from one
+    # precomputed snapshot; the countdown is already in the site context
+    context.update(get_home_snapshot())
     
     return render(request, 'durga_mondir/home.html', context)
 
+@conditional_public_page()
+@cache_public_page()
 def page_detail(request, slug):
-    page = get_object_or_404(Page, slug=slug, is_published=True)
+    page = get_object_or_404(Page.objects.select_related('author'), slug=slug, is_published=True)
     context = get_site_context()
     context['page'] = page
     return render(request, 'durga_mondir/page_detail.html', context)
 
 
 
+@conditional_public_page(Event, boundaries=event_boundaries)
+@cache_public_page(Event, boundaries=event_boundaries)
 def events(request):
-    from django.utils import timezone
-    from django.db.models import Case, When, Value, IntegerField
-    
     context = get_site_context()
     
     now = timezone.now()
-    
-    # Get all events and order by upcoming first, then by date
-    # Upcoming events in ascending order (nearest first)
-    # Past events in descending order (most recent first)
-    all_events = Event.objects.filter(is_active=True).annotate(
-        is_upcoming_int=Case(
-            When(date_time__gt=now, then=Value(0)),  # Upcoming = 0 (comes first)
-            default=Value(1),  # Past = 1 (comes later)
-            output_field=IntegerField(),
-        )
-    ).order_by('is_upcoming_int', 'date_time')
+    active_events = Event.objects.filter(is_active=True)
+    upcoming_events = active_events.filter(date_time__gt=now).order_by('date_time')
     
     # Filter upcoming/past events for list view
     filter_type = request.GET.get('filter', 'all')
-    event_list = all_events
     
     if filter_type == 'upcoming':
-        event_list = event_list.filter(date_time__gt=now)
+        event_list = upcoming_events
     elif filter_type == 'past':
-        event_list = event_list.filter(date_time__lt=now).order_by('-date_time')
+        event_list = active_events.filter(date_time__lt=now).order_by('-date_time')
+    else:
+        # Upcoming events first (nearest first), then past events by date.
+        # Chaining two date-ordered querysets keeps both on the
+        # (date_time) WHERE is_active index instead of a CASE sort.
+        event_list = ChainedQuerySets(
+            upcoming_events,
+            active_events.filter(date_time__lte=now).order_by('date_time'),
+        )
     
     # Pagination for list view
     paginator = Paginator(event_list, 6)  # Show 6 events per page
@@ -118,6 +84,64 @@ def events(request):
     
     return render(request, 'durga_mondir/events.html', context)
 
+def _parse_calendar_bound(value):
+    """Parse a FullCalendar start/end parameter (ISO date or datetime)"""
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            parsed_date = parse_date(value)
+            if parsed_date is None:
+                return None
+            parsed = datetime.combine(parsed_date, datetime.min.time())
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+def calendar_queryset(request):
+    """Active events between ?start= and ?end=, or None if the range is invalid"""
+    start = _parse_calendar_bound(request.GET.get('start'))
+    end = _parse_calendar_bound(request.GET.get('end'))
+    if start is None or end is None or not start < end <= start + CALENDAR_MAX_RANGE:
+        return None
+    
+    # Served from the (date_time) WHERE is_active index
+    return Event.objects.filter(
+        is_active=True, date_time__gte=start, date_time__lt=end
+    ).order_by('date_time').only('id', 'title', 'description', 'date_time', 'location', 'featured_image')
+
+@conditional_public_page(Event)
+@cache_public_page(Event)
+def events_calendar(request):
+    """JSON feed of active events between ?start= and ?end= for the calendar view"""
+    calendar_events = calendar_queryset(request)
+    if calendar_events is None:
+        return JsonResponse({'error': 'Invalid start/end range'}, status=400)
+    
+    events_data = [calendar_event_data(event) for event in calendar_events]
+    
+    response = JsonResponse(events_data, safe=False)
+    patch_cache_control(response, public=True, max_age=CALENDAR_MAX_AGE)
+    return response
+
+def calendar_event_data(event):
+    """One event as the calendar feed serialises it"""
+    local_time = timezone.localtime(event.date_time)
+    return {
+        'id': event.id,
+        'title': event.title,
+        'start': local_time.strftime('%Y-%m-%d'),
+        'datetime': local_time.strftime('%Y-%m-%d %H:%M'),
+        'location': event.location,
+        'description': Truncator(event.description).words(40),
+        'image': event.featured_image.url if event.featured_image else '',
+    }
+
+@conditional_public_page(GalleryAlbum, GalleryPhoto)
+@cache_public_page(GalleryAlbum, GalleryPhoto)
 def gallery_view(request):
     context = get_site_context()
     
@@ -135,110 +159,114 @@ def gallery_view(request):
     
     return render(request, 'durga_mondir/gallery.html', context)
 
+@conditional_public_page(GalleryAlbum, GalleryPhoto)
 def album_detail(request, album_id):
     """Album detail view with infinite scroll for photos"""
-    context = get_site_context()
     album = get_object_or_404(GalleryAlbum, id=album_id)
     
-    # Get photos for this album
-    photos = album.photos.all().order_by('created_at')
-    
     # For AJAX requests (infinite scroll)
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        page = int(request.GET.get('page', 1))
-        paginator = Paginator(photos, 20)  # 20 photos per load
-        photos_page = paginator.get_page(page)
-        
-        from django.http import JsonResponse
+        cursor = decode_cursor(request.GET.get('cursor', ''))
+        if cursor is None and 'cursor' in request.GET:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        photos_page, next_cursor = keyset_page(album.photos.all(), cursor, PHOTOS_PER_PAGE)
         
-        photos_data = []
-        for photo in photos_page:
-            photos_data.append({
-                'id': photo.id,
-                'title': photo.title,
-                'image_url': photo.image.url,
-                'description': photo.description or '',
-            })
-        
-        return JsonResponse({
-            'photos': photos_data,
-            'has_next': photos_page.has_next(),
-            'next_page': photos_page.next_page_number() if photos_page.has_next() else None
-        })
+        return photos_response(photos_page, next_cursor)
     
     # Initial page load - first 20 photos
-    paginator = Paginator(photos, 20)
-    photos_page = paginator.get_page(1)
+    context = get_site_context()
+    photos_page, next_cursor = keyset_page(album.photos.all(), None, PHOTOS_PER_PAGE)
     
     context.update({
         'album': album,
         'photos': photos_page,
+        'next_cursor': next_cursor,
     })
     
     return render(request, 'durga_mondir/album_detail.html', context)
 
+def photos_response(photos_page, next_cursor):
+    """Infinite scroll JSON for one page of album photos"""
+    photos_data = []
+    for photo in photos_page:
+        photos_data.append({
+            'id': photo.id,
+            'title': photo.title,
+            'image_url': photo.image.url,
+            'thumbnail_url': photo.thumbnail.url if photo.thumbnail else photo.image.url,
+            'width': photo.width,
+            'height': photo.height,
+            'placeholder': photo.placeholder,
+            'description': photo.description or '',
+        })
+    
+    return JsonResponse({
+        'photos': photos_data,
+        'has_next': next_cursor is not None,
+        'next_cursor': next_cursor,
+    })
+
+def contact_message(request):
+    """Unsaved Contact from the submitted contact form"""
+    return Contact(
+        name=request.POST.get('name'),
+        email=request.POST.get('email'),
+        phone=request.POST.get('phone', ''),
+        subject=request.POST.get('subject'),
+        message=request.POST.get('message')
+    )
+
 def contact(request):
     context = get_site_context()
     
     if request.method == 'POST':
         # Handle contact form submission
-        contact_form = Contact(
-            name=request.POST.get('name'),
-            email=request.POST.get('email'),
-            phone=request.POST.get('phone', ''),
-            subject=request.POST.get('subject'),
-            message=request.POST.get('message')
-        )
-        contact_form.save()
+        contact_message(request).save()
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            return JsonResponse({'success': True, 'message': 'আপনার বার্তা সফলভাবে পাঠানো হয়েছে!'})
+            return JsonResponse({'success': True, 'message': CONTACT_SUCCESS_MESSAGE})
         else:
-            context['success_message'] = 'আপনার বার্তা সফলভাবে পাঠানো হয়েছে!'
+            context['success_message'] = CONTACT_SUCCESS_MESSAGE
     
     return render(request, 'durga_mondir/contact.html', context)
 
+def group_by_category(members):
+    """Group members by category dynamically while preserving order"""
+    members_by_category = OrderedDict()
+    for member in members:
+        category = member.category
+        if category not in members_by_category:
+            members_by_category[category] = []
+        members_by_category[category].append(member)
+    return members_by_category
+
+@conditional_public_page(CommitteeMember)
+@cache_public_page(CommitteeMember)
 def committee(request):
     """Committee members view"""
-    from collections import OrderedDict
     context = get_site_context()
     
     # Get all active committee members ordered by category_order, then member order
     all_members = CommitteeMember.objects.filter(is_active=True).order_by('category_order', 'order', 'name')
     
-    # Group members by category dynamically while preserving order
-    members_by_category = OrderedDict()
-    for member in all_members:
-        category = member.category
-        if category not in members_by_category:
-            members_by_category[category] = []
-        members_by_category[category].append(member)
-    
     context.update({
-        'members_by_category': members_by_category,
+        'members_by_category': group_by_category(all_members),
     })
     
     return render(request, 'durga_mondir/committee.html', context)
 
 
+@conditional_public_page(DurgaSangha)
+@cache_public_page(DurgaSangha)
 def durga_sangha(request):
     """Durga Sangha members view"""
-    from collections import OrderedDict
     context = get_site_context()
     
     # Get all active durga sangha members ordered by category_order, then member order
     all_members = DurgaSangha.objects.filter(is_active=True).order_by('category_order', 'order', 'name')
     
-    # Group members by category dynamically while preserving order
-    members_by_category = OrderedDict()
-    for member in all_members:
-        category = member.category
-        if category not in members_by_category:
-            members_by_category[category] = []
-        members_by_category[category].append(member)
-    
     context.update({
-        'members_by_category': members_by_category,
+        'members_by_category': group_by_category(all_members),
     })
     
     return render(request, 'durga_mondir/durga_sangha.html', context)
\ No newline at end of file
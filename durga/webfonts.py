@@ -0,0 +1,69 @@
+"""
+Self-hosted Hind Siliguri.
+
+`manage.py subset_webfonts` subsets the full font files in
+fonts/hind-siliguri/ (see fonts/README.txt) to the characters our templates, scripts and database
+content use and to the weights our stylesheets ask for, and writes WOFF2
+files plus a manifest to static/fonts/. The {% webfonts %} tag in base.html
+preloads the main weights and declares them with font-display: swap. Until
+the fonts have been built, or while collectstatic has not picked them up,
+it falls back to the Google Fonts stylesheet.
+
+The tag looks the subsets up at most once a minute per process, so a render
+touches no files and rebuilt fonts still show up without a restart.
+"""
+import json
+import time
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+FAMILY = 'Hind Siliguri'
+SLUG = 'hind-siliguri'
+MANIFEST = f'fonts/{SLUG}.json'
+GOOGLE_FONTS_URL = 'https://fonts.googleapis.com/css2?family=Hind+Siliguri:wght@300;400;500;600;700&display=swap'
+
+
+def face_path(weight):
+    return f'fonts/{SLUG}-{weight}.woff2'
+
+
+FACES_CHECK_INTERVAL = 60
+
+# (time.monotonic() of the lookup, font faces)
+_faces = None
+
+
+def load_manifest():
+    """Return the manifest written by subset_webfonts, or None if the fonts were never built"""
+    path = finders.find(MANIFEST)
+    if not path:
+        return None
+    with open(path, encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def font_faces():
+    """[(weight, url, preload)] of the built subsets, or None if they cannot be served yet"""
+    global _faces
+    cached = _faces
+    if cached is None or time.monotonic() - cached[0] >= FACES_CHECK_INTERVAL:
+        cached = _faces = (time.monotonic(), _lookup_faces())
+    return cached[1]
+
+
+def clear_font_faces():
+    """Look the subsets up again on the next render"""
+    global _faces
+    _faces = None
+
+
+def _lookup_faces():
+    manifest = load_manifest()
+    if manifest is None:
+        return None
+    try:
+        return [(face['weight'], static(face['file']), face['preload']) for face in manifest['faces']]
+    except ValueError:
+        # The manifest storage has no entry for files built after the last collectstatic
+        return None
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'durga_mondir.settings')
+# Serve the public pages with the async views
+os.environ.setdefault('DJANGO_ROOT_URLCONF', 'durga_mondir.asgi_urls')
 
 application = get_asgi_application()
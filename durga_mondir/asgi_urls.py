@@ -0,0 +1,22 @@
+"""
+URL configuration for the ASGI entry point (see asgi.py).
+
+Identical to urls.py except that the public pages are served by the async
+views in durga.async_views.
+"""
+from django.contrib import admin
+from django.urls import path, include
+from django.conf import settings
+from django.conf.urls.static import static
+
+from durga.metrics import metrics_view
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
+    path('', include('durga.async_urls')),
+]
+
+# Serve media files during development
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,30 @@
+"""
+Celery config for durga_mondir project.
+
+Tasks are queued for a worker, started with:
+
+    celery -A durga_mondir worker -l info
+
+Without CELERY_BROKER_URL in the environment the site and the worker share a
+file-based queue under CELERY_BROKER_DIR (see settings.py). In production
+point CELERY_BROKER_URL at Redis or RabbitMQ instead.
+"""
+
+import os
+from pathlib import Path
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'durga_mondir.settings')
+
+app = Celery('durga_mondir')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
+
+@app.on_after_configure.connect
+def create_broker_folders(sender, **kwargs):
+    # The filesystem transport expects its folders to exist
+    if sender.conf.broker_url == 'filesystem://' and not sender.conf.task_always_eager:
+        for folder in sender.conf.broker_transport_options.values():
+            Path(folder).mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,154 @@
+const albumScript = document.currentScript;
+let nextCursor = albumScript.dataset.nextCursor;
+let hasNextPage = Boolean(nextCursor);
+let isLoading = false;
+let allPhotos = [];
+let currentPhotoIndex = 0;
+
+// Initialize photos array
+document.querySelectorAll('.photo-item').forEach((item, index) => {
+    allPhotos.push({
+        src: item.dataset.src,
+        title: item.dataset.title,
+        id: item.dataset.photoId
+    });
+});
+
+// Infinite scroll
+window.addEventListener('scroll', () => {
+    if (isLoading || !hasNextPage) return;
+
+    const scrollTop = document.documentElement.scrollTop;
+    const scrollHeight = document.documentElement.scrollHeight;
+    const clientHeight = document.documentElement.clientHeight;
+
+    if (scrollTop + clientHeight >= scrollHeight - 200) {
+        loadMorePhotos();
+    }
+});
+
+async function loadMorePhotos() {
+    if (isLoading || !hasNextPage) return;
+
+    isLoading = true;
+    document.getElementById('loading-spinner').style.display = 'block';
+
+    try {
+        const response = await fetch(`${albumScript.dataset.url}?cursor=${encodeURIComponent(nextCursor)}`, {
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        });
+
+        const data = await response.json();
+
+        if (data.photos && data.photos.length > 0) {
+            const container = document.getElementById('photos-container');
+
+            data.photos.forEach(photo => {
+                // Add to photos array
+                allPhotos.push({
+                    src: photo.image_url,
+                    title: photo.title,
+                    id: photo.id
+                });
+
+                // Create photo element
+                const photoDiv = document.createElement('div');
+                photoDiv.className = 'photo-item';
+                photoDiv.dataset.photoId = photo.id;
+                photoDiv.dataset.src = photo.image_url;
+                photoDiv.dataset.title = photo.title;
+                if (photo.placeholder) {
+                    photoDiv.style.backgroundImage = `url('${photo.placeholder}')`;
+                }
+
+                // Grid shows the thumbnail, the original is only loaded in the lightbox
+                const size = photo.width ? `width="${photo.width}" height="${photo.height}"` : '';
+                photoDiv.innerHTML = `
+                    <img src="${photo.thumbnail_url}" ${size} alt="${photo.title || 'ছবি'}" loading="lazy" decoding="async">
+                    <div class="photo-overlay">
+                        <i class="fas fa-search-plus fa-2x text-white"></i>
+                    </div>
+                `;
+
+                // Add click event
+                photoDiv.addEventListener('click', () => {
+                    const index = allPhotos.findIndex(p => p.id == photo.id);
+                    openLightbox(index);
+                });
+
+                container.appendChild(photoDiv);
+            });
+
+            nextCursor = data.next_cursor;
+            hasNextPage = data.has_next;
+
+            // Update photos count
+            document.getElementById('photos-count').textContent = allPhotos.length;
+        }
+
+        if (!hasNextPage) {
+            document.getElementById('no-more-photos').style.display = 'block';
+        }
+
+    } catch (error) {
+        console.error('Error loading photos:', error);
+    } finally {
+        isLoading = false;
+        document.getElementById('loading-spinner').style.display = 'none';
+    }
+}
+
+// Lightbox functionality
+document.querySelectorAll('.photo-item').forEach((item, index) => {
+    item.addEventListener('click', () => openLightbox(index));
+});
+
+function openLightbox(index) {
+    currentPhotoIndex = index;
+    const photo = allPhotos[currentPhotoIndex];
+    document.getElementById('lightbox-img').src = photo.src;
+    document.getElementById('lightbox-img').alt = photo.title;
+    document.getElementById('lightbox').style.display = 'block';
+    document.body.style.overflow = 'hidden';
+}
+
+function closeLightbox() {
+    document.getElementById('lightbox').style.display = 'none';
+    document.body.style.overflow = 'auto';
+}
+
+function changePhoto(direction) {
+    currentPhotoIndex += direction;
+
+    if (currentPhotoIndex < 0) {
+        currentPhotoIndex = allPhotos.length - 1;
+    } else if (currentPhotoIndex >= allPhotos.length) {
+        currentPhotoIndex = 0;
+    }
+
+    const photo = allPhotos[currentPhotoIndex];
+    document.getElementById('lightbox-img').src = photo.src;
+    document.getElementById('lightbox-img').alt = photo.title;
+}
+
+// Keyboard navigation
+document.addEventListener('keydown', (e) => {
+    if (document.getElementById('lightbox').style.display === 'block') {
+        if (e.key === 'Escape') {
+            closeLightbox();
+        } else if (e.key === 'ArrowLeft') {
+            changePhoto(-1);
+        } else if (e.key === 'ArrowRight') {
+            changePhoto(1);
+        }
+    }
+});
+
+// Close lightbox when clicking outside image
+document.getElementById('lightbox').addEventListener('click', (e) => {
+    if (e.target.id === 'lightbox') {
+        closeLightbox();
+    }
+});
@@ -0,0 +1,120 @@
+document.addEventListener('DOMContentLoaded', function() {
+    var carousel = document.querySelector('#heroCarousel');
+    if (carousel) {
+        console.log('Carousel found and initializing...');
+
+        // Initialize Bootstrap carousel
+        var bsCarousel = new bootstrap.Carousel(carousel, {
+            interval: 5000,
+            keyboard: true,
+            pause: 'hover',
+            ride: 'carousel',
+            wrap: true,
+            touch: true
+        });
+
+        // Manual control event listeners
+        const prevBtn = document.querySelector('.carousel-control-prev');
+        const nextBtn = document.querySelector('.carousel-control-next');
+
+        if (prevBtn) {
+            prevBtn.addEventListener('click', function(e) {
+                e.preventDefault();
+                console.log('Previous button clicked');
+                bsCarousel.prev();
+            });
+        }
+
+        if (nextBtn) {
+            nextBtn.addEventListener('click', function(e) {
+                e.preventDefault();
+                console.log('Next button clicked');
+                bsCarousel.next();
+            });
+        }
+
+        // Indicator buttons
+        const indicators = document.querySelectorAll('[data-bs-slide-to]');
+        indicators.forEach((indicator, index) => {
+            indicator.addEventListener('click', function(e) {
+                e.preventDefault();
+                console.log('Indicator clicked:', index);
+                bsCarousel.to(index);
+            });
+        });
+
+        // Keyboard navigation
+        document.addEventListener('keydown', function(e) {
+            if (e.key === 'ArrowLeft') {
+                bsCarousel.prev();
+            } else if (e.key === 'ArrowRight') {
+                bsCarousel.next();
+            }
+        });
+
+        console.log('Carousel fully initialized with manual controls');
+
+        // Fallback manual slider (if Bootstrap fails)
+        let currentSlide = 0;
+        const slides = document.querySelectorAll('.carousel-item');
+        const totalSlides = slides.length;
+
+        function showSlide(n) {
+            slides.forEach(slide => slide.classList.remove('active'));
+            currentSlide = (n + totalSlides) % totalSlides;
+            slides[currentSlide].classList.add('active');
+
+            // Update indicators
+            const indicators = document.querySelectorAll('[data-bs-slide-to]');
+            indicators.forEach((indicator, index) => {
+                indicator.classList.toggle('active', index === currentSlide);
+                indicator.setAttribute('aria-current', index === currentSlide ? 'true' : 'false');
+            });
+        }
+
+        // Fallback navigation
+        window.nextSlide = function() {
+            showSlide(currentSlide + 1);
+        };
+
+        window.prevSlide = function() {
+            showSlide(currentSlide - 1);
+        };
+
+        // Add fallback click events
+        setTimeout(() => {
+            const prevBtnFallback = document.querySelector('.carousel-control-prev');
+            const nextBtnFallback = document.querySelector('.carousel-control-next');
+
+            if (prevBtnFallback) {
+                prevBtnFallback.setAttribute('onclick', 'window.prevSlide()');
+            }
+            if (nextBtnFallback) {
+                nextBtnFallback.setAttribute('onclick', 'window.nextSlide()');
+            }
+        }, 1000);
+
+    } else {
+        console.log('Carousel not found!');
+    }
+});
+
+// Back to Top functionality
+const backToTopBtn = document.getElementById('backToTop');
+
+// Show button when user scrolls down 300px
+window.addEventListener('scroll', function() {
+    if (window.pageYOffset > 300) {
+        backToTopBtn.classList.add('show');
+    } else {
+        backToTopBtn.classList.remove('show');
+    }
+});
+
+// Smooth scroll to top
+function scrollToTop() {
+    window.scrollTo({
+        top: 0,
+        behavior: 'smooth'
+    });
+}
@@ -0,0 +1,60 @@
+function adjustImageFit(img) {
+    const container = img.closest('.member-photo');
+    const containerWidth = container.offsetWidth;
+    const containerHeight = container.offsetHeight;
+
+    // Wait for image to load completely
+    if (img.complete) {
+        const imgWidth = img.naturalWidth;
+        const imgHeight = img.naturalHeight;
+        const aspectRatio = imgWidth / imgHeight;
+        const containerRatio = containerWidth / containerHeight;
+
+        // Remove existing classes
+        container.classList.remove('portrait', 'landscape', 'square');
+
+        if (aspectRatio > containerRatio) {
+            // Image is wider - fit by height
+            container.classList.add('landscape');
+            img.style.width = 'auto';
+            img.style.height = '100%';
+        } else if (aspectRatio < containerRatio) {
+            // Image is taller - fit by width  
+            container.classList.add('portrait');
+            img.style.width = '100%';
+            img.style.height = 'auto';
+        } else {
+            // Square or similar ratio
+            container.classList.add('square');
+            img.style.width = '100%';
+            img.style.height = '100%';
+        }
+    } else {
+        // If not loaded yet, wait and try again
+        img.addEventListener('load', function() {
+            adjustImageFit(this);
+        });
+    }
+}
+
+// Adjust all images on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const images = document.querySelectorAll('.member-photo img');
+    images.forEach(function(img) {
+        if (img.complete) {
+            adjustImageFit(img);
+        } else {
+            img.addEventListener('load', function() {
+                adjustImageFit(this);
+            });
+        }
+    });
+});
+
+// Re-adjust on window resize
+window.addEventListener('resize', function() {
+    const images = document.querySelectorAll('.member-photo img');
+    images.forEach(function(img) {
+        adjustImageFit(img);
+    });
+});
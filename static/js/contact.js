@@ -0,0 +1,127 @@
+// Enhanced Form Validation and Submission
+document.getElementById('contactForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    // Form validation
+    const name = document.getElementById('name').value.trim();
+    const email = document.getElementById('email').value.trim();
+    const subject = document.getElementById('subject').value.trim();
+    const message = document.getElementById('message').value.trim();
+
+    if (!name || !email || !subject || !message) {
+        showAlert('danger', 'দয়া করে সব প্রয়োজনীয় ক্ষেত্র পূরণ করুন।');
+        return;
+    }
+
+    // Remove any existing alerts first
+    removeExistingAlerts();
+
+    const formData = new FormData(this);
+    const submitBtn = this.querySelector('button[type="submit"]');
+    const originalText = submitBtn.innerHTML;
+
+    // Show loading state
+    submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>পাঠানো হচ্ছে...';
+    submitBtn.disabled = true;
+    submitBtn.classList.add('loading');
+
+    fetch('', {
+        method: 'POST',
+        body: formData,
+        headers: {
+            'X-Requested-With': 'XMLHttpRequest',
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showAlert('success', data.message);
+            this.reset();
+
+            // Success animation
+            submitBtn.innerHTML = '<i class="fas fa-check me-2"></i>সফলভাবে পাঠানো হয়েছে!';
+            setTimeout(() => {
+                submitBtn.innerHTML = originalText;
+            }, 3000);
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showAlert('danger', 'একটি ত্রুটি ঘটেছে। দয়া করে আবার চেষ্টা করুন।');
+    })
+    .finally(() => {
+        setTimeout(() => {
+            submitBtn.disabled = false;
+            submitBtn.classList.remove('loading');
+            if (submitBtn.innerHTML.includes('spinner')) {
+                submitBtn.innerHTML = originalText;
+            }
+        }, 2000);
+    });
+});
+
+// Helper Functions
+function removeExistingAlerts() {
+    const existingAlerts = document.querySelectorAll('.alert');
+    existingAlerts.forEach(alert => alert.remove());
+}
+
+function showAlert(type, message) {
+    const alertDiv = document.createElement('div');
+    alertDiv.className = `alert alert-${type} alert-dismissible fade show animate__animated animate__fadeInDown`;
+
+    const icon = type === 'success' ? 'check-circle' : 'exclamation-circle';
+    alertDiv.innerHTML = `
+        <i class="fas fa-${icon} me-2"></i>${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+
+    const container = document.querySelector('.container');
+    const firstChild = container.firstElementChild;
+    container.insertBefore(alertDiv, firstChild);
+
+    // Auto hide success messages after 6 seconds
+    if (type === 'success') {
+        setTimeout(() => {
+            if (alertDiv.parentNode) {
+                alertDiv.classList.add('animate__fadeOutUp');
+                setTimeout(() => alertDiv.remove(), 500);
+            }
+        }, 6000);
+    }
+}
+
+// Form Enhancement - Real-time validation
+document.addEventListener('DOMContentLoaded', function() {
+    const inputs = document.querySelectorAll('.form-control');
+
+    inputs.forEach(input => {
+        input.addEventListener('focus', function() {
+            this.parentNode.classList.add('focused');
+        });
+
+        input.addEventListener('blur', function() {
+            if (!this.value.trim()) {
+                this.parentNode.classList.remove('focused');
+            }
+        });
+
+        // Real-time validation feedback
+        input.addEventListener('input', function() {
+            if (this.hasAttribute('required') && this.value.trim()) {
+                this.classList.remove('is-invalid');
+                this.classList.add('is-valid');
+            } else if (this.hasAttribute('required') && !this.value.trim()) {
+                this.classList.remove('is-valid');
+            }
+        });
+    });
+});
+
+// Smooth scroll to form if there are errors
+function scrollToForm() {
+    document.getElementById('contactForm').scrollIntoView({
+        behavior: 'smooth',
+        block: 'center'
+    });
+}
@@ -0,0 +1,139 @@
+let calendar;
+const calendarUrl = document.currentScript.dataset.url;
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Initialize calendar
+    var calendarEl = document.getElementById('calendar');
+    calendar = new FullCalendar.Calendar(calendarEl, {
+        initialView: 'dayGridMonth',
+        locale: 'bn',
+        headerToolbar: {
+            left: 'prev,next today',
+            center: 'title',
+            right: 'dayGridMonth,dayGridWeek,listMonth'
+        },
+        buttonText: {
+            today: 'আজ',
+            month: 'মাস',
+            week: 'সপ্তাহ',
+            list: 'তালিকা'
+        },
+        // Loaded lazily, one visible date range at a time
+        events: {
+            url: calendarUrl
+        },
+        eventDataTransform: function(eventData) {
+            eventData.isUpcoming = new Date(eventData.datetime.replace(' ', 'T')) > new Date();
+            eventData.className = eventData.isUpcoming ? 'fc-event-upcoming' : 'fc-event-past';
+            return eventData;
+        },
+        eventClick: function(info) {
+            info.jsEvent.preventDefault();
+            const event = info.event;
+            const eventData = event.extendedProps;
+
+            showEventModal(
+                event.id,
+                event.title,
+                eventData.description,
+                eventData.datetime,
+                eventData.location,
+                eventData.image,
+                eventData.isUpcoming
+            );
+        },
+        eventDidMount: function(info) {
+            // Add tooltip
+            info.el.title = info.event.title + '\n' + 
+                           info.event.extendedProps.location;
+        }
+    });
+
+    // View toggle functionality
+    const calendarViewBtn = document.getElementById('calendarViewBtn');
+    const listViewBtn = document.getElementById('listViewBtn');
+    const calendarView = document.getElementById('calendarView');
+    const listView = document.getElementById('listView');
+    const filterButtons = document.getElementById('filterButtons');
+
+    calendarViewBtn.addEventListener('click', function() {
+        calendarView.style.display = 'block';
+        listView.style.display = 'none';
+        calendarViewBtn.classList.add('active');
+        listViewBtn.classList.remove('active');
+        filterButtons.style.display = 'none';
+
+        // Render calendar
+        setTimeout(function() {
+            calendar.render();
+        }, 100);
+    });
+
+    listViewBtn.addEventListener('click', function() {
+        calendarView.style.display = 'none';
+        listView.style.display = 'block';
+        listViewBtn.classList.add('active');
+        calendarViewBtn.classList.remove('active');
+        filterButtons.style.display = 'inline-flex';
+    });
+
+    // Add click handlers to event cards
+    document.querySelectorAll('.event-card').forEach(function(card) {
+        card.addEventListener('click', function() {
+            const eventId = this.dataset.eventId;
+            const eventTitle = this.dataset.eventTitle;
+            const eventDescription = this.dataset.eventDescription;
+            const eventDatetime = this.dataset.eventDatetime;
+            const eventLocation = this.dataset.eventLocation;
+            const eventImage = this.dataset.eventImage;
+            const eventUpcoming = this.dataset.eventUpcoming === 'True';
+
+            showEventModal(eventId, eventTitle, eventDescription, eventDatetime, 
+                          eventLocation, eventImage, eventUpcoming);
+        });
+    });
+});
+
+function showEventModal(id, title, description, datetime, location, image, isUpcoming) {
+    // Parse date and time
+    const [date, time] = datetime.split(' ');
+    const dateObj = new Date(date);
+
+    // Bengali months
+    const months = ['জানুয়ারি', 'ফেব্রুয়ারি', 'মার্চ', 'এপ্রিল', 'মে', 'জুন', 
+                   'জুলাই', 'আগস্ট', 'সেপ্টেম্বর', 'অক্টোবর', 'নভেম্বর', 'ডিসেম্বর'];
+
+    const formattedDate = `${dateObj.getDate()} ${months[dateObj.getMonth()]} ${dateObj.getFullYear()}`;
+
+    // Format time
+    const [hour, minute] = time.split(':');
+    const hourInt = parseInt(hour);
+    const period = hourInt >= 12 ? 'PM' : 'AM';
+    const hour12 = hourInt > 12 ? hourInt - 12 : (hourInt === 0 ? 12 : hourInt);
+    const formattedTime = `${hour12}:${minute} ${period}`;
+
+    // Set modal content
+    document.getElementById('modalEventTitle').textContent = title;
+    document.getElementById('modalEventDescription').textContent = description;
+    document.getElementById('modalEventDate').textContent = formattedDate;
+    document.getElementById('modalEventTime').textContent = formattedTime;
+    document.getElementById('modalEventLocation').textContent = location;
+
+    // Set badge
+    const badgeHtml = isUpcoming ? 
+        '<span class="badge bg-success">আসন্ন</span>' : 
+        '<span class="badge bg-secondary">সম্পন্ন</span>';
+    document.getElementById('modalEventBadge').innerHTML = badgeHtml;
+
+    // Set image
+    const imageDiv = document.getElementById('modalEventImage');
+    if (image) {
+        imageDiv.innerHTML = `<img src="${image}" class="img-fluid rounded" alt="${title}" style="max-height: 300px; width: 100%; object-fit: cover;">`;
+    } else {
+        imageDiv.innerHTML = '';
+    }
+
+    // Show modal
+    const modal = new bootstrap.Modal(document.getElementById('eventModal'));
+    modal.show();
+}
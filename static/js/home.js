@@ -0,0 +1,132 @@
+// Animate on scroll
+function animateOnScroll() {
+    const elements = document.querySelectorAll('.animate-on-scroll');
+
+    elements.forEach(element => {
+        const elementTop = element.getBoundingClientRect().top;
+        const windowHeight = window.innerHeight;
+
+        if (elementTop < windowHeight - 100) {
+            element.classList.add('animated');
+        }
+    });
+}
+
+// Counter animation
+function animateCounters() {
+    const counters = document.querySelectorAll('.stat-number[data-count]');
+
+    counters.forEach(counter => {
+        const target = parseInt(counter.getAttribute('data-count'));
+        let current = 0;
+        const increment = target / 100;
+
+        const timer = setInterval(() => {
+            current += increment;
+            if (current >= target) {
+                current = target;
+                clearInterval(timer);
+            }
+            counter.textContent = Math.floor(current);
+        }, 20);
+    });
+}
+
+// Initialize animations
+document.addEventListener('DOMContentLoaded', function() {
+    animateOnScroll();
+
+    // Trigger counter animation when stats section is visible
+    const statsSection = document.querySelector('.stats-section');
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                animateCounters();
+                observer.unobserve(entry.target);
+            }
+        });
+    });
+
+    if (statsSection) {
+        observer.observe(statsSection);
+    }
+});
+
+window.addEventListener('scroll', animateOnScroll);
+
+// Gallery Carousel initialization
+document.addEventListener('DOMContentLoaded', function() {
+    // Initialize gallery carousel if exists
+    // Initialize Gallery 4-Column Carousel
+    const galleryCarousel = document.querySelector('#galleryCarousel');
+    if (galleryCarousel) {
+        const carousel = new bootstrap.Carousel(galleryCarousel, {
+            interval: 5000,  // Slower for better viewing
+            ride: 'carousel',
+            pause: 'hover',
+            wrap: true,
+            touch: true
+        });
+
+        // Enhanced slide events
+        galleryCarousel.addEventListener('slide.bs.carousel', function (e) {
+            console.log('Gallery sliding to:', e.to);
+            // Add slide animation effects
+            const activeSlide = galleryCarousel.querySelector('.carousel-item.active');
+            if (activeSlide) {
+                activeSlide.style.transition = 'all 0.6s ease-in-out';
+            }
+        });
+
+        galleryCarousel.addEventListener('slid.bs.carousel', function (e) {
+            console.log('Gallery slide completed:', e.to);
+        });
+
+        // Pause on hover with visual feedback
+        galleryCarousel.addEventListener('mouseenter', function() {
+            carousel.pause();
+            galleryCarousel.style.opacity = '0.95';
+        });
+
+        galleryCarousel.addEventListener('mouseleave', function() {
+            carousel.cycle();
+            galleryCarousel.style.opacity = '1';
+        });
+
+        // Auto-start carousel
+        carousel.cycle();
+
+        console.log('Gallery 4-column carousel initialized successfully');
+    } else {
+        console.error('Gallery carousel element not found');
+    }
+
+    // Debug gallery links
+    const galleryLinks = document.querySelectorAll('.gallery-link');
+    console.log('Found gallery links:', galleryLinks.length);
+
+    galleryLinks.forEach((link, index) => {
+        console.log(`Gallery link ${index}:`, link.href);
+
+        link.addEventListener('click', function(e) {
+            console.log('Gallery link clicked:', this.href);
+            // Allow normal navigation
+            return true;
+        });
+    });
+});
+
+// Convert English numbers to Bengali
+function convertToBengaliNumber(num) {
+    const bengaliDigits = ['০', '১', '২', '৩', '৪', '৫', '৬', '৭', '৮', '৯'];
+    return String(num).split('').map(digit => bengaliDigits[parseInt(digit)] || digit).join('');
+}
+
+// Convert floating countdown number to Bengali
+document.addEventListener('DOMContentLoaded', function() {
+    const floatingCountdownDays = document.getElementById('floating-countdown-days');
+    if (floatingCountdownDays) {
+        const englishNumber = floatingCountdownDays.textContent.trim();
+        floatingCountdownDays.textContent = convertToBengaliNumber(englishNumber);
+    }
+});